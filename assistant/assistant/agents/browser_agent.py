@@ -1,19 +1,75 @@
 from assistant.utils.browser_actions import BrowserActions
+from assistant.tools.browser_tools import BrowserTools, PlanReport
+from assistant.tools.selector_cache import SelectorCache
+from assistant.utils.browser_pool import BrowserPool
+from assistant.utils.tracing import Tracer
 from openai import OpenAI
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import List, Optional
 import json
 import logging
+import threading
 from assistant.utils.prompt import browser_task_prompt
 
 logger = logging.getLogger(__name__)
 
 class BrowserAgent:
-    def __init__(self, client: OpenAI):
-        self.browser = BrowserActions()
+    def __init__(self, client: OpenAI, pool: Optional[BrowserPool] = None, prewarm: bool = True,
+                 browser: Optional[BrowserActions] = None, tracer: Optional[Tracer] = None,
+                 selector_cache: Optional[SelectorCache] = None):
+        # A preconfigured (e.g. headless) browser can be passed in; it's started here either way
+        self.browser = browser or BrowserActions()
         self.client = client
+        # Optional pool of extra browsers for independent commands run in parallel
+        self.pool = pool
+        # Browser startup runs here in the background; the driver is only used by one thread at a time
+        self._browser_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="browser")
+        # Locators learned per site, persisted under ~/.assistant unless one is passed in
+        # (e.g. SelectorCache(":memory:") for benchmarks and tests)
+        self.selector_cache = selector_cache or SelectorCache()
+        # Times LLM calls and each browser action; pass the handler's tracer to share its turns
+        self.tracer = tracer or Tracer()
+        
+        # Chrome starts on the browser thread while the caller keeps initializing, or lazily
+        # on the first browser task when prewarm is off
+        self.tools: Optional[BrowserTools] = None
+        self._startup_lock = threading.Lock()
+        self._startup: Optional[Future] = (
+            self._browser_executor.submit(self._start_browser) if prewarm else None
+        )
+        if self.pool is not None and prewarm:
+            # Warm the pool too; otherwise it starts on the first pooled command
+            threading.Thread(target=self.pool.start, name="browser-pool-start", daemon=True).start()
+        
+    def _start_browser(self):
         self.browser.start_browser()
+        self.tools = BrowserTools(
+            self.browser.driver, selector_cache=self.selector_cache, tabs=self.browser.tabs,
+            wait=self.browser.wait, wait_until=self.browser.wait_until, blocker=self.browser.blocker,
+            tracer=self.tracer
+        )
+    
+    def ensure_browser(self):
+        """
+        Block until the browser is running, starting it now if it wasn't pre-warmed
+        """
+        if self.tools is not None:
+            return
+        with self._startup_lock:
+            if self._startup is not None:
+                startup, self._startup = self._startup, None
+                try:
+                    startup.result()
+                except Exception as e:
+                    logger.warning(f"Background browser startup failed, retrying: {e}")
+            if self.tools is None:
+                self._start_browser()
         
     def __del__(self):
+        self._browser_executor.shutdown(wait=False)
         self.browser.close_browser()
+        if self.pool is not None:
+            self.pool.close()
     
     def process_command(self, user_input: str) -> str:
         """
@@ -23,45 +79,135 @@ class BrowserAgent:
             
             logger.info(f"User input -------- : {user_input}")
             # Get AI interpretation of the command
-            response = self.client.chat.completions.create(
-                model="gpt-4o-mini",
-                messages=[
-                    {"role": "system", "content": browser_task_prompt},
-                    {"role": "user", "content": user_input}
-                ],
-                temperature=0.7
-            )
+            with self.tracer.span("llm.browser_plan", model="gpt-4o-mini"):
+                response = self.client.chat.completions.create(
+                    model="gpt-4o-mini",
+                    messages=[
+                        {"role": "system", "content": browser_task_prompt},
+                        {"role": "user", "content": user_input}
+                    ],
+                    temperature=0.7
+                )
+            self.tracer.add_usage("gpt-4o-mini", response.usage)
             
             # Parse the response
             command = json.loads(response.choices[0].message.content)
             
             
-            logger.info(f"Command -------- : {command}")
-            # Execute the command
-            result = self._execute_command(command)
-            return result
+            return self.execute_command(command)
             
         except Exception as e:
             logger.error(f"Error processing command: {e}")
             return f"Sorry, I couldn't process that command: {str(e)}"
     
-    def _execute_command(self, command):
-        """Execute the parsed browser command"""
+    def execute_command(self, command: dict) -> str:
+        """
+        Execute an already-planned browser command without another LLM call
+        """
+        try:
+            logger.info(f"Command -------- : {command}")
+            if "parallel" in command:
+                return " ".join(self.execute_parallel(command["parallel"]))
+            return self._execute_command(command)
+        except Exception as e:
+            logger.error(f"Error executing command: {e}")
+            return f"Sorry, I couldn't process that command: {str(e)}"
+    
+    def _summarize_plan(self, report: PlanReport) -> str:
+        """Turn a plan report into a short spoken summary"""
+        texts = []
+        for step in report["steps"]:
+            if step["status"] != "success" or not step["data"]:
+                continue
+            if step["action"] == "read":
+                texts.append(step["data"]["text"])
+            elif step["action"] == "extract":
+                texts.extend(
+                    item["text"] for items in step["data"]["results"].values()
+                    for item in items if item.get("text")
+                )
+        if report["status"] == "success":
+            last = report["steps"][-1]["message"] if report["steps"] else report["message"]
+            return " ".join(texts) if texts else last
+        
+        completed = len(report["steps"]) - 1
+        summary = f"Completed {completed} of {completed + 1 + len(report['skipped'])} steps. {report['message']}"
+        return " ".join(texts + [summary])
+    
+    def execute_pooled(self, command: dict) -> str:
+        """
+        Run an independent command on a browser checked out from the pool
+        """
+        if self.pool is None:
+            raise RuntimeError("BrowserAgent was created without a browser pool")
+        try:
+            with self.pool.lease() as browser:
+                tools = BrowserTools(
+                    browser.driver, selector_cache=self.selector_cache, tabs=browser.tabs,
+                    wait=browser.wait, wait_until=browser.wait_until, blocker=browser.blocker,
+                    tracer=self.tracer
+                )
+                logger.info(f"Pooled command -------- : {command}")
+                return self._execute_command(command, browser, tools)
+        except Exception as e:
+            logger.error(f"Error executing pooled command: {e}")
+            return f"Sorry, I couldn't process that command: {str(e)}"
+    
+    def execute_parallel(self, commands: List[dict]) -> List[str]:
+        """
+        Run independent commands concurrently, each on its own pooled browser; without a
+        pool they run one after another on the agent's browser
+        """
+        if self.pool is None or not commands:
+            return [self.execute_command(command) for command in commands]
+        workers = min(len(commands), self.pool.size)
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="pooled") as executor:
+            return list(executor.map(self.execute_pooled, commands))
+    
+    def _execute_command(self, command, browser=None, tools=None):
+        """Execute the parsed browser command, on the agent's own browser unless one is given"""
+        if browser is None:
+            self.ensure_browser()
+        browser = browser or self.browser
+        tools = tools or self.tools
+        
+        if "plan" in command:
+            logger.info(f"Plan -------- : {command['plan']}")
+            return self._summarize_plan(tools.execute_plan(command["plan"]))
+        
         action = command.get("action")
         params = command.get("params", {})
         
-        if action == "navigate":
-            success, message = self.browser.navigate_to(params.get("url"))
-        elif action == "click":
-            success, message = self.browser.click_element(params.get("selector"))
-        elif action == "type":
-            success, message = self.browser.type_text(
-                params.get("selector"),
-                params.get("text")
-            )
-        elif action == "read":
-            success, message = self.browser.get_text(params.get("selector"))
-        else:
-            return f"Unknown action: {action}"
+        with self.tracer.span(f"browser.{action}") as span:
+            if action == "navigate":
+                success, message = browser.navigate_to(
+                    params.get("url"), wait_until=params.get("wait_until"), wait_for=params.get("wait_for")
+                )
+            elif action in ("click", "type", "read"):
+                # LLM-generated selectors go through the resolver so learned per-site selectors apply
+                result = tools.run_step({"action": action, "params": params})
+                success = result["status"] == "success"
+                message = result["data"]["text"] if success and action == "read" else result["message"]
+            elif action == "scroll":
+                success, message = browser.scroll(
+                    params.get("direction", "down"),
+                    params.get("amount", 300)
+                )
+            elif action == "search":
+                success, message = browser.search(params.get("query"))
+            elif action == "back":
+                success, message = browser.go_back()
+            elif action == "extract":
+                success, message = browser.extract(params.get("queries", []))
+                if success:
+                    # Speak the texts of everything that matched
+                    message = " ".join(
+                        item["text"] for items in message.values() for item in items if item.get("text")
+                    ) or "Nothing on the page matched"
+            else:
+                span.status = "error"
+                return f"Unknown action: {action}"
+            if not success:
+                span.status = "error"
         
         return message if success else f"Failed: {message}"
\ No newline at end of file
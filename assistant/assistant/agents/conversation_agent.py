@@ -1,38 +1,133 @@
 from openai import OpenAI
 import logging
 import json
+import time
+from typing import Iterator, Optional
 from assistant.utils.prompt import conversation_prompt
+from assistant.utils.streaming import JSONFieldStreamer, SentenceSplitter
+from assistant.utils.response_cache import ResponseCache
+from assistant.utils.tracing import Tracer
 logger = logging.getLogger(__name__)
 
 class ConversationAgent:
-    def __init__(self, client: OpenAI):
+    def __init__(self, client: OpenAI, cache: Optional[ResponseCache] = None,
+                 tracer: Optional[Tracer] = None):
         self.client = client
+        self.cache = cache
+        # LLM call timings and token usage; pass the handler's tracer to share its turns
+        self.tracer = tracer or Tracer()
+    
+    def _cached_reply(self, user_input: str) -> Optional[str]:
+        """Return a cached reply for this input, if there is one"""
+        if self.cache is None:
+            return None
+        reply = self.cache.get(conversation_prompt, "gpt-4o-mini", user_input, fuzzy=True)
+        if reply is not None:
+            logger.info(f"Conversation cache hit: {self.cache.stats()}")
+        return reply
+    
+    def _store_reply(self, user_input: str, reply: str):
+        """Cache a generated reply"""
+        if self.cache is not None and reply:
+            self.cache.put(conversation_prompt, "gpt-4o-mini", user_input, reply,
+                           ttl=self.cache.reply_ttl)
+    
+    def _parse_reply(self, user_input: str, json_response: str) -> str:
+        """Extract the reply from the JSON envelope and cache it"""
+        logger.info(f"Raw JSON response in conversation agent: {json_response}")
+        
+        # Convert the string to a dictionary
+        response_dict = json.loads(json_response)
+        
+        # Extract the 'response' field
+        reply = response_dict.get("response")
+        if not reply:
+            return "I apologize, but I'm having trouble generating a response right now."
+        self._store_reply(user_input, reply)
+        return reply
     
     def process_conversation(self, user_input: str) -> str:
         """Handle general conversation"""
         try:
-            response = self.client.chat.completions.create(
+            cached = self._cached_reply(user_input)
+            if cached is not None:
+                return cached
+            
+            with self.tracer.span("llm.conversation", model="gpt-4o-mini"):
+                response = self.client.chat.completions.create(
+                    model="gpt-4o-mini",
+                    messages=[
+                        {"role": "system", "content": conversation_prompt},
+                        {"role": "user", "content": user_input}
+                    ],
+                    temperature=0.7
+                )
+            self.tracer.add_usage("gpt-4o-mini", response.usage)
+            
+            return self._parse_reply(user_input, response.choices[0].message.content)
+        
+        except json.JSONDecodeError as e:
+            logger.error(f"JSON decode error: {e}")
+            return "I apologize, but I'm having trouble understanding the response format."
+        except Exception as e:
+            logger.error(f"Error in conversation: {e}")
+            return "I apologize, but I'm having trouble processing that conversation."
+    
+    def stream_conversation(self, user_input: str) -> Iterator[str]:
+        """Handle general conversation, yielding the reply sentence by sentence as it is generated"""
+        yielded = False
+        try:
+            cached = self._cached_reply(user_input)
+            if cached is not None:
+                splitter = SentenceSplitter()
+                yield from splitter.feed(cached)
+                tail = splitter.flush()
+                if tail:
+                    yield tail
+                return
+            
+            started = time.perf_counter()
+            stream = self.client.chat.completions.create(
                 model="gpt-4o-mini",
                 messages=[
                     {"role": "system", "content": conversation_prompt},
                     {"role": "user", "content": user_input}
                 ],
-                temperature=0.7
+                temperature=0.7,
+                stream=True,
+                stream_options={"include_usage": True}
             )
             
-            # Parse the JSON response
-            json_response = response.choices[0].message.content
-            logger.info(f"Raw JSON response in conversation agent: {json_response}")
+            field = JSONFieldStreamer("response")
+            splitter = SentenceSplitter()
+            raw = []
+            reply = []
+            for chunk in stream:
+                if not chunk.choices:
+                    # With include_usage the last chunk only carries the token usage
+                    self.tracer.add_usage("gpt-4o-mini", getattr(chunk, "usage", None))
+                    continue
+                delta = chunk.choices[0].delta.content or ""
+                raw.append(delta)
+                text = field.feed(delta)
+                reply.append(text)
+                for sentence in splitter.feed(text):
+                    yielded = True
+                    yield sentence
             
-            # Convert the string to a dictionary
-            response_dict = json.loads(json_response)
+            tail = splitter.flush()
+            if tail:
+                yielded = True
+                yield tail
+            self.tracer.record("llm.conversation", time.perf_counter() - started, model="gpt-4o-mini", stream=True)
             
-            # Extract the 'response' field
-            return response_dict.get("response", "I apologize, but I'm having trouble generating a response right now.")
+            logger.info(f"Raw JSON response in conversation agent: {''.join(raw)}")
+            if not field.found:
+                yield "I apologize, but I'm having trouble understanding the response format."
+            elif field.done:
+                self._store_reply(user_input, "".join(reply))
         
-        except json.JSONDecodeError as e:
-            logger.error(f"JSON decode error: {e}")
-            return "I apologize, but I'm having trouble understanding the response format."
         except Exception as e:
-            logger.error(f"Error in conversation: {e}")
-            return "I apologize, but I'm having trouble processing that conversation."
+            logger.error(f"Error in streamed conversation: {e}")
+            if not yielded:
+                yield "I apologize, but I'm having trouble processing that conversation."
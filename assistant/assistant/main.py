@@ -1,7 +1,22 @@
-
+import sys
 from speech_handler import SpeechHandler
 
 
+def pipelined_main():
+    """Keep listening and transcribing while earlier commands are processed and spoken; Ctrl+C quits"""
+    speech_handler = SpeechHandler()
+    speech_handler.start_capture(barge_in="--barge-in" in sys.argv)
+    try:
+        while True:
+            success, response = speech_handler.listen_and_respond()
+            if not success and "timed out" not in response:
+                print(f"Error: {response}")
+    except KeyboardInterrupt:
+        pass
+    finally:
+        speech_handler.stop_capture()
+
+
 def main():
     speech_handler = SpeechHandler()
     while True:
@@ -13,6 +28,9 @@ def main():
         if user_input.lower() == 'q':
             break
 
-if __name__ == "__main__":
-    main()
 
+if __name__ == "__main__":
+    if "--pipelined" in sys.argv:
+        pipelined_main()
+    else:
+        main()
@@ -1,81 +1,354 @@
 import speech_recognition as sr
-import pyttsx3
 import logging
-import os
-from openai import OpenAI
 from dotenv import load_dotenv
 import json
+import os
+import time
 from assistant.agents.browser_agent import BrowserAgent
 from assistant.agents.conversation_agent import ConversationAgent
-from assistant.utils.prompt import prompt
+from assistant.utils.browser_pool import BrowserPool
+from assistant.utils.prompt import prompt, routing_prompt
+from assistant.utils.command_parser import parse_simple_command
+from assistant.utils.streaming import RouteReplyStreamer, SentenceSplitter
+from assistant.utils.response_cache import ResponseCache
+from assistant.utils.clients import create_client
+from assistant.utils.recognizers import create_transcriber
+from assistant.utils.noise_calibrator import NoiseCalibrator
+from assistant.utils.capture import Utterance, UtteranceCapture
+from assistant.utils.tts_worker import TTSWorker
+from assistant.utils.tracing import Tracer, create_tracer
 load_dotenv()
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 class SpeechHandler:
-    def __init__(self):
+    def __init__(self, unified_routing=True, local_fast_path=True, stream_replies=True,
+                 use_cache=True, prewarm_browser=True, speech_backend=None, audio=True,
+                 browser=None, tracer=None, selector_cache=None, browser_pool_size=None):
+        # Without audio there is no microphone or speech engine, only get_ai_response
+        # works (text-only use, benchmarks on machines without sound)
+        self.audio = audio
         self.recognizer = sr.Recognizer()
-        self.microphone = sr.Microphone()
+        self.microphone = sr.Microphone() if audio else None
+        
+        # google, vosk or whisper; defaults to the SPEECH_BACKEND environment variable
+        self.transcriber = create_transcriber(speech_backend, self.recognizer)
+        
+        # Spans for every stage of a turn, exported to TRACE_FILE (JSONL) and METRICS_FILE
+        # (Prometheus text) when those are set
+        self.tracer: Tracer = tracer or create_tracer()
+        
+        # Track ambient noise in the background between turns instead of calibrating up front
+        self.calibrator = None
+        if audio:
+            self.calibrator = NoiseCalibrator(self.recognizer, self.microphone)
+            self.calibrator.start()
+        
+        # Text-to-speech runs on its own worker thread, so speaking never blocks listening
+        # or processing unless the caller waits for it
+        self.tts = None
+        if audio:
+            self.tts = TTSWorker(configure=self._configure_voice, on_state=self._on_speaking,
+                                 on_finish=self.tracer.speech_finished)
+            self.tts.start()
+
+        # Initialize the OpenAI client; one pooled client is shared by all agents
+        self.client = create_client()
+        
+        # Classify and plan in a single LLM call; the two-call path stays as fallback
+        self.unified_routing = unified_routing
+        
+        # Resolve simple browser commands locally without any LLM call
+        self.local_fast_path = local_fast_path
+        
+        # Speak conversational replies sentence by sentence while they are generated
+        self.stream_replies = stream_replies
+        
+        # Persistent cache of routing, classification and conversation answers
+        self.cache = ResponseCache() if use_cache else None
+        
+        # Extra browsers for independent browser tasks routed to run in parallel; defaults
+        # to the BROWSER_POOL_SIZE environment variable, 0 runs them one after another
+        if browser_pool_size is None:
+            browser_pool_size = int(os.getenv("BROWSER_POOL_SIZE", "0"))
+        pool = BrowserPool(size=browser_pool_size) if browser_pool_size > 0 else None
         
-        # Initialize text-to-speech engine
-        self.engine = pyttsx3.init()
-        self.engine.setProperty('rate', 150)    # Speed of speech
-        self.engine.setProperty('volume', 0.9)  # Volume (0.0 to 1.0)
+        # Initialize agents; with prewarm the browser launches in the background while the
+        # rest of startup runs, otherwise on the first browser task
+        self.browser_agent = BrowserAgent(
+            self.client, pool=pool, prewarm=prewarm_browser, browser=browser,
+            tracer=self.tracer, selector_cache=selector_cache
+        )
+        self.conversation_agent = ConversationAgent(
+            self.client, cache=self.cache, tracer=self.tracer
+        )
         
-        # Set voice properties
-        voices = self.engine.getProperty('voices')
+        # Set by start_capture to keep listening while earlier commands are processed
+        self.capture = None
+        self.barge_in = False
+    
+    @staticmethod
+    def _configure_voice(engine):
+        """Voice settings, applied on the TTS thread that owns the engine"""
+        engine.setProperty('rate', 150)    # Speed of speech
+        engine.setProperty('volume', 0.9)  # Volume (0.0 to 1.0)
+        
+        voices = engine.getProperty('voices')
         female_voice = next((voice for voice in voices if 'female' in voice.name.lower()), None)
         if female_voice:
-            self.engine.setProperty('voice', female_voice.id)
+            engine.setProperty('voice', female_voice.id)
         elif voices:
-            self.engine.setProperty('voice', voices[0].id)
+            engine.setProperty('voice', voices[0].id)
+
+    def _on_speaking(self, speaking):
+        """TTS state hook: keep the assistant's own voice out of calibration and capture"""
+        self.calibrator.speaking(speaking)
+        capture = self.capture
+        if capture is not None and not self.barge_in:
+            # Without barge-in anything heard while speaking is the assistant itself
+            capture.speaking(speaking)
+
+    def _wait_for_speech(self, wait):
+        """
+        Without background capture the microphone would hear the reply, so wait for
+        speech to finish unless told otherwise
+        """
+        return self.capture is None if wait is None else wait
 
-        # Initialize OpenAI client
-        self.client = OpenAI()
+    def speak(self, text, interrupt=False, wait=None):
+        """
+        Convert text to speech
         
-        # Initialize agents
-        self.browser_agent = BrowserAgent(self.client)
-        self.conversation_agent = ConversationAgent(self.client)
+        Args:
+            interrupt: cut off whatever is being said or queued (a newer response)
+            wait: block until spoken; by default only when background capture is off
         
-        # Adjust for ambient noise
-        with self.microphone as source:
-            logger.info("Adjusting for ambient noise. Please wait...")
-            self.recognizer.adjust_for_ambient_noise(source, duration=2)
-            logger.info("Ambient noise adjustment complete.")
-    
-    def speak(self, text):
+        Returns:
+            the queued TTS job, or None without audio
         """
-        Convert text to speech
+        if self.tts is None:
+            logger.info(f"Audio is off, not speaking: {text}")
+            return None
+        job = self.tts.say(text, interrupt, turn_id=self.tracer.turn_id)
+        if self._wait_for_speech(wait):
+            self.tts.wait(job)
+        return job
+
+    def speak_stream(self, sentences, interrupt=False, wait=None):
         """
-        logger.info(f"Speaking: {text}")
-        self.engine.say(text)
-        self.engine.runAndWait()
+        Speak sentences as they are generated; the TTS worker speaks earlier sentences
+        while later ones are still being generated
+        
+        Returns:
+            str: the full text that was queued for speaking (or generated, without audio)
+        """
+        spoken = []
+        job = None
+        try:
+            for sentence in sentences:
+                # Without audio the reply is still generated and returned, just not spoken
+                if self.tts is not None:
+                    job = self.tts.say(sentence, interrupt and not spoken, turn_id=self.tracer.turn_id)
+                spoken.append(sentence)
+        except Exception as e:
+            logger.error(f"Error generating streamed reply: {e}")
+        if job is not None and self._wait_for_speech(wait):
+            self.tts.wait(job)
+        return " ".join(spoken)
 
-    def get_ai_response(self, user_input):
+    def get_ai_response(self, user_input, speak=False):
         """
         Get response from AI, determining whether to use browser or conversation agent
+        
+        Args:
+            user_input: the recognized utterance
+            speak: speak the reply as well, streaming it sentence by sentence when possible
         """
-        try:
-            # First, determine if this is a browser automation request
+        reply = self.get_reply(user_input)
+        
+        if isinstance(reply, str):
+            if speak:
+                self.speak(reply, interrupt=True)
+            return reply
+        
+        if speak:
+            return self.speak_stream(reply, interrupt=True)
+        return " ".join(reply)
+
+    def get_reply(self, user_input):
+        """
+        Route the input; returns either the reply text or an iterator of reply sentences
+        """
+        if self.local_fast_path:
+            command = parse_simple_command(user_input)
+            if command:
+                logger.info(f"Local fast path command: {command}")
+                return self.browser_agent.execute_command(command)
+        
+        if self.unified_routing:
+            if self.stream_replies:
+                return self._stream_routed_response(user_input)
+            try:
+                return self._get_routed_response(user_input)
+            except Exception as e:
+                logger.warning(f"Unified routing failed, falling back to two-call path: {e}")
+        
+        return self._get_classified_response(user_input)
+
+    def execute_route(self, route):
+        """
+        Act on a routed response: run the planned browser command or return the reply
+        """
+        if route.get("is_browser_task"):
+            if route.get("parallel"):
+                return self.browser_agent.execute_command({"parallel": route["parallel"]})
+            if route.get("plan"):
+                return self.browser_agent.execute_command({"plan": route["plan"]})
+            if not route.get("action"):
+                raise ValueError("Routed browser task is missing an action")
+            return self.browser_agent.execute_command(
+                {"action": route["action"], "params": route.get("params", {})}
+            )
+        
+        if not route.get("response"):
+            raise ValueError("Routed conversation is missing a response")
+        return route["response"]
+
+    def _store(self, system_prompt, user_input, content, parsed):
+        """Cache a JSON answer; replies to the user go stale much sooner than routes"""
+        if self.cache is None:
+            return
+        reply = not parsed.get("is_browser_task") and "response" in parsed
+        self.cache.put(system_prompt, "gpt-4o-mini", user_input, content,
+                       ttl=self.cache.reply_ttl if reply else None)
+
+    def _complete_json(self, system_prompt, user_input, stage="classify"):
+        """
+        Get a JSON completion for the input, answering from the cache when possible
+        
+        Args:
+            stage: names the llm.<stage> span the call is traced as
+        """
+        if self.cache is not None:
+            cached = self.cache.get(system_prompt, "gpt-4o-mini", user_input)
+            if cached is not None:
+                logger.info(f"Response cache hit: {self.cache.stats()}")
+                return json.loads(cached)
+        
+        with self.tracer.span(f"llm.{stage}", model="gpt-4o-mini"):
             response = self.client.chat.completions.create(
                 model="gpt-4o-mini",
                 messages=[
-                    {"role": "system", "content": prompt},
+                    {"role": "system", "content": system_prompt},
                     {"role": "user", "content": user_input}
                 ],
                 temperature=0.7
             )
+        self.tracer.add_usage("gpt-4o-mini", response.usage)
+        
+        content = response.choices[0].message.content
+        logger.info(f"Raw response: {content}")
+        
+        parsed = json.loads(content)
+        self._store(system_prompt, user_input, content, parsed)
+        return parsed
+
+    def route(self, user_input):
+        """
+        Classify the input and plan the browser action or reply in one LLM call,
+        without acting on it (see execute_route)
+        """
+        return self._complete_json(routing_prompt, user_input, stage="route")
+
+    def _get_routed_response(self, user_input):
+        """
+        Route the input and act on the route
+        """
+        return self.execute_route(self.route(user_input))
+
+    def _stream_routed_response(self, user_input):
+        """
+        Streaming variant of _get_routed_response: yields reply sentences as they arrive
+        and runs the browser command once the routed response is complete
+        """
+        yielded = False
+        try:
+            cached = self.cache.get(routing_prompt, "gpt-4o-mini", user_input) if self.cache else None
+            if cached is not None:
+                logger.info(f"Response cache hit: {self.cache.stats()}")
+                route = json.loads(cached)
+                if route.get("is_browser_task"):
+                    yield self.execute_route(route)
+                    return
+                splitter = SentenceSplitter()
+                yield from splitter.feed(self.execute_route(route))
+                tail = splitter.flush()
+                if tail:
+                    yield tail
+                return
             
-            # Parse the response
-            logger.info(f"Raw response: {response.choices[0].message.content}")
+            started = time.perf_counter()
+            stream = self.client.chat.completions.create(
+                model="gpt-4o-mini",
+                messages=[
+                    {"role": "system", "content": routing_prompt},
+                    {"role": "user", "content": user_input}
+                ],
+                temperature=0.7,
+                stream=True,
+                stream_options={"include_usage": True}
+            )
+            
+            # Reply text is only spoken once the route is known not to be a browser task
+            reply = RouteReplyStreamer("response")
+            for chunk in stream:
+                if not chunk.choices:
+                    # With include_usage the last chunk only carries the token usage
+                    self.tracer.add_usage("gpt-4o-mini", getattr(chunk, "usage", None))
+                    continue
+                for sentence in reply.feed(chunk.choices[0].delta.content or ""):
+                    yielded = True
+                    yield sentence
             
-            task_type = json.loads(response.choices[0].message.content)
+            for sentence in reply.flush():
+                yielded = True
+                yield sentence
+            self.tracer.record("llm.route", time.perf_counter() - started, model="gpt-4o-mini", stream=True)
+            
+            content = reply.content
+            logger.info(f"Raw routed response: {content}")
+            route = json.loads(content)
+            self._store(routing_prompt, user_input, content, route)
+            # Browser routes always run, whatever text came with them
+            if route.get("is_browser_task") or not yielded:
+                yield self.execute_route(route)
+        
+        except Exception as e:
+            if yielded:
+                logger.error(f"Streamed routing failed mid-reply: {e}")
+                return
+            logger.warning(f"Unified routing failed, falling back to two-call path: {e}")
+            reply = self._get_classified_response(user_input)
+            if isinstance(reply, str):
+                yield reply
+            else:
+                yield from reply
+
+    def _get_classified_response(self, user_input):
+        """
+        Classify the input, then let the chosen agent make its own LLM call
+        """
+        try:
+            # First, determine if this is a browser automation request
+            task_type = self._complete_json(prompt, user_input)
             
             logger.info(f"Task type: {task_type}")
             
             if task_type.get("is_browser_task"):
                 
                 return self.browser_agent.process_command(user_input)
+            elif self.stream_replies:
+                return self.conversation_agent.stream_conversation(user_input)
             else:
                 return self.conversation_agent.process_conversation(user_input)
                 
@@ -93,18 +366,20 @@ class SpeechHandler:
             tuple: (success: bool, message: str)
         """
         try:
-            with self.microphone as source:
-                logger.info("Listening... Say something!")
-                audio = self.recognizer.listen(source, timeout=5, phrase_time_limit=5)
-                
-            logger.info("Processing speech...")
-            text = self.recognizer.recognize_google(audio)
-            logger.info(f"You said: {text}")
+            listen_started = time.perf_counter()
+            utterance = self._listen()
             
-            response = self.get_ai_response(text)
-            logger.info(f"AI response: {response}")
+            # A turn starts with listening but only counts once something was heard
+            with self.tracer.turn(since=listen_started):
+                self._record_capture(listen_started, utterance.audio)
+                
+                logger.info("Processing speech...")
+                text = self._transcribe(utterance)
+                logger.info(f"You said: {text}")
+                
+                response = self.get_ai_response(text, speak=True)
+                logger.info(f"AI response: {response}")
             
-            self.speak(response)
             return True, response
             
         except sr.WaitTimeoutError:
@@ -116,7 +391,72 @@ class SpeechHandler:
         except Exception as e:
             return False, f"An error occurred: {str(e)}"
 
+    def _transcribe(self, utterance):
+        """
+        Text of an utterance; queued utterances were usually transcribed in the
+        background while the previous turn was being handled
+        """
+        backend = type(self.transcriber).__name__
+        if utterance.transcript is None:
+            with self.tracer.span("stt", backend=backend):
+                return self.transcriber.transcribe(utterance.audio)
+        
+        # Only the time spent waiting here adds to the turn's latency
+        with self.tracer.span("stt", backend=backend, prefetched=True) as span:
+            try:
+                return utterance.transcript.result()
+            finally:
+                span.attributes["transcribe_s"] = utterance.stt_seconds
+
+    def start_capture(self, max_queue=3, drop_policy="drop_oldest", barge_in=False):
+        """
+        Capture utterances on a background thread from now on, so the user can speak the
+        next command while the current one is still being processed or spoken; each
+        utterance is transcribed as soon as it is queued
+        
+        Args:
+            max_queue: utterances kept waiting at most
+            drop_policy: drop_oldest, drop_newest or block when the queue is full
+            barge_in: stop speaking as soon as the user says something; only usable with a
+                headset or echo cancellation, or the assistant interrupts itself. Without
+                it, phrases heard while the assistant speaks are discarded.
+        """
+        self.barge_in = barge_in
+        if self.capture is None:
+            self.capture = UtteranceCapture(
+                self.recognizer, self.microphone, self.calibrator,
+                max_queue=max_queue, drop_policy=drop_policy, phrase_time_limit=5,
+                on_utterance=(lambda utterance: self.tts.cancel()) if barge_in else None,
+                transcribe=self.transcriber.transcribe
+            )
+        self.capture.start()
+    
+    def stop_capture(self):
+        """Go back to listening only when asked"""
+        if self.capture is not None:
+            self.capture.stop()
+            self.capture = None
+
+    def _listen(self):
+        """
+        Capture one utterance from the microphone, or take the next queued one when
+        background capture is running
+        """
+        if self.capture is not None:
+            utterance = self.capture.get(timeout=5)
+            logger.info(f"Processing queued utterance ({self.capture.queue.qsize()} still waiting)")
+            return utterance
+        with self.calibrator.paused(), self.microphone as source:
+            logger.info("Listening... Say something!")
+            return Utterance(self.recognizer.listen(source, timeout=5, phrase_time_limit=5))
+
     def __del__(self):
         """Cleanup when the object is destroyed"""
+        if getattr(self, 'capture', None) is not None:
+            self.capture.stop()
+        if getattr(self, 'calibrator', None) is not None:
+            self.calibrator.stop()
+        if getattr(self, 'tts', None) is not None:
+            self.tts.stop()
         if hasattr(self, 'browser_agent'):
             del self.browser_agent
\ No newline at end of file
@@ -1,12 +1,18 @@
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import TimeoutException, NoSuchElementException
-from typing import Dict, Any, Tuple, Optional, List, TypedDict, Union
-from dataclasses import dataclass
+from selenium.common.exceptions import TimeoutException
+from typing import Dict, Any, Optional, List, TypedDict, Union
+from dataclasses import dataclass, fields
 import logging
 import time
 from selenium.webdriver.common.keys import Keys
+from assistant.tools.readiness import Readiness, WAIT_POLICIES
+from assistant.tools.locator import LocatorResolver
+from assistant.tools.selector_cache import SelectorCache
+from assistant.tools.extractor import extract_elements
+from assistant.tools.tab_manager import TabManager
+from assistant.tools.resource_blocker import ResourceBlocker
+from assistant.utils.tracing import Tracer
 
 logger = logging.getLogger(__name__)
 
@@ -14,11 +20,19 @@ logger = logging.getLogger(__name__)
 @dataclass
 class NavigateInput:
     url: str
+    new_tab: Optional[bool] = None
+    # Readiness policy (see readiness.WAIT_POLICIES); None uses the tools' default
+    wait_until: Optional[str] = None
+    # Return as soon as this CSS/XPath selector matches
+    wait_for: Optional[str] = None
+    # Task type choosing which resources are blocked (see resource_blocker.TASK_PROFILES)
+    task: Optional[str] = None
 
 @dataclass
 class SearchInput:
     query: str
     search_box_selector: str = 'input[name="q"]'
+    wait_until: Optional[str] = None
 
 @dataclass
 class ClickInput:
@@ -26,6 +40,7 @@ class ClickInput:
     by: str = By.CSS_SELECTOR
     index: int = 0
     timeout: int = 10
+    role: Optional[str] = None
 
 @dataclass
 class TypeInput:
@@ -33,12 +48,14 @@ class TypeInput:
     text: str
     by: str = By.CSS_SELECTOR
     timeout: int = 10
+    role: Optional[str] = None
 
 @dataclass
 class ReadInput:
     selector: str
     by: str = By.CSS_SELECTOR
     timeout: int = 10
+    role: Optional[str] = None
 
 @dataclass
 class ScrollInput:
@@ -55,6 +72,80 @@ class WaitInput:
 class FormInput:
     fields: Dict[str, str]
     timeout: int = 10
+    bulk: bool = True
+
+@dataclass
+class ExtractInput:
+    # CSS/XPath selectors, or {"selector", "name", "attributes", "limit"} queries
+    queries: List[Union[str, Dict[str, Any]]]
+    timeout: int = 10
+
+# Returns the selectors that don't match anything yet
+MISSING_FIELDS_SCRIPT = """
+return arguments[0].filter(selector => {
+    try {
+        return !document.querySelector(selector);
+    } catch (e) {
+        return false;
+    }
+});
+"""
+
+# Locates, sets and fires input/change events for every field in one round trip.
+# Uses the native value setter so framework-controlled inputs (React etc.) see the change.
+FILL_FORM_SCRIPT = """
+const results = [];
+for (const [selector, value] of arguments[0]) {
+    let element;
+    try {
+        element = document.querySelector(selector);
+    } catch (e) {
+        results.push({selector: selector, status: 'error', error: 'Invalid selector'});
+        continue;
+    }
+    if (!element) {
+        results.push({selector: selector, status: 'error', error: 'Element not found'});
+        continue;
+    }
+    if (element.disabled || element.readOnly) {
+        results.push({selector: selector, status: 'error', error: 'Element is disabled or read-only'});
+        continue;
+    }
+
+    const tag = element.tagName.toLowerCase();
+    const type = (element.type || '').toLowerCase();
+    if (type === 'file') {
+        results.push({selector: selector, status: 'needs_keys', element: element});
+        continue;
+    }
+
+    try {
+        element.focus();
+        let committed;
+        if (type === 'checkbox' || type === 'radio') {
+            element.checked = ['true', 'on', 'yes', '1', 'checked'].includes(String(value).toLowerCase());
+            committed = true;
+        } else if (element.isContentEditable) {
+            element.textContent = value;
+            committed = element.textContent === value;
+        } else {
+            const proto = tag === 'textarea' ? HTMLTextAreaElement.prototype
+                : tag === 'select' ? HTMLSelectElement.prototype : HTMLInputElement.prototype;
+            Object.getOwnPropertyDescriptor(proto, 'value').set.call(element, value);
+            committed = String(element.value) === String(value);
+        }
+        element.dispatchEvent(new Event('input', {bubbles: true}));
+        element.dispatchEvent(new Event('change', {bubbles: true}));
+        element.blur();
+        results.push(committed
+            ? {selector: selector, status: 'filled'}
+            : {selector: selector, status: 'needs_keys', element: element});
+    } catch (e) {
+        results.push({selector: selector, status: 'needs_keys', element: element, error: String(e)});
+    }
+}
+return results;
+"""
 
 # Standard response type
 class BrowserResponse(TypedDict):
@@ -64,14 +155,79 @@ class BrowserResponse(TypedDict):
     data: Optional[Any]
     error: Optional[str]
 
+# Report for a multi-step plan
+class PlanReport(TypedDict):
+    status: str
+    message: str
+    steps: List[BrowserResponse]
+    failed_step: Optional[int]
+    skipped: List[Dict[str, Any]]
+
 class BrowserTools:
-    def __init__(self, driver):
+    # Plan action name -> (input type, method name)
+    PLAN_ACTIONS = {
+        "navigate": (NavigateInput, "navigate"),
+        "search": (SearchInput, "search"),
+        "click": (ClickInput, "click_element"),
+        "type": (TypeInput, "type_text"),
+        "read": (ReadInput, "read_text"),
+        "scroll": (ScrollInput, "scroll_page"),
+        "wait": (WaitInput, "wait_for_element"),
+        "fill_form": (FormInput, "fill_form"),
+        "extract": (ExtractInput, "extract"),
+    }
+    
+    # Steps that wait for their own target element, so a navigate right before them
+    # only has to wait for the new document to commit
+    SELF_WAITING_ACTIONS = ("click", "type", "read", "wait", "extract", "fill_form")
+    
+    # Steps after a navigate that decide which resources the page needs
+    INTERACTIVE_ACTIONS = ("click", "type", "fill_form")
+    READ_ACTIONS = ("read", "extract", "search", "wait")
+    
+    def __init__(self, driver, human_typing: bool = False, typing_delay: float = 0.1,
+                 selector_cache: Optional[SelectorCache] = None,
+                 tabs: Optional[TabManager] = None, wait: Optional[Readiness] = None,
+                 wait_until: str = "domcontentloaded", blocker: Optional[ResourceBlocker] = None,
+                 tracer: Optional[Tracer] = None):
         self.driver = driver
+        # Share the browser's tab manager so tab limits apply across both APIs
+        self.tabs = tabs or TabManager(driver)
         self.default_timeout = 10
+        # Share the browser's Readiness too, since lifecycle events are drained from one log
+        self.wait = wait or Readiness(driver)
+        # Default readiness policy for navigate and search
+        if wait_until not in WAIT_POLICIES:
+            raise ValueError(f"Unknown wait policy: {wait_until}")
+        self.wait_until = wait_until
+        # Optional resource blocking for navigations that only read the page
+        self.blocker = blocker
+        # Each plan step is timed as a browser.<action> span
+        self.tracer = tracer or Tracer()
+        # With a selector cache, locators learned per site and role are tried first
+        self.locator = LocatorResolver(driver, cache=selector_cache)
+        # Opt-in keystroke-by-keystroke typing for sites that reject pasted input
+        self.human_typing = human_typing
+        self.typing_delay = typing_delay
+    
+    def _enter_text(self, element, text: str) -> bool:
+        """
+        Type text into an element and wait for the value to be committed
+        
+        Returns:
+            True once the element reports the typed value
+        """
+        if self.human_typing:
+            for char in text:
+                element.send_keys(char)
+                time.sleep(self.typing_delay)
+        else:
+            element.send_keys(text)
+        return self.wait.value_committed(element, text)
     
     def navigate(self, input_data: NavigateInput) -> BrowserResponse:
         """
-        Navigate to a specific URL in a new tab
+        Navigate to a specific URL, reusing or opening a tab as the tab manager decides
         
         Args:
             input_data: NavigateInput containing URL
@@ -84,14 +240,27 @@ class BrowserTools:
             if not url.startswith(('http://', 'https://')):
                 url = 'https://' + url
                 
-            self.driver.execute_script(f"window.open('{url}', '_blank');")
-            self.driver.switch_to.window(self.driver.window_handles[-1])
+            blocking = {"profile": "none"}
+            
+            def prepare():
+                if self.blocker is not None:
+                    blocking["profile"] = self.blocker.apply(url, input_data.task)
+                self.wait.begin_navigation()
+            
+            previous_url = self.tabs.open(url, input_data.new_tab, prepare)
+            
+            # Wait for the URL to leave the previous page and the page to be as ready as requested
+            policy = "selector" if input_data.wait_for else (input_data.wait_until or self.wait_until)
+            # The blocker's page_ready also reloads the page if its document was blocked
+            waiter = self.blocker if self.blocker is not None else self.wait
+            waiter.page_ready(policy, previous_url, self.default_timeout, selector=input_data.wait_for)
+            self.tabs.touch()
             
             return {
                 "status": "success",
                 "action": "navigate",
                 "message": f"Successfully navigated to {url}",
-                "data": {"url": url},
+                "data": {"url": url, "blocking": blocking["profile"]},
                 "error": None
             }
         except Exception as e:
@@ -114,17 +283,12 @@ class BrowserTools:
             BrowserResponse with search result
         """
         try:
-            # Wait for initial page load
-            WebDriverWait(self.driver, self.default_timeout).until(
-                lambda d: d.execute_script('return document.readyState') == 'complete'
-            )
+            # Wait until the page can be interacted with
+            self.wait.document_ready(self.default_timeout, state="interactive")
             
-            # Additional wait for dynamic content
-            time.sleep(2)
-            
-            # Define search box locators with multiple strategies
-            search_locators = [
-                (By.CSS_SELECTOR, input_data.search_box_selector),
+            # The requested selector first, then locators learned for this site, then
+            # common search box locators
+            fallback_locators = [
                 (By.CSS_SELECTOR, "input[name='q']"),
                 (By.CSS_SELECTOR, "input#search"),
                 (By.CSS_SELECTOR, "#search input"),
@@ -132,128 +296,118 @@ class BrowserTools:
                 (By.TAG_NAME, "input"),
             ]
             
-            search_box = None
-            last_error = None
+            # Probe every locator in one script per poll; the first editable match wins
+            try:
+                matched, search_box = self.locator.resolve(
+                    [(By.CSS_SELECTOR, input_data.search_box_selector)], self.default_timeout,
+                    state="editable", role="search_box", fallbacks=fallback_locators
+                )
+            except TimeoutException as e:
+                raise Exception(f"Could not find interactive search box. Last error: {e}")
+            logger.debug(f"Search box matched locator {matched}")
             
-            # Try each locator strategy
-            for by, selector in search_locators:
-                try:
-                    # First wait for presence
-                    element = WebDriverWait(self.driver, 3).until(
-                        EC.presence_of_element_located((by, selector))
-                    )
-                    
-                    # Then wait for interactability
-                    search_box = WebDriverWait(self.driver, 3).until(
-                        EC.element_to_be_clickable((by, selector))
-                    )
-                    
-                    # Verify element is truly interactive
-                    if search_box.is_displayed() and search_box.is_enabled():
-                        # Scroll element into view
-                        self.driver.execute_script("arguments[0].scrollIntoView(true);", search_box)
-                        time.sleep(0.5)  # Let the scroll complete
-                        
-                        # Try to focus the element
-                        self.driver.execute_script("arguments[0].focus();", search_box)
-                        
-                        # Try to click it
-                        try:
-                            search_box.click()
-                        except:
-                            # If direct click fails, try JavaScript click
-                            self.driver.execute_script("arguments[0].click();", search_box)
-                        
-                        break
-                except Exception as e:
-                    last_error = e
-                    logger.debug(f"Locator ({by}, {selector}) failed: {str(e)}")
-                    continue
+            # Bring it into view and focus it; scrollIntoView is synchronous
+            self.driver.execute_script(
+                "arguments[0].scrollIntoView({block: 'center'}); arguments[0].focus();",
+                search_box
+            )
             
-            if not search_box:
-                raise Exception(f"Could not find interactive search box. Last error: {last_error}")
+            # Try to click it
+            try:
+                search_box.click()
+            except Exception:
+                # If direct click fails, try JavaScript click
+                self.driver.execute_script("arguments[0].click();", search_box)
             
             # Clear the search box
             try:
-                # Try multiple clearing methods
                 search_box.clear()
                 self.driver.execute_script("arguments[0].value = '';", search_box)
-                search_box.send_keys(Keys.CONTROL + "a")  # Select all text
-                search_box.send_keys(Keys.DELETE)         # Delete selected text
             except Exception as e:
                 logger.warning(f"Clear attempt failed: {e}")
             
             # Type the search query
             try:
-                # Type slowly to avoid issues
-                for char in input_data.query:
-                    search_box.send_keys(char)
-                    time.sleep(0.1)
+                committed = self._enter_text(search_box, input_data.query)
             except Exception as e:
-                # Fallback to JavaScript if typing fails
                 logger.warning(f"Normal typing failed: {e}")
+                committed = False
+            if not committed:
+                # Fallback to JavaScript if typing didn't stick
                 self.driver.execute_script(
-                    "arguments[0].value = arguments[1];", 
-                    search_box, 
+                    "arguments[0].value = arguments[1];"
+                    "arguments[0].dispatchEvent(new Event('input', {bubbles: true}));",
+                    search_box,
                     input_data.query
                 )
-                
             
-            # Submit the search
-            try:
-                # Try multiple submit methods
-                search_box.send_keys(Keys.RETURN)
-                time.sleep(0.5)
-                
-                if "google" in self.driver.current_url:
-                    # Click search button for Google
-                    buttons = self.driver.find_elements(By.CSS_SELECTOR, "input[type='submit']")
-                    for button in buttons:
-                        if button.is_displayed() and button.is_enabled():
-                            button.click()
-                            time.sleep(0.5)
-                            
-
-                            
-                       
-                            break
-                
-            except Exception as submit_error:
-                logger.warning(f"Normal submit failed: {submit_error}")
+            # Submit the search and wait for the navigation to actually start
+            previous_url = self.driver.current_url
+            if self.blocker is not None:
+                # Pick the profile for where the form submits to, i.e. the results page
+                results_url = self.driver.execute_script(
+                    "return arguments[0].form ? arguments[0].form.action : null;", search_box
+                )
+                self.blocker.apply(results_url or previous_url, "search")
+            self.wait.begin_navigation()
+            search_box.send_keys(Keys.RETURN)
+            
+            if not self.wait.navigation_started(timeout=2, previous_url=previous_url):
+                logger.warning("Enter did not submit the search, trying the submit button")
                 try:
-                    # Try JavaScript form submit
-                    self.driver.execute_script(
-                        "arguments[0].form.submit();", 
-                        search_box
-                    )
+                    try:
+                        _, button = self.locator.resolve(
+                            [
+                                (By.CSS_SELECTOR, "button[type='submit']"),
+                                (By.CSS_SELECTOR, "input[type='submit']"),
+                                (By.CSS_SELECTOR, "button[aria-label*='Search' i]"),
+                            ],
+                            timeout=1,
+                            role="submit"
+                        )
+                        button.click()
+                    except TimeoutException:
+                        # Try JavaScript form submit
+                        self.driver.execute_script("arguments[0].form.submit();", search_box)
                 except Exception as js_error:
                     logger.error(f"JavaScript submit failed: {js_error}")
                     raise Exception("Failed to submit search")
+                
+                if not self.wait.navigation_started(self.default_timeout, previous_url=previous_url):
+                    logger.warning("No navigation detected after submitting the search")
             
-            # Wait for results page
-            WebDriverWait(self.driver, self.default_timeout).until(
-                lambda d: d.execute_script('return document.readyState') == 'complete'
-            )
+            # Wait for results page; the result locator below polls for the results themselves
+            policy = input_data.wait_until or self.wait_until
+            if policy != "selector":
+                waiter = self.blocker if self.blocker is not None else self.wait
+                waiter.page_ready(policy, timeout=self.default_timeout)
             
-            # search_results = self.driver.find_elements(By.CSS_SELECTOR, "h3")[:3]
-                    
-              
-            search_results = self.driver.find_elements(By.CSS_SELECTOR, "div.tF2Cxc a")[:3]  # Updated selector
-
-      
-            print("------ search results ------ \n")
-            print(search_results)
-            print("\n------ search results ------")
-            
-            # print("Top 3 Results:")
-            # for i, result in enumerate(search_results, 1):
-            #     parent_link = result.find_element(By.XPATH, "./ancestor::a")
-            #     print(f"{i}. {parent_link.get_attribute('href')}")
-
-            print("\nTop 3 Results:")
+            # Find which result locator works on this site, then collect the top results
+            result_locators = [
+                (By.CSS_SELECTOR, "div.tF2Cxc a"),
+                (By.CSS_SELECTOR, "#search a[href]:has(h3)"),
+                (By.CSS_SELECTOR, "main a[href]:has(h3)"),
+                (By.CSS_SELECTOR, "a#video-title"),
+            ]
+            search_results = []
+            try:
+                (by, selector), _ = self.locator.resolve(
+                    result_locators, timeout=3, state="visible", role="search_result"
+                )
+                if by == By.CSS_SELECTOR:
+                    # Titles and links of the top results in one evaluation
+                    extracted = extract_elements(
+                        self.driver,
+                        [{"selector": selector, "name": "results", "attributes": ["text", "href"], "limit": 3}],
+                        timeout=0
+                    )
+                    search_results = extracted["results"]["items"]
+            except TimeoutException:
+                pass
+            
+            logger.info("Top 3 Results:")
             for i, result in enumerate(search_results, 1):
-                print(f"{i}. {result.get_attribute('href')}")
-                                   
+                logger.info(f"{i}. {result['href']}")
             
             return {
                 "status": "success",
@@ -261,7 +415,8 @@ class BrowserTools:
                 "message": f"Successfully searched for '{input_data.query}'",
                 "data": {
                     "query": input_data.query,
-                    "url": self.driver.current_url
+                    "url": self.driver.current_url,
+                    "results": search_results
                 },
                 "error": None
             }
@@ -275,6 +430,10 @@ class BrowserTools:
                 "data": None,
                 "error": str(e)
             }
+        finally:
+            # Whatever the user opens from the results page loads in full
+            if self.blocker is not None:
+                self.blocker.reset()
 
 
     def click_element(self, input_data: ClickInput) -> BrowserResponse:
@@ -288,12 +447,27 @@ class BrowserTools:
             BrowserResponse with click result
         """
         try:
-            elements = WebDriverWait(self.driver, input_data.timeout).until(
-                EC.presence_of_all_elements_located((input_data.by, input_data.selector))
-            )
+            if input_data.index >= 0:
+                try:
+                    _, element = self.locator.resolve(
+                        [(input_data.by, input_data.selector)],
+                        input_data.timeout,
+                        state="interactable",
+                        index=input_data.index,
+                        role=input_data.role
+                    )
+                except TimeoutException:
+                    # Report a short match list as an index error rather than a timeout
+                    count = len(self.driver.find_elements(input_data.by, input_data.selector))
+                    if 0 < count <= input_data.index:
+                        element = None
+                    else:
+                        raise
+            else:
+                element = None
             
-            if 0 <= input_data.index < len(elements):
-                elements[input_data.index].click()
+            if element is not None:
+                element.click()
                 return {
                     "status": "success",
                     "action": "click",
@@ -329,11 +503,13 @@ class BrowserTools:
             BrowserResponse with typing result
         """
         try:
-            element = WebDriverWait(self.driver, input_data.timeout).until(
-                EC.presence_of_element_located((input_data.by, input_data.selector))
+            _, element = self.locator.resolve(
+                [(input_data.by, input_data.selector)], input_data.timeout,
+                state="editable", role=input_data.role
             )
             element.clear()
-            element.send_keys(input_data.text)
+            if not self._enter_text(element, input_data.text):
+                logger.warning(f"Typed value not confirmed for {input_data.selector}")
             
             return {
                 "status": "success",
@@ -362,8 +538,9 @@ class BrowserTools:
             BrowserResponse with extracted text
         """
         try:
-            element = WebDriverWait(self.driver, input_data.timeout).until(
-                EC.presence_of_element_located((input_data.by, input_data.selector))
+            _, element = self.locator.resolve(
+                [(input_data.by, input_data.selector)], input_data.timeout,
+                state="visible", role=input_data.role
             )
             text = element.text
             
@@ -396,6 +573,7 @@ class BrowserTools:
         try:
             amount = -input_data.amount if input_data.direction.lower() == "up" else input_data.amount
             self.driver.execute_script(f"window.scrollBy(0, {amount});")
+            self.wait.scroll_settled()
             
             return {
                 "status": "success",
@@ -424,8 +602,8 @@ class BrowserTools:
             BrowserResponse with wait result
         """
         try:
-            element = WebDriverWait(self.driver, input_data.timeout).until(
-                EC.presence_of_element_located((input_data.by, input_data.selector))
+            self.locator.resolve(
+                [(input_data.by, input_data.selector)], input_data.timeout, state="present"
             )
             
             return {
@@ -444,25 +622,81 @@ class BrowserTools:
                 "error": str(e)
             }
     
+    def extract(self, input_data: ExtractInput) -> BrowserResponse:
+        """
+        Read many selectors and attributes (text, href, value, ...) in one in-page evaluation
+        
+        Args:
+            input_data: ExtractInput containing the queries
+            
+        Returns:
+            BrowserResponse with {name: [items]} results and per-query counts
+        """
+        try:
+            extracted = extract_elements(
+                self.driver, input_data.queries, input_data.timeout, self.wait.poll_frequency
+            )
+            results = {name: result["items"] for name, result in extracted.items()}
+            errors = {name: result["error"] for name, result in extracted.items() if result["error"]}
+            
+            if not any(results.values()):
+                return {
+                    "status": "error",
+                    "action": "extract",
+                    "message": "No elements matched any of the selectors",
+                    "data": {"results": results, "errors": errors},
+                    "error": "NoMatches"
+                }
+            
+            return {
+                "status": "success",
+                "action": "extract",
+                "message": f"Extracted {sum(len(items) for items in results.values())} elements",
+                "data": {
+                    "results": results,
+                    "counts": {name: len(items) for name, items in results.items()},
+                    "errors": errors
+                },
+                "error": None
+            }
+        except Exception as e:
+            return {
+                "status": "error",
+                "action": "extract",
+                "message": f"Extraction failed: {str(e)}",
+                "data": None,
+                "error": str(e)
+            }
+    
     def fill_form(self, input_data: FormInput) -> BrowserResponse:
         """
         Fill multiple form fields
         
+        In bulk mode every field is located, set and sent input/change events in a
+        single script; only fields that reject programmatic input are typed with keystrokes.
+        
         Args:
             input_data: FormInput containing field mappings
             
         Returns:
-            BrowserResponse with form fill result
+            BrowserResponse with form fill result and per-field status
         """
         results = []
         try:
-            for selector, value in input_data.fields.items():
-                element = WebDriverWait(self.driver, input_data.timeout).until(
-                    EC.presence_of_element_located((By.CSS_SELECTOR, selector))
-                )
-                element.clear()
-                element.send_keys(value)
-                results.append(f"Filled {selector}")
+            if input_data.bulk:
+                results = self._fill_form_bulk(input_data)
+            else:
+                results = self._fill_form_by_keys(input_data)
+            
+            failed = [result for result in results if result["status"] == "error"]
+            if failed:
+                return {
+                    "status": "error",
+                    "action": "fill_form",
+                    "message": f"Form fill failed for {', '.join(result['selector'] for result in failed)}",
+                    "data": {"fields": input_data.fields, "results": results},
+                    "error": failed[0]["error"]
+                }
             
             return {
                 "status": "success",
@@ -478,4 +712,145 @@ class BrowserTools:
                 "message": f"Form fill failed: {str(e)}",
                 "data": {"partial_results": results},
                 "error": str(e)
-            }
\ No newline at end of file
+            }
+    
+    def _fill_form_bulk(self, input_data: FormInput) -> List[Dict[str, Any]]:
+        """Fill all fields in one script execution, falling back to keystrokes per field"""
+        selectors = list(input_data.fields)
+        
+        # Wait (polling one script) until every field is in the DOM, or report the missing ones
+        try:
+            WebDriverWait(self.driver, input_data.timeout, poll_frequency=self.wait.poll_frequency).until(
+                lambda d: not d.execute_script(MISSING_FIELDS_SCRIPT, selectors)
+            )
+        except TimeoutException:
+            logger.warning("Some form fields never appeared")
+        
+        pairs = [[selector, str(value)] for selector, value in input_data.fields.items()]
+        results = []
+        for result in self.driver.execute_script(FILL_FORM_SCRIPT, pairs):
+            element = result.pop("element", None)
+            if result["status"] == "needs_keys":
+                value = str(input_data.fields[result["selector"]])
+                try:
+                    element.clear()
+                    committed = self._enter_text(element, value)
+                    result = {"selector": result["selector"], "status": "filled_by_keys" if committed else "unconfirmed"}
+                except Exception as e:
+                    result = {"selector": result["selector"], "status": "error", "error": str(e)}
+            results.append({"selector": result["selector"], "status": result["status"], "error": result.get("error")})
+        return results
+    
+    def _fill_form_by_keys(self, input_data: FormInput) -> List[Dict[str, Any]]:
+        """Fill fields one at a time with keystrokes"""
+        results = []
+        for selector, value in input_data.fields.items():
+            _, element = self.locator.resolve(
+                [(By.CSS_SELECTOR, selector)], input_data.timeout, state="editable"
+            )
+            element.clear()
+            committed = self._enter_text(element, str(value))
+            if not committed:
+                logger.warning(f"Typed value not confirmed for {selector}")
+            results.append({"selector": selector, "status": "filled_by_keys" if committed else "unconfirmed", "error": None})
+        return results
+    
+    def run_step(self, step: Dict[str, Any]) -> BrowserResponse:
+        """
+        Run one plan step of the form {"action": ..., "params": {...}}
+        
+        Args:
+            step: action name and its parameters
+            
+        Returns:
+            BrowserResponse from the matching tool
+        """
+        action = step.get("action")
+        if action not in self.PLAN_ACTIONS:
+            return {
+                "status": "error",
+                "action": str(action),
+                "message": f"Unknown action: {action}",
+                "data": None,
+                "error": "UnknownAction"
+            }
+        
+        input_type, method_name = self.PLAN_ACTIONS[action]
+        params = step.get("params") or {}
+        known = {field.name for field in fields(input_type)}
+        try:
+            input_data = input_type(**{k: v for k, v in params.items() if k in known})
+        except TypeError as e:
+            return {
+                "status": "error",
+                "action": action,
+                "message": f"Invalid parameters for {action}: {str(e)}",
+                "data": None,
+                "error": str(e)
+            }
+        return getattr(self, method_name)(input_data)
+    
+    def _tune_navigate(self, step: Dict[str, Any], following: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Fill in a navigate step's wait policy and task type from the steps after it,
+        unless the plan set them explicitly
+        """
+        params = dict(step.get("params") or {})
+        actions = []
+        for later in following:
+            if later.get("action") == "navigate":
+                break
+            actions.append(later.get("action"))
+        
+        if actions and actions[0] in self.SELF_WAITING_ACTIONS \
+                and not params.get("wait_until") and not params.get("wait_for"):
+            # The next step polls for its own element, so don't wait for the full page
+            params["wait_until"] = "commit"
+        if not params.get("task") and actions:
+            if any(action in self.INTERACTIVE_ACTIONS for action in actions):
+                params["task"] = "interactive"
+            elif all(action in self.READ_ACTIONS or action == "scroll" for action in actions):
+                params["task"] = "read"
+        return {**step, "params": params}
+    
+    def execute_plan(self, steps: List[Dict[str, Any]]) -> PlanReport:
+        """
+        Execute an ordered plan of steps, stopping at the first failure
+        
+        Args:
+            steps: list of {"action": ..., "params": {...}} steps
+            
+        Returns:
+            PlanReport with every executed step's response and the steps that were skipped
+        """
+        results: List[BrowserResponse] = []
+        try:
+            for index, step in enumerate(steps):
+                if step.get("action") == "navigate":
+                    step = self._tune_navigate(step, steps[index + 1:])
+                with self.tracer.span(f"browser.{step.get('action')}", plan_step=index) as span:
+                    result = self.run_step(step)
+                    span.status = "ok" if result["status"] == "success" else "error"
+                results.append(result)
+                logger.info(f"Plan step {index + 1}/{len(steps)} {result['action']}: {result['message']}")
+            
+                if result["status"] != "success":
+                    return {
+                        "status": "error",
+                        "message": f"Step {index + 1} ({result['action']}) failed: {result['message']}",
+                        "steps": results,
+                        "failed_step": index,
+                        "skipped": steps[index + 1:]
+                    }
+        
+            return {
+                "status": "success",
+                "message": f"Completed {len(steps)} steps",
+                "steps": results,
+                "failed_step": None,
+                "skipped": []
+            }
+        finally:
+            # Blocking only serves the plan's own reads; later navigations load in full
+            if self.blocker is not None:
+                self.blocker.reset()
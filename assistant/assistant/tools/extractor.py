@@ -0,0 +1,88 @@
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.common.exceptions import TimeoutException
+from typing import Any, Dict, List, Union
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Reads every query in one evaluation. Selectors starting with "/" or "(" are XPath,
+# everything else is CSS. "text", "href" and "value" read element properties (href is
+# resolved to an absolute URL); any other name is read with getAttribute.
+EXTRACT_SCRIPT = """
+const output = {};
+for (const query of arguments[0]) {
+    let elements = [];
+    try {
+        if (query.selector.startsWith('/') || query.selector.startsWith('(')) {
+            const snapshot = document.evaluate(
+                query.selector, document, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+            for (let i = 0; i < snapshot.snapshotLength; i++) elements.push(snapshot.snapshotItem(i));
+        } else {
+            elements = Array.from(document.querySelectorAll(query.selector));
+        }
+    } catch (e) {
+        output[query.name] = {error: String(e), items: []};
+        continue;
+    }
+    if (query.limit > 0) elements = elements.slice(0, query.limit);
+
+    output[query.name] = {error: null, items: elements.map(element => {
+        const item = {};
+        for (const attribute of query.attributes) {
+            if (attribute === 'text') item.text = (element.innerText || element.textContent || '').trim();
+            else if (attribute === 'href') item.href = element.href || element.getAttribute('href');
+            else if (attribute === 'value') item.value = element.value === undefined ? null : element.value;
+            else item[attribute] = element.getAttribute(attribute);
+        }
+        return item;
+    })};
+}
+return output;
+"""
+
+Query = Union[str, Dict[str, Any]]
+
+
+def normalize_queries(queries: List[Query]) -> List[Dict[str, Any]]:
+    """
+    Turn plain selectors or partial query dicts into full queries
+
+    A query is {"selector": ..., "name": ..., "attributes": [...], "limit": n};
+    name defaults to the selector, attributes to ["text"] and limit to 0 (no limit).
+    """
+    normalized = []
+    for query in queries:
+        if isinstance(query, str):
+            query = {"selector": query}
+        normalized.append({
+            "selector": query["selector"],
+            "name": query.get("name") or query["selector"],
+            "attributes": list(query.get("attributes") or ["text"]),
+            "limit": int(query.get("limit") or 0),
+        })
+    return normalized
+
+
+def extract_elements(driver, queries: List[Query], timeout: float = 10,
+                     poll_frequency: float = 0.05) -> Dict[str, Dict[str, Any]]:
+    """
+    Read many selectors and attributes in a single in-page evaluation
+
+    Polls the one script until at least one query has matches or the timeout expires,
+    then returns whatever was found.
+
+    Returns:
+        {name: {"error": str or None, "items": [{attribute: value, ...}, ...]}}
+    """
+    normalized = normalize_queries(queries)
+    state = {"output": {}}
+
+    def found(d):
+        state["output"] = d.execute_script(EXTRACT_SCRIPT, normalized)
+        return any(result["items"] for result in state["output"].values())
+
+    try:
+        WebDriverWait(driver, timeout, poll_frequency=poll_frequency).until(found)
+    except TimeoutException:
+        logger.debug(f"No matches for {[query['selector'] for query in normalized]} within {timeout}s")
+    return state["output"]
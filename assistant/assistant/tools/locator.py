@@ -0,0 +1,195 @@
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.common.exceptions import TimeoutException
+from typing import List, Optional, Tuple
+from urllib.parse import urlparse
+import logging
+import re
+import time
+
+logger = logging.getLogger(__name__)
+
+# A candidate is a Selenium (By, selector) pair, e.g. (By.CSS_SELECTOR, "input[name='q']")
+Locator = Tuple[str, str]
+
+# A CSS selector that is only a tag name, e.g. "input"
+BARE_TAG = re.compile(r"\s*[a-zA-Z][\w-]*\s*")
+
+# Evaluates every candidate in priority order inside the page and returns the first
+# element in the requested state as [candidate index, element], or null.
+RESOLVE_SCRIPT = """
+const candidates = arguments[0];
+const state = arguments[1];
+const index = arguments[2];
+
+function find(by, selector) {
+    switch (by) {
+        case 'css selector':
+            return Array.from(document.querySelectorAll(selector));
+        case 'xpath': {
+            const snapshot = document.evaluate(
+                selector, document, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+            const nodes = [];
+            for (let i = 0; i < snapshot.snapshotLength; i++) nodes.push(snapshot.snapshotItem(i));
+            return nodes;
+        }
+        case 'id': {
+            const element = document.getElementById(selector);
+            return element ? [element] : [];
+        }
+        case 'name':
+            return Array.from(document.getElementsByName(selector));
+        case 'tag name':
+            return Array.from(document.getElementsByTagName(selector));
+        case 'class name':
+            return Array.from(document.getElementsByClassName(selector));
+        case 'link text':
+            return Array.from(document.querySelectorAll('a')).filter(a => a.innerText.trim() === selector);
+        case 'partial link text':
+            return Array.from(document.querySelectorAll('a')).filter(a => a.innerText.includes(selector));
+    }
+    return [];
+}
+
+function visible(element) {
+    const style = window.getComputedStyle(element);
+    if (style.display === 'none' || style.visibility === 'hidden' || style.opacity === '0') return false;
+    const rect = element.getBoundingClientRect();
+    return rect.width > 0 && rect.height > 0;
+}
+
+function enabled(element) {
+    return !element.disabled && element.getAttribute('aria-disabled') !== 'true';
+}
+
+function ready(element) {
+    if (state === 'present') return true;
+    if (!visible(element)) return false;
+    if (state === 'visible') return true;
+    if (!enabled(element)) return false;
+    return state !== 'editable' || !element.readOnly;
+}
+
+for (let i = 0; i < candidates.length; i++) {
+    let matches;
+    try {
+        matches = find(candidates[i][0], candidates[i][1]);
+    } catch (e) {
+        continue;  // invalid selector for this strategy
+    }
+    if (index > 0) {
+        if (matches.length > index && ready(matches[index])) return [i, matches[index]];
+        continue;
+    }
+    for (const element of matches) {
+        if (ready(element)) return [i, element];
+    }
+}
+return null;
+"""
+
+
+def is_specific(locator: Locator) -> bool:
+    """
+    Whether a locator names a particular element rather than any element of a kind;
+    generic ones (a bare tag name) match too much to be learned for a role
+    """
+    by, selector = locator
+    if by == "tag name":
+        return False
+    return not (by == "css selector" and BARE_TAG.fullmatch(selector))
+
+
+class LocatorResolver:
+    """
+    Resolve an element from a prioritized list of candidate locators
+
+    All candidates are evaluated in a single execute_script round trip, and that one
+    script is polled until a match appears, instead of running a separate wait per locator.
+
+    States:
+        present: in the DOM
+        visible: displayed with a non-empty box
+        interactable: visible and not disabled
+        editable: interactable and not read-only
+    """
+
+    def __init__(self, driver, poll_frequency: float = 0.05, cache=None):
+        self.driver = driver
+        self.poll_frequency = poll_frequency
+        # Optional SelectorCache; known-good locators for a role are tried after the candidates
+        self.cache = cache
+
+    def find(self, candidates: List[Locator], state: str = "interactable",
+             index: int = 0) -> Optional[Tuple[int, object]]:
+        """
+        Evaluate all candidates once
+
+        Returns:
+            (candidate index, element) for the first match, or None
+        """
+        result = self.driver.execute_script(
+            RESOLVE_SCRIPT, [list(candidate) for candidate in candidates], state, index
+        )
+        if not result:
+            return None
+        return result[0], result[1]
+
+    def resolve(self, candidates: List[Locator], timeout: float = 10,
+                state: str = "interactable", index: int = 0,
+                role: Optional[str] = None,
+                fallbacks: Optional[List[Locator]] = None) -> Tuple[int, object]:
+        """
+        Poll until one of the candidates matches in the requested state
+
+        Args:
+            candidates: the caller's (By, selector) pairs in priority order
+            timeout: seconds to wait overall, shared by every candidate
+            state: present, visible, interactable or editable
+            index: pick the n-th match of a candidate instead of the first ready one
+            role: semantic name of the target; with a cache, locators that worked for
+                this role on the current host are tried after the candidates, and
+                specific matches are recorded
+            fallbacks: generic locators tried last, e.g. any input for a search box
+
+        Returns:
+            (matched locator, element)
+
+        Raises:
+            TimeoutException if nothing matches within the timeout
+        """
+        explicit = [tuple(candidate) for candidate in candidates]
+        host = self._current_host() if role and self.cache is not None else None
+        known = [locator for locator in self.cache.lookup(host, role)
+                 if is_specific(locator) and locator not in explicit] if host else []
+        ordered = explicit + known
+        ordered += [tuple(locator) for locator in fallbacks or [] if tuple(locator) not in ordered]
+        
+        started = time.monotonic()
+        try:
+            matched, element = WebDriverWait(self.driver, timeout, poll_frequency=self.poll_frequency).until(
+                lambda d: self.find(ordered, state, index)
+            )
+        except TimeoutException:
+            for locator in known:
+                self.cache.record_failure(host, role, locator)
+            raise TimeoutException(
+                f"No {state} element for any of {[selector for _, selector in ordered]} within {timeout}s"
+            )
+        
+        if host:
+            # Known locators ahead of the match didn't work this time
+            for locator in ordered[len(explicit):matched]:
+                if locator in known:
+                    self.cache.record_failure(host, role, locator)
+            if is_specific(ordered[matched]):
+                elapsed_ms = (time.monotonic() - started) * 1000
+                self.cache.record_success(host, role, ordered[matched], elapsed_ms)
+        
+        return ordered[matched], element
+
+    def _current_host(self) -> Optional[str]:
+        """Host of the current page, or None for pages without one (about:blank, data:)"""
+        try:
+            return urlparse(self.driver.current_url).hostname
+        except Exception:
+            return None
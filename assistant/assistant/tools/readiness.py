@@ -0,0 +1,264 @@
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.common.exceptions import TimeoutException
+from typing import Callable, Dict, List, Optional, Set
+import json
+import logging
+import time
+
+logger = logging.getLogger(__name__)
+
+# Set on the current document so we can tell when the browser has replaced it
+NAVIGATION_MARKER = "__assistantNavigationMarker"
+
+# Resource timing entries are only recorded once a request finishes
+NETWORK_SNAPSHOT_SCRIPT = "return [performance.now(), performance.getEntriesByType('resource').length];"
+
+# Selectors starting with "/" or "(" are XPath, everything else is CSS
+SELECTOR_PRESENT_SCRIPT = """
+const selector = arguments[0];
+try {
+    if (selector.startsWith('/') || selector.startsWith('(')) {
+        return document.evaluate(
+            selector, document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue !== null;
+    }
+    return document.querySelector(selector) !== null;
+} catch (e) {
+    return false;
+}
+"""
+
+# How long page_ready waits after a navigation:
+#   commit: the URL has changed to the new document
+#   domcontentloaded: the HTML is parsed (readyState interactive)
+#   load: every subresource has loaded (readyState complete)
+#   network_idle: no network activity for a short while after load
+#   selector: a given CSS/XPath selector matches
+WAIT_POLICIES = ("commit", "domcontentloaded", "load", "network_idle", "selector")
+
+# Chrome DevTools Page.lifecycleEvent names for the policies that have one
+LIFECYCLE_EVENTS = {
+    "domcontentloaded": "DOMContentLoaded",
+    "load": "load",
+    "network_idle": "networkIdle",
+}
+
+
+class Readiness:
+    """
+    Condition-based waits that return as soon as the page is actually ready
+
+    Every wait polls a real condition (document state, input value, navigation,
+    network activity) instead of sleeping for a fixed time. Element waits live in
+    LocatorResolver.
+
+    When Chrome runs with performance logging (goog:loggingPrefs), page_ready also
+    reads DevTools Page.lifecycleEvent entries from the log, and falls back to the
+    equivalent in-page check when they aren't available.
+    """
+
+    def __init__(self, driver, poll_frequency: float = 0.05):
+        self.driver = driver
+        self.poll_frequency = poll_frequency
+        # Main frame id per window handle, and lifecycle events seen since each frame's
+        # last navigation (None until that navigation's "init" event arrives)
+        self._frames: Dict[str, str] = {}
+        self._seen: Dict[str, Optional[Set[str]]] = {}
+        self._lifecycle_available = True
+        # Reading the performance log consumes it, so other DevTools consumers
+        # (e.g. ResourceBlocker) receive every message through these callbacks
+        self.log_listeners: List[Callable[[dict], None]] = []
+
+    def _wait(self, timeout: float) -> WebDriverWait:
+        return WebDriverWait(self.driver, timeout, poll_frequency=self.poll_frequency)
+
+    def document_ready(self, timeout: float = 10, state: str = "complete"):
+        """Wait until document.readyState reaches 'interactive' or 'complete'"""
+        accepted = ("interactive", "complete") if state == "interactive" else ("complete",)
+        self._wait(timeout).until(
+            lambda d: d.execute_script("return document.readyState") in accepted
+        )
+
+    def value_committed(self, element, value: str, timeout: float = 2) -> bool:
+        """Wait until an input reports the expected value; returns False if it never does"""
+        try:
+            self._wait(timeout).until(lambda d: element.get_property("value") == value)
+            return True
+        except TimeoutException:
+            logger.debug(f"Input value was not committed within {timeout}s")
+            return False
+
+    def mark_document(self):
+        """Tag the current document so navigation_started can detect its replacement"""
+        self.driver.execute_script(f"window.{NAVIGATION_MARKER} = true;")
+
+    def _navigated(self, driver, previous_url: Optional[str]) -> bool:
+        """Whether the marked document was replaced or the URL moved away from previous_url"""
+        if previous_url is not None and driver.current_url != previous_url:
+            return True
+        return not driver.execute_script(f"return window.{NAVIGATION_MARKER} === true;")
+
+    def navigation_started(self, timeout: float = 10, previous_url: Optional[str] = None) -> bool:
+        """
+        Wait until the document tagged by mark_document has been replaced, or the URL
+        has moved away from previous_url (single-page apps navigate without a new document)
+        """
+        try:
+            self._wait(timeout).until(lambda driver: self._navigated(driver, previous_url))
+            return True
+        except TimeoutException:
+            return False
+
+    def _main_frame(self) -> Optional[str]:
+        """Enable lifecycle events on the current tab and return its main frame id"""
+        if not self._lifecycle_available:
+            return None
+        handle = self.driver.current_window_handle
+        if handle not in self._frames:
+            try:
+                self.driver.execute_cdp_cmd("Page.enable", {})
+                self.driver.execute_cdp_cmd("Page.setLifecycleEventsEnabled", {"enabled": True})
+                tree = self.driver.execute_cdp_cmd("Page.getFrameTree", {})
+                self._frames[handle] = tree["frameTree"]["frame"]["id"]
+            except Exception as e:
+                logger.debug(f"Lifecycle events unavailable, using in-page checks: {e}")
+                self._lifecycle_available = False
+                return None
+        return self._frames[handle]
+
+    def read_performance_log(self):
+        """Drain the performance log, recording lifecycle events per frame"""
+        if not self._lifecycle_available:
+            return
+        try:
+            entries = self.driver.get_log("performance")
+        except Exception as e:
+            logger.debug(f"Performance log unavailable, using in-page checks: {e}")
+            self._lifecycle_available = False
+            return
+        for entry in entries:
+            message = json.loads(entry["message"])["message"]
+            for listener in self.log_listeners:
+                listener(message)
+            if message.get("method") != "Page.lifecycleEvent":
+                continue
+            frame, name = message["params"]["frameId"], message["params"]["name"]
+            if name == "init":
+                self._seen[frame] = set()
+            elif self._seen.get(frame) is not None:
+                self._seen[frame].add(name)
+
+    def begin_navigation(self):
+        """
+        Mark the current document and forget its lifecycle events before starting a
+        navigation, so page_ready only accepts the document that replaces it
+        """
+        self.mark_document()
+        frame = self._main_frame()
+        if frame is None:
+            return
+        self.read_performance_log()
+        self._seen[frame] = None
+
+    def lifecycle_reached(self, event: str) -> bool:
+        """Whether the current tab's document has fired a DevTools lifecycle event"""
+        frame = self._main_frame()
+        if frame is None:
+            return False
+        self.read_performance_log()
+        return event in (self._seen.get(frame) or ())
+
+    def page_ready(self, policy: str = "domcontentloaded", previous_url: Optional[str] = None,
+                   timeout: float = 10, selector: Optional[str] = None):
+        """
+        Wait until a navigation has progressed as far as the policy requires
+
+        Args:
+            policy: one of WAIT_POLICIES
+            previous_url: URL being navigated away from, if the navigation isn't done yet;
+                the navigation counts as started once the document marked by
+                begin_navigation is gone (so same-URL reloads and redirects back to
+                previous_url count too) or the URL has changed
+            timeout: seconds to wait
+            selector: CSS/XPath selector for the "selector" policy
+
+        Raises:
+            TimeoutException if the page isn't ready in time (network_idle only logs,
+            since busy pages may never go quiet)
+        """
+        if policy not in WAIT_POLICIES:
+            raise ValueError(f"Unknown wait policy: {policy}")
+        if policy == "selector" and not selector:
+            raise ValueError("The selector wait policy needs a selector")
+
+        accepted = {
+            "domcontentloaded": ("interactive", "complete"),
+            "load": ("complete",),
+            "network_idle": ("complete",),
+        }.get(policy)
+        deadline = time.monotonic() + timeout
+        lifecycle = {"reached": False}
+
+        def ready(driver):
+            if previous_url is not None and not self._navigated(driver, previous_url):
+                return False
+            if policy == "commit":
+                return True
+            if policy == "selector":
+                return driver.execute_script(SELECTOR_PRESENT_SCRIPT, selector)
+            if self.lifecycle_reached(LIFECYCLE_EVENTS[policy]):
+                lifecycle["reached"] = True
+                return True
+            return driver.execute_script("return document.readyState") in accepted
+
+        try:
+            self._wait(timeout).until(ready)
+        except TimeoutException:
+            if policy != "network_idle":
+                raise TimeoutException(f"Page did not reach {policy} within {timeout}s")
+            logger.debug(f"Page did not load within {timeout}s")
+            return
+
+        # Without the networkIdle lifecycle event, watch the page's own resource timings
+        if policy == "network_idle" and not lifecycle["reached"]:
+            if not self.network_quiet(timeout=max(0.0, deadline - time.monotonic())):
+                logger.debug(f"Network did not go idle within {timeout}s")
+
+    def network_quiet(self, idle_time: float = 0.5, timeout: float = 10) -> bool:
+        """
+        Wait until no resource has finished loading for idle_time and the document is loaded
+
+        Returns False on timeout instead of raising, since busy pages may never go quiet.
+        """
+        state = {"count": None, "since": None}
+
+        def quiet(driver):
+            now, count = driver.execute_script(NETWORK_SNAPSHOT_SCRIPT)
+            now /= 1000
+            if state["count"] != count:
+                state["count"], state["since"] = count, now
+                return False
+            return now - state["since"] >= idle_time and \
+                driver.execute_script("return document.readyState") == "complete"
+
+        try:
+            self._wait(timeout).until(quiet)
+            return True
+        except TimeoutException:
+            return False
+
+    def scroll_settled(self, timeout: float = 2) -> bool:
+        """Wait until the scroll position stops changing (smooth scrolling)"""
+        state = {"position": None}
+
+        def settled(driver):
+            position = driver.execute_script("return [window.scrollX, window.scrollY];")
+            if position == state["position"]:
+                return True
+            state["position"] = position
+            return False
+
+        try:
+            self._wait(timeout).until(settled)
+            return True
+        except TimeoutException:
+            return False
@@ -0,0 +1,243 @@
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urlparse
+import logging
+import re
+import threading
+
+logger = logging.getLogger(__name__)
+
+
+
+def _extensions(*extensions: str) -> List[str]:
+    """Patterns for URLs whose path ends in one of the extensions, with or without a query"""
+    return [pattern for extension in extensions for pattern in (f"*.{extension}", f"*.{extension}?*")]
+
+
+def _hosts(*domains: str) -> List[str]:
+    """Patterns for every URL on the domains and their subdomains"""
+    return [pattern for domain in domains for pattern in (f"*://{domain}/*", f"*.{domain}/*")]
+
+
+# URL patterns (DevTools wildcards) per resource category. Network.setBlockedURLs matches
+# URLs only, so resource types are approximated by file extension, anchored to the end of
+# the path so hosts and query strings that merely contain one don't match.
+RESOURCE_PATTERNS: Dict[str, List[str]] = {
+    "image": _extensions("png", "jpg", "jpeg", "gif", "webp", "avif", "bmp", "ico"),
+    "font": _extensions("woff", "woff2", "ttf", "otf", "eot"),
+    "media": _extensions("mp4", "webm", "m4s", "m3u8", "mp3", "ogg", "wav"),
+    "tracker": _hosts(
+        "google-analytics.com", "googletagmanager.com", "doubleclick.net",
+        "googlesyndication.com", "connect.facebook.net", "amazon-adsystem.com",
+        "scorecardresearch.com", "hotjar.com", "criteo.com", "taboola.com", "outbrain.com",
+    ) + ["*://adservice.google.*"],
+}
+
+# A profile lists categories from RESOURCE_PATTERNS and/or literal URL patterns
+PROFILES: Dict[str, List[str]] = {
+    "none": [],
+    "trackers": ["tracker"],
+    "light": ["media", "tracker"],
+    "read_only": ["image", "font", "media", "tracker"],
+}
+
+# Profile used for each kind of task. Plain navigation is what the user looks at, so it
+# loads everything; interactive tasks keep images because they can affect layout.
+TASK_PROFILES: Dict[str, str] = {
+    "navigate": "none",
+    "interactive": "trackers",
+    "search": "read_only",
+    "read": "read_only",
+    "extract": "read_only",
+}
+
+# Rough typical transfer sizes in bytes per DevTools resource type. Blocked requests never
+# transfer anything, so bytes saved are a heuristic: blocked count times these sizes.
+TYPICAL_BYTES: Dict[str, int] = {
+    "Image": 25_000,
+    "Font": 30_000,
+    "Media": 300_000,
+    "Script": 20_000,
+    "XHR": 5_000,
+    "Fetch": 5_000,
+}
+DEFAULT_TYPICAL_BYTES = 10_000
+
+
+def matches(pattern: str, url: str) -> bool:
+    """Whether a DevTools URL pattern, where * matches any run of characters, matches url"""
+    return re.fullmatch(".*".join(map(re.escape, pattern.split("*"))), url) is not None
+
+
+class ResourceBlocker:
+    """
+    Block resource categories and URL patterns per task type and domain
+
+    Blocking uses DevTools Network.setBlockedURLs on the current tab, so apply() must run
+    before each navigation starts. Blocked requests show up in the performance log as
+    Network.loadingFailed with blockedReason "inspector"; they are counted through
+    Readiness.log_listeners. The bytes saved that stats() reports are a heuristic
+    estimate from TYPICAL_BYTES per resource type, not a measurement.
+
+    A profile stays on its tab until the next apply(), so callers reset() once a
+    read-only task is over; otherwise pages the user opens later by clicking a link,
+    going back or submitting a form would load stripped as well.
+
+    Patterns matching the URL being navigated to are left out, and page_ready reloads
+    the page with blocking off if the top-level document was blocked anyway (e.g. a
+    search that lands on a results URL ending in ".png").
+    """
+
+    def __init__(self, driver, readiness=None, task_profiles: Optional[Dict[str, str]] = None,
+                 domain_profiles: Optional[Dict[str, str]] = None,
+                 profiles: Optional[Dict[str, List[str]]] = None):
+        self.driver = driver
+        self.readiness = readiness
+        self.task_profiles = {**TASK_PROFILES, **(task_profiles or {})}
+        # Domain -> profile, overriding the task's profile on that domain and its subdomains
+        self.domain_profiles = domain_profiles or {}
+        self.profiles = {**PROFILES, **(profiles or {})}
+        # Window handle -> (profile, patterns) currently set on that tab
+        self._applied: Dict[str, Tuple[str, List[str]]] = {}
+        self._lock = threading.Lock()
+        self._blocked = 0
+        self._blocked_bytes = 0
+        self._blocked_by_type: Dict[str, int] = {}
+        self._document_blocked = False
+        if readiness is not None:
+            readiness.log_listeners.append(self._on_log_message)
+
+    def profile_for(self, url: str, task: Optional[str] = None) -> str:
+        """Profile for a task on a URL, with the most specific matching domain override winning"""
+        host = urlparse(url).hostname or ""
+        matches = [
+            domain for domain in self.domain_profiles
+            if host == domain or host.endswith("." + domain)
+        ]
+        if matches:
+            return self.domain_profiles[max(matches, key=len)]
+        return self.task_profiles.get(task or "navigate", "none")
+
+    def patterns(self, profile: str, url: Optional[str] = None) -> List[str]:
+        """URL patterns blocked by a profile, leaving out any that match the page's own url"""
+        if profile not in self.profiles:
+            raise ValueError(f"Unknown blocking profile: {profile}")
+        patterns = []
+        for entry in self.profiles[profile]:
+            patterns.extend(RESOURCE_PATTERNS.get(entry, [entry]))
+        if url:
+            patterns = [pattern for pattern in patterns if not matches(pattern, url)]
+        return patterns
+
+    def apply(self, url: str, task: Optional[str] = None) -> str:
+        """
+        Set the current tab's blocked URLs for a navigation to url
+
+        Returns:
+            the profile in effect ("none" if blocking isn't available)
+        """
+        profile = self.profile_for(url, task)
+        # Blocked documents from earlier navigations don't count against this one
+        self.document_blocked()
+        patterns = self.patterns(profile, url)
+        handle = self.driver.current_window_handle
+        if self._applied.get(handle, ("none", [])) == (profile, patterns):
+            return profile
+        if not self._set_blocked(patterns):
+            return "none"
+        self._applied[handle] = (profile, patterns)
+        logger.info(f"Resource blocking profile {profile} for {urlparse(url).hostname}")
+        return profile
+
+    def reset(self):
+        """
+        Put every tab that has a task profile back on the plain "navigate" profile for
+        its current page (domain overrides still apply)
+        """
+        default = self.task_profiles.get("navigate", "none")
+        stale = [handle for handle, (profile, _) in self._applied.items() if profile != default]
+        if not stale:
+            return
+        try:
+            current = self.driver.current_window_handle
+            open_handles = set(self.driver.window_handles)
+            for handle in stale:
+                if handle not in open_handles:
+                    del self._applied[handle]
+                    continue
+                if handle != self.driver.current_window_handle:
+                    self.driver.switch_to.window(handle)
+                self.apply(self.driver.current_url)
+            if self.driver.current_window_handle != current:
+                self.driver.switch_to.window(current)
+        except Exception as e:
+            logger.warning(f"Could not reset resource blocking: {e}")
+
+    def _set_blocked(self, patterns: List[str]) -> bool:
+        try:
+            self.driver.execute_cdp_cmd("Network.enable", {})
+            self.driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": patterns})
+        except Exception as e:
+            logger.warning(f"Resource blocking unavailable: {e}")
+            return False
+        return True
+
+    def document_blocked(self) -> bool:
+        """
+        Whether a top-level document was blocked since the last call; if so, blocking
+        is turned off on the current tab so the page can be reloaded
+        """
+        if self.readiness is not None:
+            self.readiness.read_performance_log()
+        with self._lock:
+            blocked, self._document_blocked = self._document_blocked, False
+        if blocked:
+            logger.warning("Resource blocking stopped a page from loading, turning it off for this tab")
+            self._set_blocked([])
+            self._applied[self.driver.current_window_handle] = ("none", [])
+        return blocked
+
+    def page_ready(self, policy: str = "domcontentloaded", previous_url: Optional[str] = None,
+                   timeout: float = 10, selector: Optional[str] = None):
+        """
+        Readiness.page_ready for a navigation made with blocking applied, reloading the
+        page with blocking off if its document was blocked
+        """
+        try:
+            self.readiness.page_ready(policy, previous_url, timeout, selector=selector)
+            error = None
+        except Exception as e:
+            error = e
+        if self.document_blocked():
+            self.readiness.begin_navigation()
+            self.driver.refresh()
+            self.readiness.page_ready(policy, None, timeout, selector=selector)
+        elif error is not None:
+            raise error
+
+    def _on_log_message(self, message: dict):
+        if message.get("method") != "Network.loadingFailed":
+            return
+        params = message.get("params", {})
+        if params.get("blockedReason") != "inspector":
+            return
+        resource_type = params.get("type", "Other")
+        with self._lock:
+            if resource_type == "Document":
+                self._document_blocked = True
+            self._blocked += 1
+            self._blocked_bytes += TYPICAL_BYTES.get(resource_type, DEFAULT_TYPICAL_BYTES)
+            self._blocked_by_type[resource_type] = self._blocked_by_type.get(resource_type, 0) + 1
+
+    def stats(self) -> dict:
+        """
+        Requests blocked so far, by DevTools resource type, and a heuristic estimate of
+        the bytes saved (see TYPICAL_BYTES)
+        """
+        if self.readiness is not None:
+            self.readiness.read_performance_log()
+        with self._lock:
+            return {
+                "blocked_requests": self._blocked,
+                "heuristic_bytes_saved": self._blocked_bytes,
+                "by_type": dict(self._blocked_by_type),
+            }
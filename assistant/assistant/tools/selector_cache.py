@@ -0,0 +1,97 @@
+import sqlite3
+import logging
+import os
+import threading
+import time
+from typing import List, Tuple
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SELECTOR_CACHE_PATH = os.path.join(os.path.expanduser("~"), ".assistant", "selectors.sqlite3")
+
+Locator = Tuple[str, str]
+
+
+class SelectorCache:
+    """
+    Persistent per-host record of which locator worked for each semantic role
+
+    A role is a stable name for what the locator finds ("search_box", "submit",
+    "search_result", or a role supplied with an LLM-generated selector). Locators
+    that keep failing are evicted after max_failures consecutive misses.
+    """
+
+    def __init__(self, path: str = DEFAULT_SELECTOR_CACHE_PATH, max_failures: int = 3):
+        self.path = path
+        self.max_failures = max_failures
+        self._lock = threading.Lock()
+
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS selectors (
+                host TEXT NOT NULL,
+                role TEXT NOT NULL,
+                by TEXT NOT NULL,
+                selector TEXT NOT NULL,
+                successes INTEGER NOT NULL DEFAULT 0,
+                failures INTEGER NOT NULL DEFAULT 0,
+                total_ms REAL NOT NULL DEFAULT 0,
+                last_used REAL NOT NULL,
+                PRIMARY KEY (host, role, by, selector)
+            );
+        """)
+
+    def lookup(self, host: str, role: str) -> List[Locator]:
+        """Known-good locators for a role on a host, most reliable and fastest first"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT by, selector FROM selectors WHERE host = ? AND role = ? "
+                "ORDER BY successes DESC, total_ms / MAX(successes, 1) ASC",
+                (host, role)
+            ).fetchall()
+        return [(by, selector) for by, selector in rows]
+
+    def record_success(self, host: str, role: str, locator: Locator, elapsed_ms: float):
+        """Remember that a locator found the role, and how long resolving it took"""
+        by, selector = locator
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT INTO selectors (host, role, by, selector, successes, failures, total_ms, last_used) "
+                "VALUES (?, ?, ?, ?, 1, 0, ?, ?) "
+                "ON CONFLICT (host, role, by, selector) DO UPDATE SET "
+                "successes = successes + 1, failures = 0, total_ms = total_ms + excluded.total_ms, "
+                "last_used = excluded.last_used",
+                (host, role, by, selector, elapsed_ms, time.time())
+            )
+
+    def record_failure(self, host: str, role: str, locator: Locator):
+        """Count a miss for a known locator, evicting it after repeated failures"""
+        by, selector = locator
+        with self._lock, self._conn:
+            self._conn.execute(
+                "UPDATE selectors SET failures = failures + 1, last_used = ? "
+                "WHERE host = ? AND role = ? AND by = ? AND selector = ?",
+                (time.time(), host, role, by, selector)
+            )
+            deleted = self._conn.execute(
+                "DELETE FROM selectors WHERE host = ? AND role = ? AND by = ? AND selector = ? "
+                "AND failures >= ?",
+                (host, role, by, selector, self.max_failures)
+            ).rowcount
+        if deleted:
+            logger.info(f"Evicted selector {selector} for {role} on {host} after repeated failures")
+
+    def stats(self) -> dict:
+        """Number of hosts and cached locators"""
+        with self._lock:
+            hosts, entries = self._conn.execute(
+                "SELECT COUNT(DISTINCT host), COUNT(*) FROM selectors"
+            ).fetchone()
+        return {"hosts": hosts, "entries": entries}
+
+    def close(self):
+        """Close the underlying database"""
+        with self._lock:
+            self._conn.close()
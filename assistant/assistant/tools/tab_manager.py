@@ -0,0 +1,134 @@
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional
+from urllib.parse import urlparse
+import logging
+import time
+
+logger = logging.getLogger(__name__)
+
+# URLs of tabs that hold nothing worth keeping
+BLANK_URLS = ("about:blank", "data:,", "chrome://newtab/", "chrome://new-tab-page/")
+
+
+@dataclass
+class TabInfo:
+    handle: str
+    url: str = "about:blank"
+    last_used: float = field(default_factory=time.time)
+
+
+def _same_page(a: str, b: str) -> bool:
+    """Compare URLs ignoring scheme and trailing slash"""
+    strip = lambda url: url.split("://", 1)[-1].rstrip("/")
+    return strip(a) == strip(b)
+
+
+class TabManager:
+    """
+    Track open tabs and keep their number bounded
+
+    Navigation switches to a tab already showing the URL, reuses the current tab when it
+    is blank or on the same site, and otherwise opens a new tab, closing the
+    least-recently-used tabs beyond max_tabs.
+    """
+
+    def __init__(self, driver, max_tabs: int = 5):
+        self.driver = driver
+        self.max_tabs = max(1, max_tabs)
+        self._tabs: Dict[str, TabInfo] = {}
+
+    def sync(self):
+        """Reconcile tracked tabs with the browser's actual window handles"""
+        handles = self.driver.window_handles
+        for handle in list(self._tabs):
+            if handle not in handles:
+                del self._tabs[handle]
+        for handle in handles:
+            if handle not in self._tabs:
+                self._tabs[handle] = TabInfo(handle, last_used=0)
+
+    def touch(self, handle: Optional[str] = None):
+        """Mark a tab (the current one by default) as just used and record its URL"""
+        handle = handle or self.driver.current_window_handle
+        info = self._tabs.setdefault(handle, TabInfo(handle))
+        info.last_used = time.time()
+        if handle == self.driver.current_window_handle:
+            info.url = self.driver.current_url
+
+    def tabs(self) -> List[TabInfo]:
+        """Tracked tabs, most recently used first"""
+        self.sync()
+        return sorted(self._tabs.values(), key=lambda info: info.last_used, reverse=True)
+
+    def open(self, url: str, new_tab: Optional[bool] = None,
+             prepare: Optional[Callable[[], None]] = None) -> Optional[str]:
+        """
+        Show url in a tab, reusing or evicting tabs as needed
+
+        Args:
+            url: absolute URL to show
+            new_tab: force (True) or forbid (False) a new tab; None decides automatically
+            prepare: called on the tab that will navigate, right before the navigation
+                starts (e.g. to set up DevTools state for it)
+
+        Returns:
+            the URL the tab is navigating away from, for waiting on the navigation,
+            or None when a tab already showing url was selected and nothing navigates
+        """
+        self.sync()
+        current = self.driver.current_window_handle
+        self.touch(current)
+
+        if new_tab is None:
+            existing = next(
+                (info for info in self._tabs.values() if _same_page(info.url, url)), None
+            )
+            if existing is not None:
+                self.driver.switch_to.window(existing.handle)
+                self.touch(existing.handle)
+                return None
+            new_tab = not self._reusable(self._tabs[current].url, url)
+        if self.max_tabs == 1:
+            new_tab = False
+
+        if not new_tab:
+            previous_url = self.driver.current_url
+            if prepare:
+                prepare()
+            self.driver.execute_script("window.location.href = arguments[0];", url)
+            self._tabs[current].url = url
+            return previous_url
+
+        self._evict(keep=self.max_tabs - 1)
+        before = set(self.driver.window_handles)
+        # Open blank first when the new tab needs preparing before it loads anything
+        self.driver.execute_script("window.open(arguments[0], '_blank');", "about:blank" if prepare else url)
+        handle = next(iter(set(self.driver.window_handles) - before), self.driver.window_handles[-1])
+        self.driver.switch_to.window(handle)
+        self._tabs[handle] = TabInfo(handle, url)
+        if prepare:
+            prepare()
+            self.driver.execute_script("window.location.href = arguments[0];", url)
+        return "about:blank"
+
+    def _reusable(self, current_url: str, url: str) -> bool:
+        """A blank tab or a tab on the same site can be navigated in place"""
+        if current_url in BLANK_URLS:
+            return True
+        return urlparse(current_url).hostname == urlparse(url).hostname
+
+    def _evict(self, keep: int):
+        """Close least-recently-used tabs until at most `keep` remain"""
+        current = self.driver.current_window_handle
+        for info in sorted(self._tabs.values(), key=lambda info: info.last_used)[:max(0, len(self._tabs) - keep)]:
+            try:
+                self.driver.switch_to.window(info.handle)
+                self.driver.close()
+                logger.info(f"Closed least recently used tab: {info.url}")
+            except Exception as e:
+                logger.warning(f"Failed to close tab {info.url}: {e}")
+            del self._tabs[info.handle]
+
+        remaining = self.driver.window_handles
+        if remaining:
+            self.driver.switch_to.window(current if current in remaining else remaining[-1])
@@ -4,25 +4,48 @@ from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException, WebDriverException
 from selenium.webdriver.common.keys import Keys
+from urllib.parse import quote_plus
+from assistant.tools.extractor import extract_elements
+from assistant.tools.tab_manager import TabManager
+from assistant.tools.readiness import Readiness
+from assistant.tools.resource_blocker import ResourceBlocker
 import logging
 
 logger = logging.getLogger(__name__)
 
 class BrowserActions:
-    def __init__(self):
+    def __init__(self, max_tabs=5, page_load_strategy="eager", wait_until="domcontentloaded",
+                 lifecycle_events=True, block_resources=True, task_profiles=None,
+                 domain_profiles=None, headless=False, arguments=()):
         self.driver = None
+        self.max_tabs = max_tabs
+        self.tabs = None
+        self.wait = None
+        # "normal" makes driver.get, back and navigating clicks wait for every subresource;
+        # "eager" returns at DOMContentLoaded and "none" as soon as the navigation commits
+        self.page_load_strategy = page_load_strategy
+        # Default readiness policy for navigations (see readiness.WAIT_POLICIES)
+        self.wait_until = wait_until
+        # Record DevTools lifecycle events in the performance log for precise waits
+        self.lifecycle_events = lifecycle_events
+        # Skip images, fonts, media and trackers on tasks that don't need them
+        # (see resource_blocker.TASK_PROFILES; domain_profiles override per site)
+        self.block_resources = block_resources
+        self.task_profiles = task_profiles
+        self.domain_profiles = domain_profiles
+        self.blocker = None
+        # Run without a window (servers, CI, benchmarks); arguments are extra Chrome switches
+        self.headless = headless
+        self.arguments = list(arguments)
         
-    def start_browser(self):
-        """Initialize the browser"""
+    def start_browser(self, initial_url=None):
+        """Initialize the browser, optionally loading initial_url in the first tab"""
         try:
             if self.driver is not None:
-                try:
-                    # Check if browser is still responsive
-                    self.driver.current_url
+                if self.is_alive():
                     return
-                except:
-                    # If not responsive, close it
-                    self.close_browser()
+                # If not responsive, close it
+                self.close_browser()
             
             # Initialize new browser instance
             options = webdriver.ChromeOptions()
@@ -30,16 +53,55 @@ class BrowserActions:
             options.add_argument('--disable-extensions')
             options.add_argument('--disable-popup-blocking')
             options.add_experimental_option("detach", True)  # Keep browser open
+            if self.headless:
+                options.add_argument('--headless=new')
+                options.add_argument('--window-size=1920,1080')
+            for argument in self.arguments:
+                options.add_argument(argument)
+            options.page_load_strategy = self.page_load_strategy
+            if self.lifecycle_events:
+                options.set_capability("goog:loggingPrefs", {"performance": "ALL"})
             
             self.driver = webdriver.Chrome(options=options)
-            # Navigate to Google to ensure we have an active tab
-            self.driver.get("https://www.google.com")
+            self.tabs = TabManager(self.driver, self.max_tabs)
+            self.wait = Readiness(self.driver)
+            if self.block_resources:
+                self.blocker = ResourceBlocker(
+                    self.driver, self.wait, self.task_profiles, self.domain_profiles
+                )
+            # Chrome already opens with an active blank tab; loading a page here only delays startup
+            if initial_url:
+                self.driver.get(initial_url)
             logger.info("Browser started successfully")
             
         except Exception as e:
             logger.error(f"Failed to start browser: {e}")
             raise
     
+    def is_alive(self):
+        """Check if the browser is still responsive"""
+        if self.driver is None:
+            return False
+        try:
+            self.driver.current_url
+            return True
+        except Exception:
+            return False
+    
+    def js_heap_mb(self):
+        """JS heap used by the current page in MB, or None if the browser doesn't report it"""
+        try:
+            used = self.driver.execute_script(
+                "return performance.memory ? performance.memory.usedJSHeapSize : null;"
+            )
+            return used / (1024 * 1024) if used is not None else None
+        except Exception:
+            return None
+    
+    def blocking_stats(self):
+        """Requests blocked and a heuristic estimate of bytes saved, or None when blocking is off"""
+        return self.blocker.stats() if self.blocker is not None else None
+    
     def close_browser(self):
         """Close the browser"""
         try:
@@ -49,23 +111,35 @@ class BrowserActions:
             logger.error(f"Error closing browser: {e}")
         finally:
             self.driver = None
+            self.tabs = None
+            self.wait = None
+            self.blocker = None
     
-    def navigate_to(self, url):
-        """Navigate to a specific URL in a new tab"""
+    def navigate_to(self, url, new_tab=None, wait_until=None, wait_for=None, timeout=10, task=None):
+        """
+        Navigate to a specific URL, reusing or opening a tab as the tab manager decides
+        
+        wait_until picks how far the page must load before returning (default self.wait_until);
+        wait_for returns as soon as that selector matches instead. task selects which
+        resources are blocked (default "navigate", which loads everything).
+        """
         try:
             if not url.startswith(('http://', 'https://')):
                 url = 'https://' + url
-                
-            # Open new tab
-            self.driver.execute_script(f"window.open('{url}', '_blank');")
             
-            # Switch to the new tab (last tab)
-            self.driver.switch_to.window(self.driver.window_handles[-1])
+            def prepare():
+                if self.blocker is not None:
+                    self.blocker.apply(url, task)
+                self.wait.begin_navigation()
             
-            # Wait for the page to load
-            WebDriverWait(self.driver, 10).until(
-                lambda driver: driver.execute_script('return document.readyState') == 'complete'
-            )
+            previous_url = self.tabs.open(url, new_tab, prepare)
+            
+            # Wait only as long as the policy requires instead of for every image and tracker
+            policy = "selector" if wait_for else (wait_until or self.wait_until)
+            # The blocker's page_ready also reloads the page if its document was blocked
+            waiter = self.blocker if self.blocker is not None else self.wait
+            waiter.page_ready(policy, previous_url, timeout, selector=wait_for)
+            self.tabs.touch()
             
             return True, f"Successfully navigated to {url}"
         except Exception as e:
@@ -105,4 +179,56 @@ class BrowserActions:
             )
             return True, element.text
         except Exception as e:
-            return False, f"Failed to get text: {str(e)}"
\ No newline at end of file
+            return False, f"Failed to get text: {str(e)}"
+    
+    def extract(self, queries, timeout=10):
+        """Read many selectors/attributes in one in-page evaluation"""
+        try:
+            extracted = extract_elements(self.driver, queries, timeout)
+            return True, {name: result["items"] for name, result in extracted.items()}
+        except Exception as e:
+            return False, f"Failed to extract: {str(e)}"
+    
+    def scroll(self, direction="down", amount=300):
+        """Scroll the current page up or down"""
+        try:
+            offset = -amount if direction == "up" else amount
+            self.driver.execute_script("window.scrollBy(0, arguments[0]);", offset)
+            return True, f"Scrolled {direction}"
+        except Exception as e:
+            return False, f"Failed to scroll: {str(e)}"
+    
+    def go_back(self):
+        """Go back in history, or close the tab if it has no history"""
+        try:
+            # history.length counts forward entries too, so try back() and see if it moved
+            previous_url = self.driver.current_url
+            self.wait.mark_document()
+            self.driver.back()
+            if self.wait.navigation_started(timeout=2, previous_url=previous_url):
+                if self.driver.current_url != "about:blank":
+                    return True, "Went back to the previous page"
+                # Only the blank page the tab was opened on is behind it
+                self.driver.forward()
+            
+            # No history left in this tab: pages opened on another site get a tab of their
+            # own (see TabManager), so "back" closes this one and returns to the last other tab
+            current = self.driver.current_window_handle
+            others = [handle for handle in self.driver.window_handles if handle != current]
+            if not others:
+                return False, "There is no previous page"
+            self.driver.close()
+            self.driver.switch_to.window(others[-1])
+            self.tabs.sync()
+            self.tabs.touch()
+            return True, "Went back to the previous tab"
+        except Exception as e:
+            return False, f"Failed to go back: {str(e)}"
+    
+    def search(self, query):
+        """Search the web for a query"""
+        # The user is looking at the results, so they load in full
+        success, message = self.navigate_to(f"https://www.google.com/search?q={quote_plus(query)}")
+        if not success:
+            return False, message
+        return True, f"Searched for {query}"
@@ -0,0 +1,172 @@
+from assistant.utils.browser_actions import BrowserActions
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Callable, Optional
+import logging
+import queue
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class PooledBrowser:
+    browser: BrowserActions
+    uses: int = 0
+    created: float = field(default_factory=time.time)
+
+
+class BrowserPool:
+    """
+    Pool of warm Chrome instances with checkout/return semantics
+
+    Browsers are health-checked with the current_url liveness probe on checkout and
+    recycled after max_uses commands or once the current page's JS heap grows past
+    max_js_heap_mb (a leak signal; Chrome's process memory isn't visible to WebDriver).
+    A browser that cannot be replaced is restarted in the background, so the pool
+    keeps its size.
+    """
+
+    def __init__(self, size: int = 2, max_uses: int = 50, max_js_heap_mb: float = 1024,
+                 checkout_timeout: float = 60, refill_delay: float = 1,
+                 factory: Callable[[], BrowserActions] = BrowserActions):
+        self.size = size
+        self.max_uses = max_uses
+        self.max_js_heap_mb = max_js_heap_mb
+        self.checkout_timeout = checkout_timeout
+        self.factory = factory
+        # Seconds before the first retry of a failed background restart; doubles up to a minute
+        self.refill_delay = refill_delay
+        self._idle = queue.Queue()
+        self._lock = threading.Lock()
+        self._start_lock = threading.Lock()
+        self._started = False
+        self._created = 0
+        self._recycled = 0
+        self._closed = False
+
+    def _new_browser(self) -> PooledBrowser:
+        browser = self.factory()
+        browser.start_browser()
+        with self._lock:
+            self._created += 1
+        return PooledBrowser(browser)
+
+    def start(self):
+        """
+        Launch every browser in parallel so the pool is warm before the first checkout;
+        does nothing if the pool has already been started
+        """
+        with self._start_lock:
+            if self._started:
+                return
+            self._started = True
+            with ThreadPoolExecutor(max_workers=self.size) as executor:
+                futures = [executor.submit(self._new_browser) for _ in range(self.size)]
+            for future in futures:
+                try:
+                    self._idle.put(future.result())
+                except Exception as e:
+                    logger.error(f"Failed to start pooled browser: {e}")
+                    self._refill()
+        logger.info(f"Browser pool ready with {self._idle.qsize()} of {self.size} browsers")
+
+    def checkout(self, timeout: Optional[float] = None) -> PooledBrowser:
+        """
+        Take a healthy browser from the pool, waiting until one is returned if necessary
+
+        Raises:
+            TimeoutError if no browser becomes available in time
+        """
+        if self._closed:
+            raise RuntimeError("Browser pool is closed")
+        self.start()
+        deadline = time.monotonic() + (self.checkout_timeout if timeout is None else timeout)
+        while True:
+            try:
+                entry = self._idle.get(timeout=max(deadline - time.monotonic(), 0))
+            except queue.Empty:
+                raise TimeoutError("No browser available in the pool")
+
+            if entry.browser.is_alive():
+                return entry
+            logger.warning("Pooled browser is unresponsive, replacing it")
+            try:
+                return self._replace(entry)
+            except Exception as e:
+                # Wait for another browser while this slot restarts in the background
+                logger.error(f"Failed to replace pooled browser: {e}")
+                self._refill()
+
+    def checkin(self, entry: PooledBrowser):
+        """Return a browser, recycling it if it is worn out or its page's JS heap is too large"""
+        entry.uses += 1
+        if self._closed:
+            entry.browser.close_browser()
+            return
+
+        heap = entry.browser.js_heap_mb()
+        if entry.uses >= self.max_uses or (heap is not None and heap > self.max_js_heap_mb):
+            logger.info(f"Recycling pooled browser after {entry.uses} uses ({heap} MB JS heap)")
+            try:
+                entry = self._replace(entry)
+            except Exception as e:
+                logger.error(f"Failed to recycle pooled browser: {e}")
+                self._refill()
+                return
+        self._idle.put(entry)
+
+    def _replace(self, entry: PooledBrowser) -> PooledBrowser:
+        entry.browser.close_browser()
+        with self._lock:
+            self._recycled += 1
+        return self._new_browser()
+
+    def _refill(self):
+        """Start a browser for a lost slot in the background, retrying until it succeeds"""
+        def run():
+            delay = self.refill_delay
+            while not self._closed:
+                try:
+                    entry = self._new_browser()
+                except Exception as e:
+                    logger.error(f"Failed to restart pooled browser, retrying in {delay}s: {e}")
+                    time.sleep(delay)
+                    delay = min(delay * 2, 60)
+                    continue
+                if self._closed:
+                    entry.browser.close_browser()
+                else:
+                    self._idle.put(entry)
+                return
+
+        threading.Thread(target=run, name="browser-pool-refill", daemon=True).start()
+
+    @contextmanager
+    def lease(self, timeout: Optional[float] = None):
+        """Check out a browser for the duration of a with-block"""
+        entry = self.checkout(timeout)
+        try:
+            yield entry.browser
+        finally:
+            self.checkin(entry)
+
+    def stats(self) -> dict:
+        """Pool size and lifecycle counters"""
+        return {
+            "size": self.size,
+            "idle": self._idle.qsize(),
+            "created": self._created,
+            "recycled": self._recycled,
+        }
+
+    def close(self):
+        """Close every idle browser; browsers still checked out are closed on return"""
+        self._closed = True
+        while True:
+            try:
+                self._idle.get_nowait().browser.close_browser()
+            except queue.Empty:
+                break
@@ -0,0 +1,223 @@
+import speech_recognition as sr
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import nullcontext
+from dataclasses import dataclass, field
+from typing import Callable, Optional
+import logging
+import queue
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+DROP_POLICIES = ("drop_oldest", "drop_newest", "block")
+
+
+@dataclass
+class Utterance:
+    audio: sr.AudioData
+    captured_at: float = field(default_factory=time.time)
+    # Transcription started in the background as soon as the utterance was queued
+    transcript: Optional[Future] = None
+    # Seconds that transcription took, set once it finishes
+    stt_seconds: Optional[float] = None
+
+    @property
+    def duration(self) -> float:
+        return len(self.audio.frame_data) / (self.audio.sample_rate * self.audio.sample_width)
+
+
+class UtteranceCapture:
+    """
+    Capture utterances on a dedicated thread and queue them for processing
+
+    The microphone stays open while capture runs, so the user can speak the next command
+    while the previous one is still being recognized, executed or spoken. Between phrases
+    the recognizer's dynamic energy threshold keeps adapting to room noise, which takes
+    over from the NoiseCalibrator while capture holds the microphone.
+
+    Drop policies when the queue is full:
+        drop_oldest: discard the oldest waiting utterance to make room (latest command wins)
+        drop_newest: discard the utterance just captured
+        block: stop capturing until the consumer catches up
+
+    The microphone also hears the assistant's own voice. Pass speaking() as the
+    TTSWorker on_state hook and phrases that overlap speech (or its echo_holdoff tail)
+    are discarded rather than queued as commands. Barge-in has to hear the user over
+    the assistant, so it leaves speaking() unwired and needs a headset or echo
+    cancellation in the audio stack.
+
+    With a transcribe function, every queued utterance is also transcribed on a
+    separate STT thread right away, so the next command is usually recognized by the
+    time the current one has been executed and spoken. Transcriptions of dropped
+    utterances are cancelled unless they already started.
+    """
+
+    def __init__(self, recognizer: sr.Recognizer, microphone: sr.Microphone, calibrator=None,
+                 max_queue: int = 3, drop_policy: str = "drop_oldest",
+                 phrase_time_limit: Optional[float] = 10,
+                 on_utterance: Optional[Callable[[Utterance], None]] = None,
+                 echo_holdoff: float = 0.5,
+                 transcribe: Optional[Callable[[sr.AudioData], str]] = None):
+        if drop_policy not in DROP_POLICIES:
+            raise ValueError(f"Unknown drop policy: {drop_policy}")
+        self.recognizer = recognizer
+        self.microphone = microphone
+        self.calibrator = calibrator
+        self.drop_policy = drop_policy
+        self.phrase_time_limit = phrase_time_limit
+        # Called on the capture thread for every captured utterance, e.g. for barge-in
+        self.on_utterance = on_utterance
+        self.echo_holdoff = echo_holdoff
+        self.transcribe = transcribe
+        self._stt: Optional[ThreadPoolExecutor] = None
+        self.queue: "queue.Queue[Utterance]" = queue.Queue(maxsize=max(1, max_queue))
+        self.captured = 0
+        self.dropped = 0
+        # Phrases discarded because the assistant was speaking
+        self.echoes = 0
+        self._speaking = False
+        # Bumped whenever speech starts, so a phrase can tell it overlapped speech
+        self._speech_count = 0
+        self._speech_ended = float("-inf")
+        self._stopped = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        """Start capturing in the background"""
+        if self.running:
+            return
+        self._stopped.clear()
+        if self.transcribe is not None and self._stt is None:
+            self._stt = ThreadPoolExecutor(max_workers=1, thread_name_prefix="stt")
+        self._thread = threading.Thread(target=self._run, name="capture", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 2.0):
+        """Stop capturing; the phrase in progress (if any) is discarded"""
+        self._stopped.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+        if self._stt is not None:
+            # Transcriptions already started finish for whoever holds their utterance
+            self._stt.shutdown(wait=False)
+            self._stt = None
+
+    def speaking(self, speaking: bool):
+        """TTSWorker on_state hook: discard what the microphone hears while the assistant speaks"""
+        if speaking:
+            self._speech_count += 1
+        else:
+            self._speech_ended = time.monotonic()
+        self._speaking = speaking
+
+    def get(self, timeout: Optional[float] = None) -> Utterance:
+        """
+        Next captured utterance, oldest first
+
+        Raises:
+            sr.WaitTimeoutError if nothing was captured within the timeout
+        """
+        try:
+            return self.queue.get(timeout=timeout)
+        except queue.Empty:
+            raise sr.WaitTimeoutError("No utterance captured")
+
+    def stats(self) -> dict:
+        """Capture counters and the current queue depth"""
+        return {"captured": self.captured, "dropped": self.dropped, "echoes": self.echoes,
+                "queued": self.queue.qsize()}
+
+    def _run(self):
+        paused = self.calibrator.paused() if self.calibrator is not None else nullcontext()
+        dynamic = self.recognizer.dynamic_energy_threshold
+        try:
+            with paused, self.microphone as source:
+                self.recognizer.dynamic_energy_threshold = True
+                while not self._stopped.is_set():
+                    speech = (self._speaking, self._speech_count)
+                    try:
+                        # A short timeout lets the loop notice stop() between phrases
+                        audio = self.recognizer.listen(
+                            source, timeout=1, phrase_time_limit=self.phrase_time_limit
+                        )
+                    except sr.WaitTimeoutError:
+                        continue
+                    if self._stopped.is_set():
+                        continue
+                    if self._heard_speech(*speech):
+                        self.echoes += 1
+                        logger.info("Discarding a phrase heard while the assistant was speaking")
+                        continue
+                    self._enqueue(Utterance(audio))
+        except Exception as e:
+            logger.error(f"Capture stopped: {e}")
+        finally:
+            self.recognizer.dynamic_energy_threshold = dynamic
+
+    def _heard_speech(self, was_speaking: bool, speech_count: int) -> bool:
+        """Whether the assistant spoke at any point since its state was read at the phrase start"""
+        return (was_speaking or self._speaking or self._speech_count != speech_count
+                or time.monotonic() - self._speech_ended < self.echo_holdoff)
+
+    def _prefetch(self, utterance: Utterance):
+        """Start transcribing the utterance on the STT thread"""
+        if self._stt is None:
+            return
+
+        def transcribe():
+            started = time.perf_counter()
+            try:
+                return self.transcribe(utterance.audio)
+            finally:
+                utterance.stt_seconds = time.perf_counter() - started
+
+        utterance.transcript = self._stt.submit(transcribe)
+
+    @staticmethod
+    def _discard(utterance: Utterance):
+        if utterance.transcript is not None:
+            utterance.transcript.cancel()
+
+    def _enqueue(self, utterance: Utterance):
+        self.captured += 1
+        if self.on_utterance is not None:
+            try:
+                self.on_utterance(utterance)
+            except Exception as e:
+                logger.warning(f"Utterance callback failed: {e}")
+
+        # Started before queueing so the consumer never sees it without a transcript
+        self._prefetch(utterance)
+
+        if self.drop_policy == "block":
+            while not self._stopped.is_set():
+                try:
+                    self.queue.put(utterance, timeout=0.5)
+                    return
+                except queue.Full:
+                    continue
+            self._discard(utterance)
+            return
+
+        try:
+            self.queue.put_nowait(utterance)
+            return
+        except queue.Full:
+            pass
+        self.dropped += 1
+        if self.drop_policy == "drop_newest":
+            logger.info("Capture queue full, dropping the new utterance")
+            self._discard(utterance)
+            return
+        try:
+            self._discard(self.queue.get_nowait())
+        except queue.Empty:
+            pass
+        logger.info("Capture queue full, dropping the oldest utterance")
+        self.queue.put_nowait(utterance)
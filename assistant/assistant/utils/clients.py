@@ -0,0 +1,12 @@
+import httpx
+from openai import OpenAI
+
+# Keep connections to the API warm across turns instead of reconnecting every request
+HTTP_LIMITS = httpx.Limits(max_connections=20, max_keepalive_connections=10, keepalive_expiry=120)
+HTTP_TIMEOUT = httpx.Timeout(60.0, connect=5.0)
+
+
+def create_client() -> OpenAI:
+    """Create a synchronous OpenAI client backed by a pooled keep-alive HTTP client"""
+    return OpenAI(http_client=httpx.Client(limits=HTTP_LIMITS, timeout=HTTP_TIMEOUT))
+
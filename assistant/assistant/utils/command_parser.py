@@ -0,0 +1,129 @@
+import re
+import logging
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+# Sites users commonly name without a domain ("open youtube")
+KNOWN_SITES = {
+    "google": "google.com",
+    "youtube": "youtube.com",
+    "gmail": "mail.google.com",
+    "github": "github.com",
+    "wikipedia": "wikipedia.org",
+    "reddit": "reddit.com",
+    "amazon": "amazon.com",
+    "facebook": "facebook.com",
+    "twitter": "twitter.com",
+    "linkedin": "linkedin.com",
+    "netflix": "netflix.com",
+    "stack overflow": "stackoverflow.com",
+}
+
+# Top-level domains accepted from speech; anything else ("index.html", "file.txt") goes to the LLM
+KNOWN_TLDS = {
+    "com", "org", "net", "edu", "gov", "io", "ai", "co", "dev", "app", "me", "tv", "info",
+    "biz", "us", "uk", "in", "de", "fr", "es", "it", "nl", "jp", "ca", "au", "ly", "gg",
+    "xyz", "tech", "news", "site", "online",
+}
+
+# Words that carry no query on their own ("search for")
+QUERY_STOPWORDS = {"for", "a", "an", "the", "it", "this", "that", "something", "me", "up", "about"}
+
+NAVIGATE_PATTERN = re.compile(
+    r"^(?:open|go to|navigate to|visit|take me to|load|launch)\s+(?:the\s+)?(?:website\s+|site\s+|page\s+)?(?P<target>.+)$",
+    re.IGNORECASE
+)
+DOMAIN_PATTERN = re.compile(
+    r"^(?:https?://)?(?:[a-z0-9-]+\.)+(?P<tld>[a-z]{2,})(?:/\S*)?$"
+)
+SCROLL_PATTERN = re.compile(
+    r"^(?:scroll|page)\s+(?P<direction>up|down)(?:\s+by\s+(?P<amount>\d+)(?:\s+pixels)?)?$",
+    re.IGNORECASE
+)
+BACK_PATTERN = re.compile(
+    r"^(?:go\s+back|navigate\s+back|back|previous\s+page|go\s+to\s+the\s+previous\s+page)$",
+    re.IGNORECASE
+)
+SEARCH_PATTERN = re.compile(
+    r"^(?:search|google|look\s+up)(?:\s+for)?\s+(?P<query>.+)$",
+    re.IGNORECASE
+)
+
+# Wake words and politeness before the command, with any punctuation after them
+POLITE_PREFIX = re.compile(
+    r"^(?:please|(?:hey|hi|ok|okay)(?:\s+assistant)?|assistant|can you|could you)[,.!?]*\s+",
+    re.IGNORECASE
+)
+
+# Queries containing these need the LLM (compound commands or site-specific searches)
+AMBIGUOUS_QUERY_PATTERN = re.compile(r"\b(?:and|then)\b|\b(?:on|in)\s+[a-z0-9.]+$", re.IGNORECASE)
+
+
+def _normalize(text: str) -> str:
+    """
+    Strip politeness and trailing punctuation; casing is kept so search queries stay
+    as spoken, and the patterns match case-insensitively
+    """
+    text = text.strip()
+    text = re.sub(r"[.!?,]+$", "", text)
+    # Prefixes can stack ("hey assistant, please open ..."), each with its own punctuation
+    previous = None
+    while previous != text:
+        previous = text
+        text = POLITE_PREFIX.sub("", text)
+    text = re.sub(r"[\s,]+please$", "", text, flags=re.IGNORECASE)
+    text = re.sub(r"[.!?,]+$", "", text)
+    return re.sub(r"\s+", " ", text).strip()
+
+
+def _resolve_site(target: str) -> Optional[str]:
+    """Turn a spoken site name into a URL, or None if it isn't unambiguous"""
+    target = re.sub(r"\s+dot\s+", ".", target.lower()).strip()
+    if target in KNOWN_SITES:
+        return KNOWN_SITES[target]
+    match = DOMAIN_PATTERN.match(target) if " " not in target else None
+    if match and match.group("tld") in KNOWN_TLDS:
+        return target
+    return None
+
+
+def parse_simple_command(user_input: str) -> Optional[dict]:
+    """
+    Resolve simple browser commands locally, without an LLM call
+
+    Returns:
+        A command dict in the BrowserAgent format ({"action": ..., "params": ...}),
+        or None when the input can't be matched confidently.
+    """
+    text = _normalize(user_input)
+    if not text:
+        return None
+
+    match = NAVIGATE_PATTERN.match(text)
+    if match:
+        url = _resolve_site(match.group("target"))
+        if url:
+            return {"action": "navigate", "params": {"url": url}}
+        return None
+
+    match = SCROLL_PATTERN.match(text)
+    if match:
+        params = {"direction": match.group("direction").lower()}
+        if match.group("amount"):
+            params["amount"] = int(match.group("amount"))
+        return {"action": "scroll", "params": params}
+
+    if BACK_PATTERN.match(text):
+        return {"action": "back", "params": {}}
+
+    match = SEARCH_PATTERN.match(text)
+    if match:
+        query = match.group("query").strip()
+        if AMBIGUOUS_QUERY_PATTERN.search(query):
+            return None
+        if all(word.lower() in QUERY_STOPWORDS for word in query.split()):
+            return None
+        return {"action": "search", "params": {"query": query}}
+
+    return None
@@ -0,0 +1,141 @@
+from array import array
+from collections import deque
+from contextlib import contextmanager
+from typing import Optional
+import logging
+import math
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+SAMPLE_TYPECODES = {2: "h", 4: "i"}
+
+
+def frame_energy(buffer: bytes, sample_width: int) -> float:
+    """RMS energy of a buffer of signed little-endian PCM samples"""
+    samples = array(SAMPLE_TYPECODES[sample_width], buffer)
+    if not samples:
+        return 0.0
+    return math.sqrt(sum(sample * sample for sample in samples) / len(samples))
+
+
+class NoiseCalibrator:
+    """
+    Keep a recognizer's energy threshold tracking the room's background noise
+
+    While nobody is listening, a background thread reads the microphone and keeps a
+    rolling window of frame energies. Speech is sparse, so a low percentile of that window
+    is the noise floor; the threshold is set to floor * dynamic_energy_ratio (as
+    adjust_for_ambient_noise does) and smoothed. Listening takes the microphone over with
+    paused() and can start immediately, with no per-turn calibration delay.
+
+    The assistant's own voice is not room noise: pass speaking() as the TTSWorker
+    on_state hook and frames are discarded while it speaks and for echo_holdoff
+    seconds after.
+    """
+
+    def __init__(self, recognizer, microphone, window_seconds: float = 10.0,
+                 percentile: float = 0.2, update_interval: float = 0.5,
+                 smoothing: float = 0.5, min_threshold: float = 50, max_threshold: float = 4000,
+                 echo_holdoff: float = 0.5):
+        self.recognizer = recognizer
+        self.microphone = microphone
+        self.window_seconds = window_seconds
+        self.percentile = percentile
+        self.update_interval = update_interval
+        self.smoothing = smoothing
+        self.min_threshold = min_threshold
+        self.max_threshold = max_threshold
+        self.echo_holdoff = echo_holdoff
+
+        self._energies: Optional[deque] = None
+        self._mic_lock = threading.Lock()
+        self._idle = threading.Event()
+        self._idle.set()
+        self._stopped = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._speaking = False
+        self._speech_ended = float("-inf")
+        self.updates = 0
+
+    def start(self):
+        """Start calibrating in the background"""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stopped.clear()
+        self._thread = threading.Thread(target=self._run, name="noise-calibrator", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 1.0):
+        """Stop the background thread and release the microphone"""
+        self._stopped.set()
+        self._idle.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def speaking(self, speaking: bool):
+        """TTSWorker on_state hook: stop sampling while the assistant's voice is playing"""
+        if not speaking:
+            self._speech_ended = time.monotonic()
+        self._speaking = speaking
+
+    @property
+    def hearing_speech(self) -> bool:
+        """Whether the microphone may be picking up the assistant's voice"""
+        return self._speaking or time.monotonic() - self._speech_ended < self.echo_holdoff
+
+    @contextmanager
+    def paused(self):
+        """Hand the microphone to the caller for the duration of a with-block"""
+        self._idle.clear()
+        with self._mic_lock:
+            try:
+                yield
+            finally:
+                self._idle.set()
+
+    def _run(self):
+        while not self._stopped.is_set():
+            self._idle.wait()
+            if self._stopped.is_set():
+                break
+            with self._mic_lock:
+                if not self._idle.is_set():
+                    continue
+                try:
+                    self._calibrate()
+                except Exception as e:
+                    logger.warning(f"Noise calibration stopped: {e}")
+                    self._stopped.wait(1.0)
+
+    def _calibrate(self):
+        """Read microphone frames until listening needs the microphone back"""
+        with self.microphone as source:
+            seconds_per_buffer = source.CHUNK / source.SAMPLE_RATE
+            window = max(1, int(self.window_seconds / seconds_per_buffer))
+            if self._energies is None or self._energies.maxlen != window:
+                self._energies = deque(self._energies or (), maxlen=window)
+            buffers_per_update = max(1, int(self.update_interval / seconds_per_buffer))
+
+            read = 0
+            while self._idle.is_set() and not self._stopped.is_set():
+                buffer = source.stream.read(source.CHUNK)
+                if self.hearing_speech:
+                    # Keep draining the stream, but the assistant's voice is not noise
+                    continue
+                self._energies.append(frame_energy(buffer, source.SAMPLE_WIDTH))
+                read += 1
+                if read % buffers_per_update == 0:
+                    self._update_threshold()
+
+    def _update_threshold(self):
+        ordered = sorted(self._energies)
+        floor = ordered[int(self.percentile * (len(ordered) - 1))]
+        target = floor * self.recognizer.dynamic_energy_ratio
+        threshold = self.recognizer.energy_threshold * self.smoothing + target * (1 - self.smoothing)
+        self.recognizer.energy_threshold = min(self.max_threshold, max(self.min_threshold, threshold))
+        self.updates += 1
+        if self.updates == 1:
+            logger.info(f"Initial noise calibration: energy threshold {self.recognizer.energy_threshold:.0f}")
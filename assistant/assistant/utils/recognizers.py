@@ -0,0 +1,143 @@
+import speech_recognition as sr
+from abc import ABC, abstractmethod
+import json
+import logging
+import os
+import threading
+from typing import Dict, Optional, Type
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BACKEND = "google"
+
+
+class Transcriber(ABC):
+    """
+    Speech-to-text backend behind one interface
+
+    transcribe() follows SpeechRecognition's conventions so callers keep their error
+    handling: sr.UnknownValueError when nothing intelligible was said, sr.RequestError
+    when the backend itself fails.
+    """
+
+    name = "base"
+    offline = False
+
+    def __init__(self, recognizer: Optional[sr.Recognizer] = None, language: str = "en-US"):
+        self.recognizer = recognizer or sr.Recognizer()
+        self.language = language
+
+    @abstractmethod
+    def transcribe(self, audio: sr.AudioData) -> str:
+        """Transcribe one utterance"""
+
+    def load(self):
+        """Load the model now rather than on the first utterance; a no-op for eager backends"""
+
+
+class GoogleTranscriber(Transcriber):
+    """Google Web Speech API; one network round trip per utterance"""
+
+    name = "google"
+
+    def transcribe(self, audio: sr.AudioData) -> str:
+        return self.recognizer.recognize_google(audio, language=self.language)
+
+
+class VoskTranscriber(Transcriber):
+    """
+    Offline Kaldi recognition with a local Vosk model, loaded once and reused
+
+    Small models (e.g. vosk-model-small-en-us, ~40 MB) run faster than real time on a CPU.
+    """
+
+    name = "vosk"
+    offline = True
+    sample_rate = 16000
+
+    def __init__(self, recognizer: Optional[sr.Recognizer] = None, language: str = "en-US",
+                 model_path: Optional[str] = None):
+        super().__init__(recognizer, language)
+        try:
+            import vosk
+        except ImportError:
+            raise ImportError("The vosk backend needs the vosk package: pip install vosk")
+        model_path = model_path or os.getenv("VOSK_MODEL_PATH", "model")
+        if not os.path.isdir(model_path):
+            raise FileNotFoundError(
+                f"Vosk model not found at {model_path}; download one from "
+                "https://alphacephei.com/vosk/models and set VOSK_MODEL_PATH"
+            )
+        vosk.SetLogLevel(-1)
+        self._vosk = vosk
+        self.model = vosk.Model(model_path)
+
+    def transcribe(self, audio: sr.AudioData) -> str:
+        recognizer = self._vosk.KaldiRecognizer(self.model, self.sample_rate)
+        recognizer.AcceptWaveform(audio.get_raw_data(convert_rate=self.sample_rate, convert_width=2))
+        text = json.loads(recognizer.FinalResult()).get("text", "").strip()
+        if not text:
+            raise sr.UnknownValueError()
+        return text
+
+
+class WhisperTranscriber(Transcriber):
+    """
+    Offline Whisper recognition through SpeechRecognition, which keeps the model loaded
+
+    The tiny.en and base.en models are the practical choices on a CPU.
+    """
+
+    name = "whisper"
+    offline = True
+
+    def __init__(self, recognizer: Optional[sr.Recognizer] = None, language: str = "en-US",
+                 model: Optional[str] = None):
+        super().__init__(recognizer, language)
+        self.model = model or os.getenv("WHISPER_MODEL", "base.en")
+        # SpeechRecognition caches the loaded model on the recognizer; serialize the first load
+        self._lock = threading.Lock()
+
+    def transcribe(self, audio: sr.AudioData) -> str:
+        options = {"model": self.model}
+        if not self.model.endswith(".en"):
+            options["language"] = self.language.split("-")[0]
+        with self._lock:
+            text = self.recognizer.recognize_whisper(audio, **options).strip()
+        if not text:
+            raise sr.UnknownValueError()
+        return text
+
+    def load(self):
+        """SpeechRecognition loads the model on first use, so transcribe a moment of silence"""
+        silence = sr.AudioData(b"\0\0" * 16000, 16000, 2)
+        try:
+            self.transcribe(silence)
+        except sr.UnknownValueError:
+            pass
+
+
+BACKENDS: Dict[str, Type[Transcriber]] = {
+    "google": GoogleTranscriber,
+    "vosk": VoskTranscriber,
+    "whisper": WhisperTranscriber,
+}
+
+
+def create_transcriber(backend: Optional[str] = None, recognizer: Optional[sr.Recognizer] = None,
+                       language: str = "en-US", **options) -> Transcriber:
+    """
+    Build the configured speech-to-text backend
+
+    Args:
+        backend: google, vosk or whisper; defaults to the SPEECH_BACKEND environment variable
+        recognizer: SpeechRecognition recognizer to share with the caller
+        language: BCP-47 language of the speaker
+        options: backend-specific settings (model_path for vosk, model for whisper)
+    """
+    backend = (backend or os.getenv("SPEECH_BACKEND") or DEFAULT_BACKEND).lower()
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown speech backend: {backend} (expected one of {', '.join(BACKENDS)})")
+    transcriber = BACKENDS[backend](recognizer, language, **options)
+    logger.info(f"Speech recognition backend: {backend}")
+    return transcriber
@@ -0,0 +1,207 @@
+import sqlite3
+import hashlib
+import logging
+import os
+import re
+import threading
+import time
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_PATH = os.path.join(os.path.expanduser("~"), ".assistant", "response_cache.sqlite3")
+
+CONTRACTIONS = {
+    "what's": "what is",
+    "who's": "who is",
+    "where's": "where is",
+    "how's": "how is",
+    "it's": "it is",
+    "that's": "that is",
+    "there's": "there is",
+    "i'm": "i am",
+    "you're": "you are",
+    "can't": "cannot",
+    "don't": "do not",
+    "doesn't": "does not",
+    "isn't": "is not",
+}
+
+CONTRACTION_PATTERN = re.compile(r"\b(?:" + "|".join(map(re.escape, CONTRACTIONS)) + r")\b")
+
+# Words that don't change the meaning of a spoken question
+FILLER_WORDS = {"please", "hey", "um", "uh", "so", "okay", "ok", "well", "assistant"}
+
+# Words a fuzzy lookup may ignore on top of the filler words; every other word must match
+FUZZY_IGNORED_WORDS = {"a", "an", "the", "just", "really", "actually"}
+
+
+def normalize_utterance(text: str) -> str:
+    """Normalize an utterance so trivially different phrasings share a cache key"""
+    text = text.lower().strip()
+    text = CONTRACTION_PATTERN.sub(lambda match: CONTRACTIONS[match.group(0)], text)
+    text = re.sub(r"[^\w\s+\-*/=%]", " ", text)
+    words = [word for word in text.split() if word not in FILLER_WORDS]
+    return " ".join(words)
+
+
+def content_words(key: str) -> tuple:
+    """The words of a normalized utterance that a fuzzy match must agree on, in order"""
+    return tuple(word for word in key.split() if word not in FUZZY_IGNORED_WORDS)
+
+
+def prompts_version() -> str:
+    """Digest of prompt.py, so cached answers are dropped whenever the prompts change"""
+    from assistant.utils import prompt
+    with open(prompt.__file__, "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+class ResponseCache:
+    """
+    Persistent SQLite cache for LLM answers
+
+    Entries are keyed on the normalized utterance within a namespace derived from the
+    system prompt and model, evicted least-recently-used beyond max_entries and expired
+    after a per-entry TTL; open-ended replies ("what's the news") go stale quickly, so
+    callers store them with reply_ttl rather than the default. Lookups are exact on the normalized utterance unless the
+    caller asks for a fuzzy match, which only ignores articles and similar words:
+    utterances differing in any other word (an entity, a number) are different
+    questions.
+    """
+
+    def __init__(self, path: str = DEFAULT_CACHE_PATH, max_entries: int = 1000,
+                 ttl: float = 24 * 3600, reply_ttl: float = 10 * 60,
+                 version: Optional[str] = None, scan_limit: int = 200):
+        self.path = path
+        self.max_entries = max_entries
+        # For routes and classifications, which only depend on the utterance
+        self.ttl = ttl
+        # For conversational replies
+        self.reply_ttl = reply_ttl
+        self.scan_limit = scan_limit
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS entries (
+                namespace TEXT NOT NULL,
+                key TEXT NOT NULL,
+                value TEXT NOT NULL,
+                created REAL NOT NULL,
+                expires REAL NOT NULL,
+                last_access REAL NOT NULL,
+                hits INTEGER NOT NULL DEFAULT 0,
+                PRIMARY KEY (namespace, key)
+            );
+            CREATE INDEX IF NOT EXISTS entries_last_access ON entries (last_access);
+            CREATE TABLE IF NOT EXISTS meta (name TEXT PRIMARY KEY, value TEXT NOT NULL);
+        """)
+        self._check_version(version if version is not None else prompts_version())
+
+    @staticmethod
+    def namespace(system_prompt: str, model: str) -> str:
+        """Hash of the system prompt and model an answer was generated with"""
+        return hashlib.sha256(f"{model}\0{system_prompt}".encode("utf-8")).hexdigest()
+
+    def _check_version(self, version: str):
+        """Drop every entry when the prompts have changed since the cache was written"""
+        with self._lock, self._conn:
+            row = self._conn.execute("SELECT value FROM meta WHERE name = 'version'").fetchone()
+            if row and row[0] == version:
+                return
+            if row:
+                logger.info("Prompts changed, clearing response cache")
+            self._conn.execute("DELETE FROM entries")
+            self._conn.execute(
+                "INSERT OR REPLACE INTO meta (name, value) VALUES ('version', ?)", (version,)
+            )
+
+    def _find_similar(self, namespace: str, key: str, now: float):
+        """Return a recent live entry in the namespace with the same content words as key"""
+        words = content_words(key)
+        rows = self._conn.execute(
+            "SELECT key, value FROM entries WHERE namespace = ? AND expires > ? "
+            "ORDER BY last_access DESC LIMIT ?",
+            (namespace, now, self.scan_limit)
+        ).fetchall()
+        for candidate, value in rows:
+            if content_words(candidate) == words:
+                return candidate, value
+        return None
+
+    def get(self, system_prompt: str, model: str, utterance: str, fuzzy: bool = False) -> Optional[str]:
+        """
+        Look up a cached answer for the utterance, counting the hit or miss
+
+        Args:
+            fuzzy: also match entries that only differ in articles and similar words;
+                only for free-form answers, never for routing or classification
+        """
+        namespace = self.namespace(system_prompt, model)
+        key = normalize_utterance(utterance)
+        now = time.time()
+        with self._lock, self._conn:
+            row = self._conn.execute(
+                "SELECT key, value FROM entries WHERE namespace = ? AND key = ? AND expires > ?",
+                (namespace, key, now)
+            ).fetchone()
+            if row is None and fuzzy:
+                row = self._find_similar(namespace, key, now)
+
+            if row is None:
+                self.misses += 1
+                return None
+
+            self.hits += 1
+            self._conn.execute(
+                "UPDATE entries SET last_access = ?, hits = hits + 1 WHERE namespace = ? AND key = ?",
+                (now, namespace, row[0])
+            )
+            return row[1]
+
+    def put(self, system_prompt: str, model: str, utterance: str, value: str,
+            ttl: Optional[float] = None):
+        """Store an answer, evicting expired and least-recently-used entries"""
+        namespace = self.namespace(system_prompt, model)
+        key = normalize_utterance(utterance)
+        now = time.time()
+        expires = now + (self.ttl if ttl is None else ttl)
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO entries (namespace, key, value, created, expires, last_access) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (namespace, key, value, now, expires, now)
+            )
+            self._conn.execute("DELETE FROM entries WHERE expires <= ?", (now,))
+            self._conn.execute(
+                "DELETE FROM entries WHERE rowid IN ("
+                "SELECT rowid FROM entries ORDER BY last_access DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,)
+            )
+
+    def stats(self) -> dict:
+        """Hit/miss counters and current size"""
+        with self._lock:
+            size = self._conn.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "size": size,
+        }
+
+    def clear(self):
+        """Remove every cached entry"""
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM entries")
+
+    def close(self):
+        """Close the underlying database"""
+        with self._lock:
+            self._conn.close()
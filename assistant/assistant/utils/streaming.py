@@ -0,0 +1,159 @@
+import re
+from typing import List, Optional
+
+JSON_ESCAPES = {
+    '"': '"',
+    '\\': '\\',
+    '/': '/',
+    'b': '\b',
+    'f': '\f',
+    'n': '\n',
+    'r': '\r',
+    't': '\t',
+}
+
+# Sentence punctuation (optionally followed by closing quotes/brackets) then whitespace, or a line break
+SENTENCE_BOUNDARY = re.compile(r'[.!?]+["\')\]]*\s+|\n+')
+
+IS_BROWSER_TASK = re.compile(r'"is_browser_task"\s*:\s*(true|false)')
+
+
+class JSONFieldStreamer:
+    """
+    Incrementally decode the value of one string field from a streamed JSON object
+
+    The model replies with a JSON envelope such as {"response": "..."}; feeding the
+    raw completion chunks returns the decoded characters of the field as soon as they
+    arrive, without waiting for the closing brace.
+    """
+
+    def __init__(self, field: str):
+        self._key = re.compile(r'"%s"\s*:\s*"' % re.escape(field))
+        self._buffer = ""
+        self._pos = None
+        self.found = False
+        self.done = False
+
+    def feed(self, chunk: str) -> str:
+        """Add a raw chunk and return the newly decoded part of the field value"""
+        self._buffer += chunk
+        if self.done:
+            return ""
+
+        if self._pos is None:
+            match = self._key.search(self._buffer)
+            if not match:
+                return ""
+            self._pos = match.end()
+            self.found = True
+
+        buffer = self._buffer
+        decoded = []
+        i = self._pos
+        while i < len(buffer):
+            char = buffer[i]
+            if char == '"':
+                self.done = True
+                i += 1
+                break
+            if char != '\\':
+                decoded.append(char)
+                i += 1
+                continue
+
+            # Escape sequence; stop and wait for more input if it is incomplete
+            if i + 1 >= len(buffer):
+                break
+            escape = buffer[i + 1]
+            if escape != 'u':
+                decoded.append(JSON_ESCAPES.get(escape, escape))
+                i += 2
+                continue
+            if i + 6 > len(buffer):
+                break
+            code = int(buffer[i + 2:i + 6], 16)
+            if 0xD800 <= code < 0xDC00:
+                # High surrogate, needs the following \uXXXX low surrogate
+                if i + 12 > len(buffer):
+                    break
+                low = int(buffer[i + 8:i + 12], 16)
+                code = 0x10000 + ((code - 0xD800) << 10) + (low - 0xDC00)
+                i += 6
+            decoded.append(chr(code))
+            i += 6
+
+        self._pos = i
+        return "".join(decoded)
+
+
+class SentenceSplitter:
+    """Accumulate streamed text and emit complete sentences"""
+
+    def __init__(self):
+        self._buffer = ""
+
+    def feed(self, text: str) -> List[str]:
+        """Add text and return any sentences that are now complete"""
+        self._buffer += text
+        sentences = []
+        start = 0
+        for match in SENTENCE_BOUNDARY.finditer(self._buffer):
+            sentence = self._buffer[start:match.end()].strip()
+            if sentence:
+                sentences.append(sentence)
+            start = match.end()
+        self._buffer = self._buffer[start:]
+        return sentences
+
+    def flush(self) -> str:
+        """Return whatever text is left once the stream has ended"""
+        remainder = self._buffer.strip()
+        self._buffer = ""
+        return remainder
+
+
+class RouteReplyStreamer:
+    """
+    Stream the reply sentences of a routed response, holding them back until its
+    is_browser_task flag has arrived
+
+    Nothing is released for browser routes, even if they carry a response field:
+    the browser command's result is the reply. Sentences are also held while the
+    flag is missing; the caller decides from the parsed route once the stream ends.
+    """
+
+    def __init__(self, field: str = "response"):
+        self._field = JSONFieldStreamer(field)
+        self._splitter = SentenceSplitter()
+        self._raw = []
+        self._pending = []
+        # None until the flag has been seen in the stream
+        self.browser_task: Optional[bool] = None
+
+    @property
+    def content(self) -> str:
+        """The raw response received so far"""
+        return "".join(self._raw)
+
+    def feed(self, delta: str) -> List[str]:
+        """Add a streamed delta and return the sentences that may be spoken now"""
+        self._raw.append(delta)
+        if self.browser_task is None:
+            match = IS_BROWSER_TASK.search(self.content)
+            if match:
+                self.browser_task = match.group(1) == "true"
+        self._pending.extend(self._splitter.feed(self._field.feed(delta)))
+        return self._release()
+
+    def flush(self) -> List[str]:
+        """Return the remaining sentences that may be spoken once the stream has ended"""
+        tail = self._splitter.flush()
+        if tail:
+            self._pending.append(tail)
+        return self._release()
+
+    def _release(self) -> List[str]:
+        if self.browser_task is not False:
+            return []
+        sentences, self._pending = self._pending, []
+        return sentences
@@ -0,0 +1,279 @@
+from bisect import bisect_left
+from collections import Counter, deque
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
+from typing import Any, Dict, Iterator, Optional, Sequence
+import json
+import logging
+import os
+import threading
+import time
+import uuid
+
+logger = logging.getLogger(__name__)
+
+# Histogram bucket upper bounds in seconds, from a cached reply up to a long browser task
+DEFAULT_BUCKETS = (0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+
+@dataclass
+class Span:
+    name: str
+    turn_id: Optional[str]
+    started_at: float = field(default_factory=time.time)
+    duration: float = 0.0
+    # ok, error or cancelled; callers may set it for failures reported without raising
+    status: str = "ok"
+    attributes: Dict[str, Any] = field(default_factory=dict)
+
+
+class Histogram:
+    """Prometheus-style latency histogram with fixed buckets"""
+
+    def __init__(self, buckets: Sequence[float]):
+        self.buckets = tuple(buckets)
+        # The last slot counts observations above the largest bound (+Inf)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Estimate a quantile by interpolating within its bucket, as histogram_quantile does"""
+        if not self.count:
+            return None
+        rank = q * self.count
+        cumulative = 0
+        for index, count in enumerate(self.counts):
+            if cumulative + count >= rank and count:
+                if index == len(self.buckets):
+                    return self.buckets[-1]
+                lower = self.buckets[index - 1] if index else 0.0
+                return lower + (self.buckets[index] - lower) * (rank - cumulative) / count
+            cumulative += count
+        return self.buckets[-1]
+
+
+def _label(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+
+
+class Tracer:
+    """
+    Time every stage of a turn as spans sharing a turn ID, and aggregate them into
+    latency histograms, error counts and LLM token counts
+
+    Spans are appended to a JSONL file as they finish. Metrics are rewritten in
+    Prometheus text format after every turn, atomically, so the file can be scraped
+    with node_exporter's textfile collector. Both exports are optional; without them
+    the aggregates are only kept in memory (see stats()).
+
+    Turns are sequential, so the current turn ID is tracer state rather than
+    thread-local: stages that run on the browser or agent threads land in the right
+    turn. Speech finishes asynchronously and carries its own turn ID.
+    """
+
+    def __init__(self, jsonl_path: Optional[str] = None, prometheus_path: Optional[str] = None,
+                 buckets: Sequence[float] = DEFAULT_BUCKETS, namespace: str = "assistant",
+                 history: int = 1000):
+        self.jsonl_path = jsonl_path
+        self.prometheus_path = prometheus_path
+        self.buckets = tuple(buckets)
+        self.namespace = namespace
+        self.turn_id: Optional[str] = None
+        self.turns = 0
+        self.histograms: Dict[str, Histogram] = {}
+        self.errors = Counter()
+        self.tokens = Counter()
+        # Most recent spans, for inspection without an export file
+        self.recent = deque(maxlen=history)
+        self._lock = threading.Lock()
+        self._jsonl = open(jsonl_path, "a", encoding="utf-8", buffering=1) if jsonl_path else None
+
+    @contextmanager
+    def turn(self, since: Optional[float] = None, **attributes) -> Iterator[Span]:
+        """
+        Trace one turn: spans started inside it get its ID, and metrics are exported at
+        the end
+
+        Args:
+            since: time.perf_counter() value the turn started at, when it began before
+                the with-block (e.g. listening, which only becomes a turn once it hears
+                something)
+        """
+        previous, self.turn_id = self.turn_id, uuid.uuid4().hex[:12]
+        try:
+            with self.span("turn", since=since, **attributes) as span:
+                yield span
+        finally:
+            self.turn_id = previous
+            with self._lock:
+                self.turns += 1
+            self.export()
+
+    @contextmanager
+    def span(self, name: str, since: Optional[float] = None, turn_id: Optional[str] = None,
+             **attributes) -> Iterator[Span]:
+        """Time a with-block; an exception marks the span as failed and is re-raised"""
+        started = time.perf_counter() if since is None else since
+        span = Span(name, turn_id or self.turn_id, time.time() - (time.perf_counter() - started),
+                    attributes=attributes)
+        try:
+            yield span
+        except Exception as e:
+            span.status = "error"
+            span.attributes.setdefault("error", str(e))
+            raise
+        finally:
+            span.duration = time.perf_counter() - started
+            self._finish(span)
+
+    def record(self, name: str, duration: float, status: str = "ok", turn_id: Optional[str] = None,
+               **attributes):
+        """Add a span for a stage that was timed elsewhere and has just finished"""
+        self._finish(Span(name, turn_id or self.turn_id, time.time() - duration, duration,
+                          status, attributes))
+
+    def add_tokens(self, model: str, prompt_tokens: int = 0, completion_tokens: int = 0,
+                   turn_id: Optional[str] = None):
+        with self._lock:
+            self.tokens[(model, "prompt")] += prompt_tokens
+            self.tokens[(model, "completion")] += completion_tokens
+        self._write({
+            "type": "tokens",
+            "turn_id": turn_id or self.turn_id,
+            "at": time.time(),
+            "model": model,
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": completion_tokens,
+        })
+
+    def add_usage(self, model: str, usage: Any):
+        """Count tokens from an OpenAI usage object; there is none on cache hits or plain streams"""
+        if usage is None:
+            return
+        self.add_tokens(model, getattr(usage, "prompt_tokens", 0) or 0,
+                        getattr(usage, "completion_tokens", 0) or 0)
+
+    def speech_finished(self, job):
+        """
+        TTSWorker on_finish hook: record a finished job's queue delay and speaking time
+        """
+        if job.started_at is None:
+            # Cancelled while still queued
+            self.record("tts.queue", job.finished_at - job.enqueued_at, "cancelled", job.turn_id)
+            return
+        self.record("tts.queue", job.started_at - job.enqueued_at, turn_id=job.turn_id)
+        self.record("tts.speak", job.finished_at - job.started_at,
+                    "ok" if job.status == "spoken" else "cancelled", job.turn_id, chars=len(job.text))
+
+    def stats(self) -> dict:
+        """Per stage: count, estimated p50/p95 in seconds and errors; plus turn and token totals"""
+        with self._lock:
+            return {
+                "turns": self.turns,
+                "stages": {
+                    name: {
+                        "count": histogram.count,
+                        "p50": histogram.quantile(0.5),
+                        "p95": histogram.quantile(0.95),
+                        "errors": self.errors[name],
+                    }
+                    for name, histogram in sorted(self.histograms.items())
+                },
+                "tokens": {f"{model}/{kind}": count for (model, kind), count in sorted(self.tokens.items())},
+            }
+
+    def prometheus_text(self) -> str:
+        """Current metrics in the Prometheus text exposition format"""
+        metric = self.namespace
+        lines = [
+            f"# HELP {metric}_stage_duration_seconds Time spent in each stage of a turn.",
+            f"# TYPE {metric}_stage_duration_seconds histogram",
+        ]
+        with self._lock:
+            for name, histogram in sorted(self.histograms.items()):
+                stage = _label(name)
+                cumulative = 0
+                for bound, count in zip(histogram.buckets, histogram.counts):
+                    cumulative += count
+                    lines.append(f'{metric}_stage_duration_seconds_bucket{{stage="{stage}",le="{bound}"}} {cumulative}')
+                lines.append(f'{metric}_stage_duration_seconds_bucket{{stage="{stage}",le="+Inf"}} {histogram.count}')
+                lines.append(f'{metric}_stage_duration_seconds_sum{{stage="{stage}"}} {histogram.sum}')
+                lines.append(f'{metric}_stage_duration_seconds_count{{stage="{stage}"}} {histogram.count}')
+
+            lines.append(f"# HELP {metric}_stage_errors_total Stages that failed.")
+            lines.append(f"# TYPE {metric}_stage_errors_total counter")
+            for name in sorted(self.histograms):
+                lines.append(f'{metric}_stage_errors_total{{stage="{_label(name)}"}} {self.errors[name]}')
+
+            lines.append(f"# HELP {metric}_llm_tokens_total LLM tokens used, by model and kind.")
+            lines.append(f"# TYPE {metric}_llm_tokens_total counter")
+            for (model, kind), count in sorted(self.tokens.items()):
+                lines.append(f'{metric}_llm_tokens_total{{model="{_label(model)}",kind="{kind}"}} {count}')
+
+            lines.append(f"# HELP {metric}_turns_total Completed turns.")
+            lines.append(f"# TYPE {metric}_turns_total counter")
+            lines.append(f"{metric}_turns_total {self.turns}")
+        return "\n".join(lines) + "\n"
+
+    def export(self):
+        """Rewrite the Prometheus file, if there is one"""
+        if not self.prometheus_path:
+            return
+        temporary = f"{self.prometheus_path}.tmp"
+        try:
+            with open(temporary, "w", encoding="utf-8") as f:
+                f.write(self.prometheus_text())
+            os.replace(temporary, self.prometheus_path)
+        except OSError as e:
+            logger.warning(f"Failed to export metrics: {e}")
+
+    def reset(self):
+        """Drop the aggregated metrics, e.g. after warm-up runs"""
+        with self._lock:
+            self.turns = 0
+            self.histograms.clear()
+            self.errors.clear()
+            self.tokens.clear()
+            self.recent.clear()
+
+    def close(self):
+        """Export the final metrics and close the JSONL file"""
+        self.export()
+        with self._lock:
+            if self._jsonl is not None:
+                self._jsonl.close()
+                self._jsonl = None
+
+    def _finish(self, span: Span):
+        with self._lock:
+            histogram = self.histograms.get(span.name)
+            if histogram is None:
+                histogram = self.histograms[span.name] = Histogram(self.buckets)
+            histogram.observe(span.duration)
+            if span.status == "error":
+                self.errors[span.name] += 1
+            self.recent.append(span)
+        self._write({"type": "span", **asdict(span)})
+
+    def _write(self, record: dict):
+        if self._jsonl is None:
+            return
+        line = json.dumps(record, default=str)
+        with self._lock:
+            if self._jsonl is not None:
+                self._jsonl.write(line + "\n")
+
+
+def create_tracer(jsonl_path: Optional[str] = None, prometheus_path: Optional[str] = None,
+                  **options) -> Tracer:
+    """
+    Create a tracer exporting spans to jsonl_path and metrics to prometheus_path, which
+    default to the TRACE_FILE and METRICS_FILE environment variables (unset: no export)
+    """
+    return Tracer(jsonl_path or os.getenv("TRACE_FILE"), prometheus_path or os.getenv("METRICS_FILE"), **options)
@@ -0,0 +1,220 @@
+import pyttsx3
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Callable, Optional
+import itertools
+import logging
+import queue
+import statistics
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class SpeechJob:
+    text: str
+    generation: int
+    enqueued_at: float = field(default_factory=time.monotonic)
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    # queued, speaking, spoken or cancelled
+    status: str = "queued"
+    done: threading.Event = field(default_factory=threading.Event)
+    # Turn the text answers, for tracing speech that finishes after its turn
+    turn_id: Optional[str] = None
+
+
+class TTSWorker:
+    """
+    Speak queued text on a dedicated thread that owns the pyttsx3 engine
+
+    say() only enqueues and returns a SpeechJob, so callers never block on speech. The
+    engine runs an external loop (startLoop(False) + iterate()), which lets the worker
+    stop mid-utterance: cancel() interrupts the current utterance and drops everything
+    queued, for barge-in, and say(..., interrupt=True) does the same before queueing a
+    newer response.
+    """
+
+    def __init__(self, configure: Optional[Callable] = None, engine_factory: Callable = pyttsx3.init,
+                 poll_interval: float = 0.02, on_state: Optional[Callable[[bool], None]] = None,
+                 history: int = 100, on_finish: Optional[Callable[[SpeechJob], None]] = None):
+        # Called with the engine on the worker thread to set rate, volume and voice
+        self.configure = configure
+        self.engine_factory = engine_factory
+        self.poll_interval = poll_interval
+        # Called on the worker thread with True when speech starts and False when it stops
+        self.on_state = on_state
+        # Called with every job once it is spoken or cancelled, e.g. to trace its timings
+        self.on_finish = on_finish
+        self._jobs: "queue.Queue[SpeechJob]" = queue.Queue()
+        self._generation = 0
+        self._pending = 0
+        self._lock = threading.Lock()
+        self._idle = threading.Condition(self._lock)
+        self._cancel = threading.Event()
+        self._stopped = threading.Event()
+        self._ready = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._names = itertools.count()
+        self.spoken = 0
+        self.cancelled = 0
+        self._queue_delays = deque(maxlen=history)
+        self._speaking_times = deque(maxlen=history)
+        self.current: Optional[SpeechJob] = None
+
+    def start(self, timeout: float = 10):
+        """Start the worker and wait until its engine is initialized"""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stopped.clear()
+        self._thread = threading.Thread(target=self._run, name="tts", daemon=True)
+        self._thread.start()
+        self._ready.wait(timeout)
+
+    def stop(self, timeout: float = 2):
+        """Cancel pending speech and shut the worker down"""
+        self.cancel()
+        self._stopped.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def say(self, text: str, interrupt: bool = False, turn_id: Optional[str] = None) -> SpeechJob:
+        """
+        Queue text to be spoken without waiting for it
+
+        Args:
+            text: what to say
+            interrupt: cancel the current and queued speech first (a newer response)
+            turn_id: turn the text belongs to, passed through to on_finish
+        """
+        if interrupt:
+            self.cancel()
+        with self._lock:
+            job = SpeechJob(text, self._generation, turn_id=turn_id)
+            self._pending += 1
+        self._jobs.put(job)
+        return job
+
+    def cancel(self):
+        """Stop the current utterance and drop everything queued so far"""
+        with self._lock:
+            self._generation += 1
+        self._cancel.set()
+
+    def wait(self, job: Optional[SpeechJob] = None, timeout: Optional[float] = None) -> bool:
+        """
+        Wait until a job (by default everything queued so far) is spoken or cancelled
+
+        Returns:
+            False if the timeout expired first
+        """
+        if job is None:
+            with self._idle:
+                return self._idle.wait_for(lambda: self._pending == 0, timeout)
+        return job.done.wait(timeout)
+
+    @property
+    def is_speaking(self) -> bool:
+        return self.current is not None
+
+    def stats(self) -> dict:
+        """Counters plus queue delay (enqueue to start) and speaking time, in seconds"""
+        def summary(values):
+            values = list(values)
+            if not values:
+                return {"mean": None, "max": None}
+            return {"mean": statistics.mean(values), "max": max(values)}
+
+        return {
+            "spoken": self.spoken,
+            "cancelled": self.cancelled,
+            "queued": self._jobs.qsize(),
+            "queue_delay": summary(self._queue_delays),
+            "speaking_time": summary(self._speaking_times),
+        }
+
+    def _finish(self, job: SpeechJob, status: str):
+        if job.done.is_set():
+            return
+        job.status = status
+        job.finished_at = time.monotonic()
+        if status == "spoken":
+            self.spoken += 1
+            self._speaking_times.append(job.finished_at - job.started_at)
+        else:
+            self.cancelled += 1
+        job.done.set()
+        with self._idle:
+            self._pending -= 1
+            self._idle.notify_all()
+        if self.on_finish:
+            try:
+                self.on_finish(job)
+            except Exception as e:
+                logger.warning(f"Speech finish callback failed: {e}")
+        if self.current is job:
+            self.current = None
+            if self.on_state:
+                self.on_state(False)
+
+    def _run(self):
+        try:
+            engine = self.engine_factory()
+            if self.configure:
+                self.configure(engine)
+        except Exception as e:
+            logger.error(f"Failed to start text-to-speech engine: {e}")
+            self._ready.set()
+            return
+
+        names = {}
+
+        def finished(name, completed):
+            job = names.pop(name, None)
+            if job is not None and job.status == "speaking":
+                self._finish(job, "spoken" if completed else "cancelled")
+
+        engine.connect("finished-utterance", finished)
+        engine.startLoop(False)
+        self._ready.set()
+        try:
+            while not self._stopped.is_set():
+                if self._cancel.is_set():
+                    self._cancel.clear()
+                    job = self.current
+                    if job is not None:
+                        engine.stop()
+                        names.clear()
+                        self._finish(job, "cancelled")
+
+                if self.current is None:
+                    try:
+                        job = self._jobs.get(timeout=self.poll_interval)
+                    except queue.Empty:
+                        continue
+                    if job.generation != self._generation:
+                        self._finish(job, "cancelled")
+                        continue
+                    name = str(next(self._names))
+                    names[name] = job
+                    job.status = "speaking"
+                    job.started_at = time.monotonic()
+                    self._queue_delays.append(job.started_at - job.enqueued_at)
+                    self.current = job
+                    if self.on_state:
+                        self.on_state(True)
+                    logger.info(f"Speaking: {job.text}")
+                    engine.say(job.text, name)
+
+                engine.iterate()
+                time.sleep(self.poll_interval)
+        finally:
+            job = self.current
+            if job is not None:
+                self._finish(job, "cancelled")
+            while not self._jobs.empty():
+                self._finish(self._jobs.get_nowait(), "cancelled")
+            engine.endLoop()
@@ -0,0 +1,447 @@
+"""
+Stage-level latency benchmark
+
+Drives BrowserTools and BrowserActions against static pages served from
+benchmarks/fixtures, and BrowserAgent, ConversationAgent and SpeechHandler.get_ai_response
+against a local stub of the OpenAI chat completions API. Everything runs offline on a
+headless machine. Reports p50/p95 per browser operation and per pipeline stage, and
+writes the results as JSON for comparing commits.
+
+    python benchmarks/latency.py --runs 20 --output before.json
+    python benchmarks/latency.py --runs 20 --output after.json --compare before.json
+
+Chrome and a matching chromedriver must already be installed (Selenium can't download
+a driver offline). The stub answers after --llm-latency seconds and streams replies in
+small chunks every --chunk-interval seconds, so LLM stages measure the client-side
+pipeline around a fixed, simulated model latency.
+"""
+import argparse
+import functools
+import json
+import logging
+import os
+import platform
+import subprocess
+import sys
+import threading
+import time
+from collections import Counter, defaultdict
+from http.server import BaseHTTPRequestHandler, SimpleHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from assistant.agents.browser_agent import BrowserAgent
+from assistant.agents.conversation_agent import ConversationAgent
+from assistant.tools.browser_tools import (
+    ClickInput, FormInput, NavigateInput, ReadInput, ScrollInput, SearchInput, TypeInput
+)
+from assistant.tools.selector_cache import SelectorCache
+from assistant.utils.browser_actions import BrowserActions
+from assistant.utils.clients import create_client
+from assistant.utils.command_parser import parse_simple_command
+from assistant.utils.prompt import browser_task_prompt
+from assistant.utils.tracing import Tracer
+
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+FORM_FIELDS = {"#name": "Ada Lovelace", "#email": "ada@example.com", "#message": "Hello from the benchmark"}
+
+# Utterances sent through the agents; the stub answers each with the canned reply below
+ROUTED_BROWSER = "fill in the contact form on the fixture site"
+ROUTED_CONVERSATION = "what is a benchmark"
+BROWSER_COMMAND = "open the fixture article"
+FAST_PATH = "scroll down"
+
+
+def canned_replies(base_url: str) -> dict:
+    """Stub replies per user message; each carries the keys every prompt expects"""
+    return {
+        BROWSER_COMMAND: {
+            "is_browser_task": True,
+            "action": "navigate",
+            "params": {"url": f"{base_url}/index.html"},
+        },
+        ROUTED_BROWSER: {
+            "is_browser_task": True,
+            "plan": [
+                {"action": "navigate", "params": {"url": f"{base_url}/form.html", "wait_for": "#name"}},
+                {"action": "fill_form", "params": {"fields": FORM_FIELDS}},
+            ],
+        },
+        ROUTED_CONVERSATION: {
+            "is_browser_task": False,
+            "response": "A benchmark measures how long something takes. Running it on every "
+                        "commit shows when a change makes things slower. Comparing percentiles "
+                        "is more robust than comparing single runs.",
+        },
+    }
+
+
+class QuietFileHandler(SimpleHTTPRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+
+class StubOpenAIHandler(BaseHTTPRequestHandler):
+    """
+    Minimal /v1/chat/completions endpoint: answers with the canned JSON for the last user
+    message after a simulated model latency, streamed as server-sent events when asked to
+    """
+
+    protocol_version = "HTTP/1.1"
+    replies: dict = {}
+    default_reply = {"is_browser_task": False, "response": "I'm a stub, I don't know that one."}
+    latency = 0.2
+    chunk_interval = 0.01
+    chunk_size = 4
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+        if not self.path.rstrip("/").endswith("/chat/completions"):
+            self._send_json(404, {"error": {"message": f"Unknown path {self.path}"}})
+            return
+
+        user = next((message["content"] for message in reversed(body.get("messages", []))
+                     if message["role"] == "user"), "")
+        content = json.dumps(self.replies.get(user, self.default_reply))
+        model = body.get("model", "stub")
+        time.sleep(self.latency)
+
+        if body.get("stream"):
+            self._stream(model, content)
+            return
+        prompt_tokens = sum(len(message["content"].split()) for message in body.get("messages", []))
+        completion_tokens = len(content.split())
+        self._send_json(200, {
+            "id": "chatcmpl-stub",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": model,
+            "choices": [{
+                "index": 0,
+                "message": {"role": "assistant", "content": content},
+                "finish_reason": "stop",
+            }],
+            "usage": {
+                "prompt_tokens": prompt_tokens,
+                "completion_tokens": completion_tokens,
+                "total_tokens": prompt_tokens + completion_tokens,
+            },
+        })
+
+    def _send_json(self, status: int, payload: dict):
+        data = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _stream(self, model: str, content: str):
+        # No Content-Length for an event stream, so the connection ends the response
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Connection", "close")
+        self.end_headers()
+        self.close_connection = True
+
+        def event(delta: dict, finish_reason=None):
+            chunk = {
+                "id": "chatcmpl-stub",
+                "object": "chat.completion.chunk",
+                "created": int(time.time()),
+                "model": model,
+                "choices": [{"index": 0, "delta": delta, "finish_reason": finish_reason}],
+            }
+            self.wfile.write(f"data: {json.dumps(chunk)}\n\n".encode())
+            self.wfile.flush()
+
+        event({"role": "assistant", "content": ""})
+        for start in range(0, len(content), self.chunk_size):
+            event({"content": content[start:start + self.chunk_size]})
+            time.sleep(self.chunk_interval)
+        event({}, "stop")
+        self.wfile.write(b"data: [DONE]\n\n")
+        self.wfile.flush()
+
+
+def serve(handler) -> ThreadingHTTPServer:
+    """Serve on an ephemeral localhost port from a daemon thread"""
+    server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="benchmark-server", daemon=True).start()
+    return server
+
+
+def base_url(server: ThreadingHTTPServer) -> str:
+    host, port = server.server_address[:2]
+    return f"http://{host}:{port}"
+
+
+def percentile(values: list, q: float) -> float:
+    """Linear-interpolated percentile, q in [0, 1]"""
+    ordered = sorted(values)
+    position = q * (len(ordered) - 1)
+    lower = int(position)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (position - lower)
+
+
+class Recorder:
+    """Collects wall-clock samples and failures per operation or stage name"""
+
+    def __init__(self):
+        self.samples = defaultdict(list)
+        self.failures = Counter()
+
+    def add(self, name: str, seconds: float, ok: bool = True):
+        self.samples[name].append(seconds)
+        if not ok:
+            self.failures[name] += 1
+
+    def time(self, name: str, fn, *args, ok=None, **kwargs):
+        """Call fn, record how long it took and whether ok(result) holds; exceptions count as failures"""
+        started = time.perf_counter()
+        try:
+            result = fn(*args, **kwargs)
+        except Exception as e:
+            self.add(name, time.perf_counter() - started, ok=False)
+            logging.getLogger(__name__).warning(f"{name} raised: {e}")
+            return None
+        self.add(name, time.perf_counter() - started, ok=ok(result) if ok else True)
+        return result
+
+    def summary(self) -> dict:
+        return {
+            name: {
+                "runs": len(values),
+                "failures": self.failures[name],
+                "p50_ms": percentile(values, 0.5) * 1000,
+                "p95_ms": percentile(values, 0.95) * 1000,
+                "mean_ms": sum(values) / len(values) * 1000,
+                "max_ms": max(values) * 1000,
+            }
+            for name, values in sorted(self.samples.items())
+        }
+
+
+def tool_ok(result) -> bool:
+    return result["status"] == "success"
+
+
+def action_ok(result) -> bool:
+    return result[0]
+
+
+def reply_ok(reply) -> bool:
+    return isinstance(reply, str) and not reply.startswith(("Failed", "Sorry", "Unknown action", "I apologize"))
+
+
+def bench_browser_tools(recorder: Recorder, tools, pages: str):
+    recorder.time("browser_tools.navigate", tools.navigate, NavigateInput(f"{pages}/index.html"), ok=tool_ok)
+    recorder.time("browser_tools.click", tools.click_element, ClickInput("#toggle"), ok=tool_ok)
+    recorder.time("browser_tools.read", tools.read_text, ReadInput("#article"), ok=tool_ok)
+    recorder.time("browser_tools.scroll", tools.scroll_page, ScrollInput(), ok=tool_ok)
+
+    tools.navigate(NavigateInput(f"{pages}/form.html", wait_for="#name"))
+    recorder.time("browser_tools.type", tools.type_text, TypeInput("#name", "Ada Lovelace"), ok=tool_ok)
+    recorder.time("browser_tools.fill_form", tools.fill_form, FormInput(dict(FORM_FIELDS)), ok=tool_ok)
+
+    tools.navigate(NavigateInput(f"{pages}/search.html", wait_for="input[name='q']"))
+    recorder.time("browser_tools.search", tools.search, SearchInput("latency"), ok=tool_ok)
+
+
+def bench_browser_actions(recorder: Recorder, browser: BrowserActions, pages: str):
+    recorder.time("browser_actions.navigate_to", browser.navigate_to, f"{pages}/index.html", ok=action_ok)
+    recorder.time("browser_actions.click_element", browser.click_element, "#toggle", ok=action_ok)
+    recorder.time("browser_actions.get_text", browser.get_text, "#article", ok=action_ok)
+    recorder.time(
+        "browser_actions.extract", browser.extract,
+        [{"selector": "#links a", "name": "links", "attributes": ["text", "href"]}], ok=action_ok
+    )
+    recorder.time("browser_actions.scroll", browser.scroll, ok=action_ok)
+
+    browser.navigate_to(f"{pages}/form.html", wait_for="#name")
+    recorder.time("browser_actions.type_text", browser.type_text, "#email", "ada@example.com", ok=action_ok)
+    recorder.time("browser_actions.go_back", browser.go_back, ok=action_ok)
+
+
+def bench_browser_agent(recorder: Recorder, agent: BrowserAgent):
+    response = recorder.time(
+        "browser_agent.plan_llm", agent.client.chat.completions.create,
+        model="gpt-4o-mini",
+        messages=[
+            {"role": "system", "content": browser_task_prompt},
+            {"role": "user", "content": BROWSER_COMMAND}
+        ],
+        temperature=0.7
+    )
+    if response is not None:
+        command = json.loads(response.choices[0].message.content)
+        recorder.time("browser_agent.execute", agent.execute_command, command, ok=reply_ok)
+    recorder.time("browser_agent.total", agent.process_command, BROWSER_COMMAND, ok=reply_ok)
+
+
+def bench_conversation_agent(recorder: Recorder, agent: ConversationAgent):
+    recorder.time("conversation_agent.reply", agent.process_conversation, ROUTED_CONVERSATION, ok=reply_ok)
+    time_stream(recorder, "conversation_agent.stream", agent.stream_conversation(ROUTED_CONVERSATION))
+
+
+def time_stream(recorder: Recorder, name: str, sentences):
+    """Record time to the first sentence and to the end of a sentence iterator"""
+    started = time.perf_counter()
+    first = None
+    spoken = []
+    for sentence in sentences:
+        if first is None:
+            first = time.perf_counter() - started
+        spoken.append(sentence)
+    total = time.perf_counter() - started
+    ok = bool(spoken) and reply_ok(spoken[0])
+    recorder.add(f"{name}.first_sentence", first if first is not None else total, ok)
+    recorder.add(f"{name}.total", total, ok)
+
+
+def bench_speech_handler(recorder: Recorder, handler):
+    # Local fast path: no LLM call at all
+    recorder.time("speech.fast_path.parse", parse_simple_command, FAST_PATH, ok=bool)
+    recorder.time("speech.fast_path.total", handler.get_ai_response, FAST_PATH, ok=reply_ok)
+
+    # Routed browser plan: one routing call, then the plan runs in the browser
+    route = recorder.time(
+        "speech.routed_browser.route_llm", handler.route, ROUTED_BROWSER
+    )
+    if route is not None:
+        recorder.time("speech.routed_browser.execute", handler.execute_route, route, ok=reply_ok)
+    recorder.time("speech.routed_browser.total", handler.get_ai_response, ROUTED_BROWSER, ok=reply_ok)
+
+    # Routed conversation, streamed sentence by sentence
+    time_stream(recorder, "speech.routed_conversation", handler.get_reply(ROUTED_CONVERSATION))
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True,
+            cwd=os.path.dirname(os.path.abspath(__file__))
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def print_table(results: dict, baseline: dict = None):
+    print(f"{'name':<46}{'runs':>6}{'fail':>6}{'p50 ms':>10}{'p95 ms':>10}" + (f"{'p50 delta':>12}" if baseline else ""))
+    for section in ("operations", "stages"):
+        print(f"-- {section}")
+        for name, summary in results[section].items():
+            line = (f"{name:<46}{summary['runs']:>6}{summary['failures']:>6}"
+                    f"{summary['p50_ms']:>10.1f}{summary['p95_ms']:>10.1f}")
+            before = (baseline or {}).get(section, {}).get(name)
+            if before:
+                line += f"{(summary['p50_ms'] - before['p50_ms']) / before['p50_ms'] * 100:>+11.1f}%"
+            print(line)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--warmup", type=int, default=1, help="unrecorded runs before measuring")
+    parser.add_argument("--llm-latency", type=float, default=0.2,
+                        help="simulated seconds before the stub model answers")
+    parser.add_argument("--chunk-interval", type=float, default=0.01,
+                        help="simulated seconds between streamed chunks")
+    parser.add_argument("--output", default=None, help="JSON results path (default latency-<commit>.json)")
+    parser.add_argument("--compare", default=None, help="earlier JSON results to compare p50s against")
+    parser.add_argument("--chrome-arg", action="append", default=[],
+                        help="extra Chrome switch, e.g. --chrome-arg=--no-sandbox")
+    parser.add_argument("--verbose", action="store_true", help="keep the assistant's INFO logs")
+    args = parser.parse_args()
+
+    pages_server = serve(functools.partial(QuietFileHandler, directory=FIXTURES))
+    pages = base_url(pages_server)
+    stub_handler = type("StubOpenAI", (StubOpenAIHandler,), {
+        "replies": canned_replies(pages), "latency": args.llm_latency, "chunk_interval": args.chunk_interval,
+    })
+    stub_server = serve(stub_handler)
+
+    # Every OpenAI client created from here on talks to the stub, never to a proxy
+    os.environ["OPENAI_BASE_URL"] = f"{base_url(stub_server)}/v1"
+    os.environ["OPENAI_API_KEY"] = "benchmark"
+    os.environ["NO_PROXY"] = ",".join(filter(None, [os.environ.get("NO_PROXY"), "127.0.0.1", "localhost"]))
+
+    # Imported late: the speech handler configures logging and loads .env on import
+    from assistant.speech_handler import SpeechHandler
+    if not args.verbose:
+        logging.getLogger().setLevel(logging.WARNING)
+
+    chrome_args = ["--disable-dev-shm-usage"] + args.chrome_arg
+    if hasattr(os, "geteuid") and os.geteuid() == 0 and "--no-sandbox" not in chrome_args:
+        chrome_args.append("--no-sandbox")
+    browser = BrowserActions(headless=True, arguments=chrome_args)
+
+    client = create_client()
+    # The built-in tracer sees the same calls; its view is reported alongside
+    tracer = Tracer()
+    # Learned locators live in memory only, so runs neither read nor pollute the user's cache
+    selector_cache = SelectorCache(":memory:")
+    browser_agent = BrowserAgent(client, prewarm=False, browser=browser, tracer=tracer,
+                                 selector_cache=selector_cache)
+    browser_agent.ensure_browser()
+    conversation_agent = ConversationAgent(client, tracer=tracer)
+    # Shares the running headless browser; the cache is off so every turn reaches the stub
+    handler = SpeechHandler(use_cache=False, prewarm_browser=False, audio=False, browser=browser,
+                            tracer=tracer, selector_cache=selector_cache)
+
+    def run(operations: Recorder, stages: Recorder):
+        bench_browser_tools(operations, browser_agent.tools, pages)
+        bench_browser_actions(operations, browser, pages)
+        bench_browser_agent(stages, browser_agent)
+        bench_conversation_agent(stages, conversation_agent)
+        bench_speech_handler(stages, handler)
+
+    try:
+        for _ in range(args.warmup):
+            run(Recorder(), Recorder())
+        operations, stages = Recorder(), Recorder()
+        tracer.reset()
+        for _ in range(args.runs):
+            run(operations, stages)
+    finally:
+        browser.close_browser()
+        pages_server.shutdown()
+        stub_server.shutdown()
+
+    commit = git_commit()
+    results = {
+        "meta": {
+            "commit": commit,
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "runs": args.runs,
+            "warmup": args.warmup,
+            "llm_latency_s": args.llm_latency,
+            "chunk_interval_s": args.chunk_interval,
+        },
+        "operations": operations.summary(),
+        "stages": stages.summary(),
+        "trace": tracer.stats(),
+    }
+
+    baseline = None
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)
+    print_table(results, baseline)
+
+    output = args.output or f"latency-{commit}.json"
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=2)
+    print(f"Results written to {output}")
+
+
+if __name__ == "__main__":
+    main()
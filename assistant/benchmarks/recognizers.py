@@ -0,0 +1,127 @@
+"""
+Speech recognition benchmark
+
+Transcribes recorded utterances with each backend and reports word error rate and
+latency. The audio directory holds WAV files next to .txt files with the reference
+transcript of the same name (hello.wav + hello.txt).
+
+    python benchmarks/recognizers.py recordings/ --backends google vosk whisper
+"""
+import argparse
+import glob
+import json
+import os
+import re
+import statistics
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import speech_recognition as sr
+from assistant.utils.recognizers import BACKENDS, create_transcriber
+
+
+def words(text: str) -> list:
+    return re.sub(r"[^\w\s']", " ", text.lower()).split()
+
+
+def word_errors(reference: str, hypothesis: str) -> int:
+    """Word-level edit distance (substitutions + insertions + deletions)"""
+    ref, hyp = words(reference), words(hypothesis)
+    previous = list(range(len(hyp) + 1))
+    for i, ref_word in enumerate(ref, 1):
+        current = [i]
+        for j, hyp_word in enumerate(hyp, 1):
+            current.append(min(
+                previous[j] + 1,
+                current[j - 1] + 1,
+                previous[j - 1] + (ref_word != hyp_word),
+            ))
+        previous = current
+    return previous[-1]
+
+
+def load_samples(directory: str) -> list:
+    samples = []
+    for path in sorted(glob.glob(os.path.join(directory, "*.wav"))):
+        transcript = os.path.splitext(path)[0] + ".txt"
+        if not os.path.exists(transcript):
+            continue
+        with sr.AudioFile(path) as source:
+            audio = sr.Recognizer().record(source)
+        with open(transcript, encoding="utf-8") as f:
+            samples.append((os.path.basename(path), audio, f.read().strip()))
+    return samples
+
+
+def percentile(values: list, q: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(q * (len(ordered) - 1))))]
+
+
+def run_backend(backend: str, samples: list, language: str) -> dict:
+    started = time.perf_counter()
+    transcriber = create_transcriber(backend, language=language)
+    # Whisper loads lazily; without this its load time would land on the first sample
+    transcriber.load()
+    load_s = time.perf_counter() - started
+
+    errors, reference_words, failures, latencies = 0, 0, 0, []
+    for name, audio, reference in samples:
+        started = time.perf_counter()
+        try:
+            hypothesis = transcriber.transcribe(audio)
+        except (sr.UnknownValueError, sr.RequestError) as e:
+            hypothesis = ""
+            failures += 1
+            print(f"  {backend} {name}: {type(e).__name__}", file=sys.stderr)
+        latencies.append(time.perf_counter() - started)
+        errors += word_errors(reference, hypothesis)
+        reference_words += len(words(reference))
+
+    return {
+        "offline": transcriber.offline,
+        "load_s": load_s,
+        "wer": errors / max(reference_words, 1),
+        "failures": failures,
+        "latency_mean_s": statistics.mean(latencies),
+        "latency_p50_s": percentile(latencies, 0.5),
+        "latency_p95_s": percentile(latencies, 0.95),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("audio_dir")
+    parser.add_argument("--backends", nargs="+", choices=list(BACKENDS), default=list(BACKENDS))
+    parser.add_argument("--language", default="en-US")
+    parser.add_argument("--json", action="store_true", help="print raw JSON results")
+    args = parser.parse_args()
+
+    samples = load_samples(args.audio_dir)
+    if not samples:
+        parser.error(f"No .wav files with matching .txt transcripts in {args.audio_dir}")
+
+    results = {}
+    for backend in args.backends:
+        try:
+            results[backend] = run_backend(backend, samples, args.language)
+        except Exception as e:
+            print(f"Skipping {backend}: {e}", file=sys.stderr)
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+    print(f"{len(samples)} utterances")
+    print(f"{'backend':<10}{'WER':>8}{'p50':>9}{'p95':>9}{'mean':>9}{'load':>9}{'failures':>10}")
+    for backend, result in results.items():
+        print(
+            f"{backend:<10}{result['wer']:>7.1%}{result['latency_p50_s']:>8.2f}s"
+            f"{result['latency_p95_s']:>8.2f}s{result['latency_mean_s']:>8.2f}s"
+            f"{result['load_s']:>8.2f}s{result['failures']:>10}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""
+Browser startup benchmark
+
+Reports, per startup mode, how long Chrome takes to come up (cold start) and how long
+the first browser command takes when issued right after the rest of initialization.
+
+    python benchmarks/startup.py --runs 3 --init-delay 2 --url https://example.com
+
+Modes:
+    eager_google: the old behaviour, blocking start plus a google.com load
+    blocking: blocking start on a blank tab
+    prewarm: background start while the rest of initialization runs
+    lazy: start on the first browser command
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from assistant.agents.browser_agent import BrowserAgent
+from assistant.tools.selector_cache import SelectorCache
+
+MODES = ("eager_google", "blocking", "prewarm", "lazy")
+
+
+def run_once(mode: str, init_delay: float, url: str) -> dict:
+    started = time.perf_counter()
+    # An in-memory selector cache keeps runs independent of ~/.assistant
+    agent = BrowserAgent(client=None, prewarm=mode == "prewarm", selector_cache=SelectorCache(":memory:"))
+    if mode in ("eager_google", "blocking"):
+        agent.browser.start_browser("https://www.google.com" if mode == "eager_google" else None)
+        agent.ensure_browser()
+    constructed = time.perf_counter()
+
+    # Stand-in for the rest of SpeechHandler startup (microphone calibration)
+    time.sleep(init_delay)
+
+    command_started = time.perf_counter()
+    result = agent.execute_command({"action": "navigate", "params": {"url": url}})
+    finished = time.perf_counter()
+
+    agent.browser.close_browser()
+    agent._browser_executor.shutdown(wait=True)
+    agent.selector_cache.close()
+    return {
+        "constructor_s": constructed - started,
+        "ready_s": finished - started,
+        "first_command_s": finished - command_started,
+        "ok": not result.startswith(("Failed", "Sorry")),
+    }
+
+
+def summarize(samples: list) -> dict:
+    summary = {"runs": len(samples), "failures": sum(not sample["ok"] for sample in samples)}
+    for key in ("constructor_s", "first_command_s", "ready_s"):
+        values = [sample[key] for sample in samples]
+        summary[key] = {"median": statistics.median(values), "max": max(values)}
+    return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--init-delay", type=float, default=2.0,
+                        help="seconds of other initialization before the first command")
+    parser.add_argument("--url", default="https://example.com")
+    parser.add_argument("--modes", nargs="+", choices=MODES, default=list(MODES))
+    parser.add_argument("--json", action="store_true", help="print raw JSON results")
+    args = parser.parse_args()
+
+    results = {}
+    for mode in args.modes:
+        results[mode] = summarize([run_once(mode, args.init_delay, args.url) for _ in range(args.runs)])
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+    print(f"{'mode':<14}{'constructor':>13}{'first command':>15}{'total':>10}{'failures':>10}")
+    for mode, summary in results.items():
+        print(
+            f"{mode:<14}{summary['constructor_s']['median']:>12.2f}s"
+            f"{summary['first_command_s']['median']:>14.2f}s"
+            f"{summary['ready_s']['median']:>9.2f}s{summary['failures']:>10}"
+        )
+
+
+if __name__ == "__main__":
+    main()
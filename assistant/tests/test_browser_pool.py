@@ -0,0 +1,100 @@
+import importlib.util
+import threading
+import time
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
+
+HAS_SELENIUM = importlib.util.find_spec("selenium") is not None
+
+
+class FakeBrowser:
+    """Stands in for BrowserActions; start_browser fails while the class-level flag is set"""
+
+    failing = False
+
+    def __init__(self):
+        self.alive = True
+        self.closed = False
+
+    def start_browser(self):
+        if FakeBrowser.failing:
+            raise RuntimeError("chrome did not start")
+
+    def is_alive(self):
+        return self.alive
+
+    def js_heap_mb(self):
+        return 10.0
+
+    def close_browser(self):
+        self.closed = True
+
+
+@unittest.skipUnless(HAS_SELENIUM, "selenium is not installed")
+class BrowserPoolTest(unittest.TestCase):
+    def setUp(self):
+        from assistant.utils.browser_pool import BrowserPool
+        FakeBrowser.failing = False
+        self.pool = BrowserPool(size=1, max_uses=1, refill_delay=0.01, factory=FakeBrowser)
+
+    def tearDown(self):
+        FakeBrowser.failing = False
+        self.pool.close()
+
+    def test_checkout_starts_the_pool(self):
+        with self.pool.lease(timeout=1) as browser:
+            self.assertIsInstance(browser, FakeBrowser)
+        self.assertEqual(self.pool.stats()["created"], 2)  # recycled after max_uses
+
+    def test_failed_recycle_keeps_the_slot(self):
+        entry = self.pool.checkout(timeout=1)
+        FakeBrowser.failing = True
+        self.pool.checkin(entry)
+        self.assertEqual(self.pool.stats()["idle"], 0)
+
+        threading.Timer(0.05, setattr, (FakeBrowser, "failing", False)).start()
+        started = time.monotonic()
+        entry = self.pool.checkout(timeout=2)
+        self.assertLess(time.monotonic() - started, 2)
+        self.assertFalse(entry.browser.closed)
+
+    def test_failed_replacement_of_a_dead_browser_keeps_the_slot(self):
+        entry = self.pool.checkout(timeout=1)
+        entry.uses = -10  # not worn out
+        self.pool.checkin(entry)
+        entry.browser.alive = False
+        FakeBrowser.failing = True
+        threading.Timer(0.05, setattr, (FakeBrowser, "failing", False)).start()
+        replacement = self.pool.checkout(timeout=2)
+        self.assertIsNot(replacement, entry)
+        self.assertTrue(replacement.browser.is_alive())
+
+
+@unittest.skipUnless(HAS_SELENIUM, "selenium is not installed")
+class ParallelCommandsTest(unittest.TestCase):
+    def agent(self, pool):
+        from assistant.agents.browser_agent import BrowserAgent
+        agent = BrowserAgent.__new__(BrowserAgent)
+        agent.pool = pool
+        agent.browser = FakeBrowser()
+        agent._browser_executor = ThreadPoolExecutor(max_workers=1)
+        return agent
+
+    def test_runs_commands_concurrently_on_pooled_browsers(self):
+        agent = self.agent(SimpleNamespace(size=2, close=lambda: None))
+        barrier = threading.Barrier(2, timeout=1)
+        # Both commands have to be running at once to get past the barrier
+        agent.execute_pooled = lambda command: (barrier.wait(), command["action"])[1]
+        self.assertEqual(agent.execute_parallel([{"action": "navigate"}, {"action": "read"}]),
+                         ["navigate", "read"])
+
+    def test_runs_commands_in_turn_without_a_pool(self):
+        agent = self.agent(None)
+        agent.execute_command = lambda command: command["action"]
+        self.assertEqual(agent.execute_parallel([{"action": "navigate"}, {"action": "read"}]),
+                         ["navigate", "read"])
+
+
+if __name__ == "__main__":
+    unittest.main()
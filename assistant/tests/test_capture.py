@@ -0,0 +1,77 @@
+import importlib.util
+import unittest
+
+HAS_SPEECH_RECOGNITION = importlib.util.find_spec("speech_recognition") is not None
+
+
+class FakeMicrophone:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+class FakeAudio:
+    frame_data = b"\0" * 3200
+    sample_rate = 16000
+    sample_width = 2
+
+
+class FakeRecognizer:
+    """Returns one phrase per listen() call, running a hook while it is 'recording'"""
+
+    dynamic_energy_threshold = False
+
+    def __init__(self, capture_ref, during_phrases):
+        self.capture_ref = capture_ref
+        self.during_phrases = list(during_phrases)
+
+    def listen(self, source, timeout=None, phrase_time_limit=None):
+        capture = self.capture_ref[0]
+        if not self.during_phrases:
+            capture._stopped.set()
+            import speech_recognition as sr
+            raise sr.WaitTimeoutError()
+        self.during_phrases.pop(0)(capture)
+        return FakeAudio()
+
+
+@unittest.skipUnless(HAS_SPEECH_RECOGNITION, "speech_recognition is not installed")
+class UtteranceCaptureTest(unittest.TestCase):
+    def run_capture(self, *during_phrases, **kwargs):
+        from assistant.utils.capture import UtteranceCapture
+        ref = []
+        kwargs.setdefault("max_queue", 10)
+        capture = UtteranceCapture(FakeRecognizer(ref, during_phrases), FakeMicrophone(),
+                                   echo_holdoff=0, **kwargs)
+        ref.append(capture)
+        capture.start()
+        capture._thread.join(5)
+        return capture
+
+    def test_discards_phrases_that_overlap_speech(self):
+        capture = self.run_capture(
+            lambda c: None,
+            lambda c: c.speaking(True),
+            lambda c: c.speaking(False),
+            lambda c: (c.speaking(True), c.speaking(False)),
+            lambda c: None,
+        )
+        self.assertEqual(capture.stats(), {"captured": 2, "dropped": 0, "echoes": 3, "queued": 2})
+
+    def test_transcribes_queued_utterances_in_the_background(self):
+        heard = []
+        capture = self.run_capture(lambda c: None, lambda c: None, lambda c: None,
+                                   max_queue=2, transcribe=lambda audio: heard.append(audio) or "hello")
+        self.assertEqual(capture.stats()["dropped"], 1)
+        for _ in range(2):
+            utterance = capture.get(timeout=1)
+            self.assertEqual(utterance.transcript.result(timeout=1), "hello")
+            self.assertIsNotNone(utterance.stt_seconds)
+        capture.stop()
+        self.assertLessEqual(len(heard), 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
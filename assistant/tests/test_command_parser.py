@@ -0,0 +1,46 @@
+import unittest
+
+from assistant.utils.command_parser import parse_simple_command
+
+
+class ParseSimpleCommandTest(unittest.TestCase):
+    def test_navigates_to_known_sites_and_domains(self):
+        self.assertEqual(parse_simple_command("Open YouTube"),
+                         {"action": "navigate", "params": {"url": "youtube.com"}})
+        self.assertEqual(parse_simple_command("please go to example dot com."),
+                         {"action": "navigate", "params": {"url": "example.com"}})
+
+    def test_strips_wake_words_and_politeness(self):
+        expected = {"action": "navigate", "params": {"url": "youtube.com"}}
+        self.assertEqual(parse_simple_command("Hey assistant, open youtube please."), expected)
+        self.assertEqual(parse_simple_command("Okay, please open YouTube, please!"), expected)
+        self.assertEqual(parse_simple_command("Could you search for Cats?"),
+                         {"action": "search", "params": {"query": "Cats"}})
+
+    def test_file_names_are_not_domains(self):
+        self.assertIsNone(parse_simple_command("visit file.txt"))
+        self.assertIsNone(parse_simple_command("open index.html"))
+
+    def test_scroll_and_back(self):
+        self.assertEqual(parse_simple_command("Scroll Down by 500 pixels"),
+                         {"action": "scroll", "params": {"direction": "down", "amount": 500}})
+        self.assertEqual(parse_simple_command("go back"), {"action": "back", "params": {}})
+
+    def test_search_keeps_query_casing(self):
+        self.assertEqual(parse_simple_command("Search for Python Tutorials"),
+                         {"action": "search", "params": {"query": "Python Tutorials"}})
+        self.assertEqual(parse_simple_command("search C++"),
+                         {"action": "search", "params": {"query": "C++"}})
+
+    def test_empty_or_stopword_queries_go_to_the_llm(self):
+        self.assertIsNone(parse_simple_command("search for"))
+        self.assertIsNone(parse_simple_command("search for something"))
+
+    def test_ambiguous_commands_go_to_the_llm(self):
+        self.assertIsNone(parse_simple_command("search cats and then open the first result"))
+        self.assertIsNone(parse_simple_command("search laptops on amazon"))
+        self.assertIsNone(parse_simple_command("what is the weather like"))
+
+
+if __name__ == "__main__":
+    unittest.main()
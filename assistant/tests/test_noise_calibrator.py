@@ -0,0 +1,62 @@
+import unittest
+from array import array
+from types import SimpleNamespace
+
+from assistant.utils.noise_calibrator import NoiseCalibrator
+
+
+class FakeMicrophone:
+    """Yields frames of a constant amplitude, stopping the calibrator after a few reads"""
+
+    CHUNK = 160
+    SAMPLE_RATE = 16000
+    SAMPLE_WIDTH = 2
+
+    def __init__(self, calibrator, reads=50, amplitude=1000):
+        self.calibrator = calibrator
+        self.reads = reads
+        self.frame = array("h", [amplitude] * self.CHUNK).tobytes()
+        self.stream = self
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def read(self, size):
+        self.reads -= 1
+        if self.reads <= 0:
+            self.calibrator._stopped.set()
+        return self.frame
+
+
+class NoiseCalibratorTest(unittest.TestCase):
+    def calibrate(self, speaking):
+        recognizer = SimpleNamespace(energy_threshold=300, dynamic_energy_ratio=1.5)
+        calibrator = NoiseCalibrator(recognizer, None, update_interval=0.01, echo_holdoff=0)
+        calibrator.microphone = FakeMicrophone(calibrator)
+        calibrator.speaking(speaking)
+        calibrator._calibrate()
+        return calibrator, recognizer
+
+    def test_tracks_room_noise(self):
+        calibrator, recognizer = self.calibrate(speaking=False)
+        self.assertGreater(calibrator.updates, 0)
+        self.assertGreater(recognizer.energy_threshold, 300)
+
+    def test_ignores_the_assistants_voice(self):
+        calibrator, recognizer = self.calibrate(speaking=True)
+        self.assertEqual(calibrator.updates, 0)
+        self.assertEqual(recognizer.energy_threshold, 300)
+
+    def test_echo_holdoff_after_speech(self):
+        calibrator = NoiseCalibrator(None, None, echo_holdoff=60)
+        self.assertFalse(calibrator.hearing_speech)
+        calibrator.speaking(True)
+        calibrator.speaking(False)
+        self.assertTrue(calibrator.hearing_speech)
+
+
+if __name__ == "__main__":
+    unittest.main()
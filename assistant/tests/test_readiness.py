@@ -0,0 +1,60 @@
+import importlib.util
+import unittest
+
+HAS_SELENIUM = importlib.util.find_spec("selenium") is not None
+
+
+class FakeDriver:
+    """A page whose marker is cleared, as a new document would, after a few polls"""
+
+    def __init__(self, url, replaced_after=2):
+        self.current_url = url
+        self.replaced_after = replaced_after
+        self.marked = False
+        self.polls = 0
+
+    def execute_script(self, script, *args):
+        if script.startswith("window."):
+            self.marked = True
+            return None
+        if "=== true" in script:
+            self.polls += 1
+            if self.polls > self.replaced_after:
+                self.marked = False
+            return self.marked
+        if "readyState" in script:
+            return "complete"
+        raise AssertionError(f"Unexpected script: {script}")
+
+    def get_log(self, kind):
+        raise RuntimeError("no performance log")
+
+
+@unittest.skipUnless(HAS_SELENIUM, "selenium is not installed")
+class ReadinessTest(unittest.TestCase):
+    def readiness(self, driver):
+        from assistant.tools.readiness import Readiness
+        readiness = Readiness(driver, poll_frequency=0.01)
+        readiness._lifecycle_available = False
+        return readiness
+
+    def test_same_url_navigation_is_ready_once_the_document_is_replaced(self):
+        url = "https://www.example.com/"
+        driver = FakeDriver(url)
+        readiness = self.readiness(driver)
+        readiness.begin_navigation()
+        readiness.page_ready("load", previous_url=url, timeout=1)
+        self.assertFalse(driver.marked)
+
+    def test_waits_while_the_marked_document_is_still_shown(self):
+        from selenium.common.exceptions import TimeoutException
+        url = "https://www.example.com/"
+        driver = FakeDriver(url, replaced_after=1000)
+        readiness = self.readiness(driver)
+        readiness.begin_navigation()
+        with self.assertRaises(TimeoutException):
+            readiness.page_ready("load", previous_url=url, timeout=0.1)
+
+
+if __name__ == "__main__":
+    unittest.main()
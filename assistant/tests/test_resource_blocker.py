@@ -0,0 +1,94 @@
+import unittest
+
+from assistant.tools.resource_blocker import ResourceBlocker, matches
+
+
+class FakeDriver:
+    current_window_handle = "tab"
+    window_handles = ["tab"]
+    current_url = "https://www.google.com/search?q=cats"
+
+    def __init__(self):
+        self.blocked = None
+        self.refreshes = 0
+
+    def execute_cdp_cmd(self, command, params):
+        if command == "Network.setBlockedURLs":
+            self.blocked = params["urls"]
+
+    def refresh(self):
+        self.refreshes += 1
+
+
+class FakeReadiness:
+    """Delivers queued performance log messages to the blocker's listener"""
+
+    def __init__(self):
+        self.log_listeners = []
+        self.messages = []
+
+    def read_performance_log(self):
+        messages, self.messages = self.messages, []
+        for message in messages:
+            for listener in self.log_listeners:
+                listener(message)
+
+    def begin_navigation(self):
+        pass
+
+    def page_ready(self, policy, previous_url=None, timeout=10, selector=None):
+        pass
+
+    def block(self, resource_type):
+        self.messages.append({
+            "method": "Network.loadingFailed",
+            "params": {"blockedReason": "inspector", "type": resource_type},
+        })
+
+
+class ResourceBlockerTest(unittest.TestCase):
+    def setUp(self):
+        self.driver = FakeDriver()
+        self.readiness = FakeReadiness()
+        self.blocker = ResourceBlocker(self.driver, self.readiness)
+
+    def blocked(self, url):
+        return any(matches(pattern, url) for pattern in self.driver.blocked)
+
+    def test_patterns_are_anchored_to_the_path(self):
+        self.blocker.apply("https://www.google.com/", "read")
+        self.assertTrue(self.blocked("https://cdn.example.com/logo.png"))
+        self.assertTrue(self.blocked("https://cdn.example.com/logo.png?v=3"))
+        self.assertTrue(self.blocked("https://www.google-analytics.com/collect"))
+        self.assertFalse(self.blocked("https://png.example.com/page"))
+        self.assertFalse(self.blocked("https://example.com/search?q=logo.png&page=2"))
+        self.assertFalse(self.blocked("https://example.com/?ref=hotjar.com"))
+
+    def test_never_blocks_the_page_being_navigated_to(self):
+        url = "https://upload.wikimedia.org/wikipedia/commons/a/a9/Example.jpg"
+        self.assertEqual(self.blocker.apply(url, "read"), "read_only")
+        self.assertFalse(self.blocked(url))
+        self.assertTrue(self.blocked("https://example.com/other.png"))
+
+    def test_reloads_without_blocking_when_the_document_is_blocked(self):
+        self.blocker.apply("https://www.google.com/", "search")
+        self.readiness.block("Image")
+        self.blocker.page_ready()
+        self.assertEqual(self.driver.refreshes, 0)
+
+        self.readiness.block("Document")
+        self.blocker.page_ready()
+        self.assertEqual(self.driver.refreshes, 1)
+        self.assertEqual(self.driver.blocked, [])
+        self.assertEqual(self.blocker.stats()["blocked_requests"], 2)
+
+    def test_reset_goes_back_to_the_navigate_profile(self):
+        self.blocker.apply("https://www.google.com/search", "search")
+        self.assertTrue(self.blocked("https://cdn.example.com/logo.png"))
+        self.blocker.reset()
+        self.assertEqual(self.driver.blocked, [])
+        self.assertEqual(self.blocker.stats()["heuristic_bytes_saved"], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
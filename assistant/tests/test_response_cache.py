@@ -0,0 +1,61 @@
+import unittest
+
+from assistant.utils.response_cache import ResponseCache, normalize_utterance
+
+PROMPT = "system prompt"
+MODEL = "gpt-4o-mini"
+
+
+class ResponseCacheTest(unittest.TestCase):
+    def setUp(self):
+        self.cache = ResponseCache(":memory:", version="test")
+
+    def tearDown(self):
+        self.cache.close()
+
+    def test_normalizes_trivial_differences(self):
+        self.assertEqual(normalize_utterance("Um, what's the time?"), "what is the time")
+        self.cache.put(PROMPT, MODEL, "What's the time?", "noon")
+        self.assertEqual(self.cache.get(PROMPT, MODEL, "hey, what is the time"), "noon")
+
+    def test_contractions_only_expand_whole_words(self):
+        self.assertEqual(normalize_utterance("What's Bob's dog's name"), "what is bob s dog s name")
+        self.assertEqual(normalize_utterance("what is the bit's value"), "what is the bit s value")
+        self.assertEqual(normalize_utterance("I'm here"), "i am here")
+
+    def test_near_misses_are_not_hits(self):
+        pairs = [
+            ("what is the capital of australia", "what is the capital of austria"),
+            ("what is the population of indiana", "what is the population of india"),
+            ("tell me about aliens", "tell me about alien"),
+            ("translate hello to danish", "translate hello to spanish"),
+            ("click the text button", "click the next button"),
+            ("what is 12 times 12", "what is 12 times 13"),
+        ]
+        for fuzzy in (False, True):
+            for stored, asked in pairs:
+                with self.subTest(stored=stored, asked=asked, fuzzy=fuzzy):
+                    self.cache.put(PROMPT, MODEL, stored, stored)
+                    self.assertIsNone(self.cache.get(PROMPT, MODEL, asked, fuzzy=fuzzy))
+
+    def test_fuzzy_lookup_only_ignores_articles(self):
+        self.cache.put(PROMPT, MODEL, "tell me a joke", "joke")
+        self.assertIsNone(self.cache.get(PROMPT, MODEL, "tell me the joke"))
+        self.assertEqual(self.cache.get(PROMPT, MODEL, "tell me the joke", fuzzy=True), "joke")
+        self.assertIsNone(self.cache.get(PROMPT, MODEL, "tell me a story", fuzzy=True))
+
+    def test_replies_expire_sooner_than_routes(self):
+        self.assertLess(self.cache.reply_ttl, self.cache.ttl)
+        self.cache.put(PROMPT, MODEL, "news", "old news", ttl=-1)
+        self.assertIsNone(self.cache.get(PROMPT, MODEL, "news"))
+
+    def test_namespaces_and_expiry(self):
+        self.cache.put(PROMPT, MODEL, "hello", "hi")
+        self.assertIsNone(self.cache.get("other prompt", MODEL, "hello"))
+        self.cache.put(PROMPT, MODEL, "bye", "later", ttl=-1)
+        self.assertIsNone(self.cache.get(PROMPT, MODEL, "bye"))
+        self.assertEqual(self.cache.stats()["hits"], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
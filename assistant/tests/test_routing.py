@@ -0,0 +1,97 @@
+import importlib.util
+import json
+import unittest
+from types import SimpleNamespace
+
+DEPENDENCIES = ("openai", "dotenv", "speech_recognition", "pyttsx3", "selenium", "httpx")
+HAS_DEPENDENCIES = all(importlib.util.find_spec(name) is not None for name in DEPENDENCIES)
+
+
+class FakeBrowserAgent:
+    def __init__(self):
+        self.commands = []
+
+    def execute_command(self, command):
+        self.commands.append(command)
+        return f"Ran {command.get('action', 'plan')}"
+
+
+class FakeCompletions:
+    """Streams a routed response back in small chunks"""
+
+    def __init__(self, route):
+        self.content = json.dumps(route)
+
+    def create(self, **kwargs):
+        if not kwargs.get("stream"):
+            message = SimpleNamespace(content=self.content)
+            return SimpleNamespace(choices=[SimpleNamespace(message=message)], usage=None)
+        return iter([
+            SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content=self.content[i:i + 4]))])
+            for i in range(0, len(self.content), 4)
+        ])
+
+
+@unittest.skipUnless(HAS_DEPENDENCIES, "the speech handler's dependencies are not installed")
+class UnifiedRoutingTest(unittest.TestCase):
+    def handler(self, route=None, stream_replies=True):
+        from assistant.speech_handler import SpeechHandler
+        from assistant.utils.tracing import Tracer
+        handler = SpeechHandler.__new__(SpeechHandler)
+        handler.browser_agent = FakeBrowserAgent()
+        handler.client = SimpleNamespace(chat=SimpleNamespace(completions=FakeCompletions(route or {})))
+        handler.tracer = Tracer()
+        handler.cache = None
+        handler.local_fast_path = False
+        handler.unified_routing = True
+        handler.stream_replies = stream_replies
+        handler.tts = None
+        return handler
+
+    def reply(self, handler, user_input="do it"):
+        reply = handler.get_reply(user_input)
+        return [reply] if isinstance(reply, str) else list(reply)
+
+    def test_executes_routed_browser_actions_and_plans(self):
+        handler = self.handler()
+        self.assertEqual(handler.execute_route(
+            {"is_browser_task": True, "action": "navigate", "params": {"url": "youtube.com"}}
+        ), "Ran navigate")
+        plan = [{"action": "navigate", "params": {"url": "google.com"}}]
+        handler.execute_route({"is_browser_task": True, "plan": plan})
+        handler.execute_route({"is_browser_task": True, "parallel": [{"plan": plan}, {"plan": plan}]})
+        self.assertEqual(handler.browser_agent.commands, [
+            {"action": "navigate", "params": {"url": "youtube.com"}},
+            {"plan": plan},
+            {"parallel": [{"plan": plan}, {"plan": plan}]},
+        ])
+        with self.assertRaises(ValueError):
+            handler.execute_route({"is_browser_task": True})
+
+    def test_returns_conversation_replies(self):
+        handler = self.handler()
+        self.assertEqual(handler.execute_route({"is_browser_task": False, "response": "Hi."}), "Hi.")
+        with self.assertRaises(ValueError):
+            handler.execute_route({"is_browser_task": False})
+
+    def test_browser_routes_run_even_with_response_text(self):
+        route = {"is_browser_task": True, "action": "navigate", "params": {"url": "youtube.com"},
+                 "response": "Opening YouTube now."}
+        for stream_replies in (True, False):
+            handler = self.handler(route, stream_replies)
+            self.assertEqual(self.reply(handler), ["Ran navigate"])
+            self.assertEqual(len(handler.browser_agent.commands), 1)
+
+    def test_streams_conversation_replies_in_one_call(self):
+        handler = self.handler({"is_browser_task": False, "response": "Paris. It is in France."})
+        self.assertEqual(self.reply(handler), ["Paris.", "It is in France."])
+        self.assertEqual(handler.browser_agent.commands, [])
+
+    def test_speaking_without_audio_returns_the_reply(self):
+        handler = self.handler({"is_browser_task": False, "response": "Paris. It is in France."})
+        self.assertIsNone(handler.speak("Hello."))
+        self.assertEqual(handler.get_ai_response("capital of France", speak=True), "Paris. It is in France.")
+
+
+if __name__ == "__main__":
+    unittest.main()
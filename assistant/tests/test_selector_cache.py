@@ -0,0 +1,87 @@
+import importlib.util
+import unittest
+
+from assistant.tools.selector_cache import SelectorCache
+
+HAS_SELENIUM = importlib.util.find_spec("selenium") is not None
+
+HOST = "www.example.com"
+SEARCH_BOX = ("css selector", "textarea[name='q']")
+
+
+class SelectorCacheTest(unittest.TestCase):
+    def setUp(self):
+        self.cache = SelectorCache(":memory:", max_failures=2)
+
+    def tearDown(self):
+        self.cache.close()
+
+    def test_orders_by_successes_then_speed(self):
+        self.cache.record_success(HOST, "search_box", ("css selector", "#slow"), 500)
+        self.cache.record_success(HOST, "search_box", ("css selector", "#fast"), 10)
+        self.cache.record_success(HOST, "search_box", ("id", "best"), 100)
+        self.cache.record_success(HOST, "search_box", ("id", "best"), 100)
+        self.assertEqual(self.cache.lookup(HOST, "search_box"),
+                         [("id", "best"), ("css selector", "#fast"), ("css selector", "#slow")])
+        self.assertEqual(self.cache.lookup("other.com", "search_box"), [])
+
+    def test_evicts_after_repeated_failures(self):
+        self.cache.record_success(HOST, "search_box", SEARCH_BOX, 10)
+        self.cache.record_failure(HOST, "search_box", SEARCH_BOX)
+        self.assertEqual(self.cache.lookup(HOST, "search_box"), [SEARCH_BOX])
+        self.cache.record_failure(HOST, "search_box", SEARCH_BOX)
+        self.assertEqual(self.cache.lookup(HOST, "search_box"), [])
+
+
+class FakeDriver:
+    """Answers the resolver script from a set of locators that have a ready element"""
+
+    current_url = f"https://{HOST}/"
+
+    def __init__(self, present):
+        self.present = present
+
+    def execute_script(self, script, candidates, state, index):
+        for i, candidate in enumerate(candidates):
+            if tuple(candidate) in self.present:
+                return [i, f"element for {candidate[1]}"]
+        return None
+
+
+@unittest.skipUnless(HAS_SELENIUM, "selenium is not installed")
+class LocatorResolverTest(unittest.TestCase):
+    def setUp(self):
+        self.cache = SelectorCache(":memory:")
+
+    def tearDown(self):
+        self.cache.close()
+
+    def resolve(self, present, candidates, fallbacks=None):
+        from assistant.tools.locator import LocatorResolver
+        resolver = LocatorResolver(FakeDriver(present), cache=self.cache)
+        return resolver.resolve(candidates, timeout=0.2, role="search_box", fallbacks=fallbacks)
+
+    def test_explicit_selector_beats_learned_ones(self):
+        explicit = ("css selector", "#mine")
+        self.cache.record_success(HOST, "search_box", SEARCH_BOX, 10)
+        matched, _ = self.resolve({explicit, SEARCH_BOX}, [explicit])
+        self.assertEqual(matched, explicit)
+
+    def test_learned_selector_beats_fallbacks(self):
+        self.cache.record_success(HOST, "search_box", SEARCH_BOX, 10)
+        matched, _ = self.resolve({SEARCH_BOX, ("tag name", "input")}, [("css selector", "#missing")],
+                                  fallbacks=[("tag name", "input")])
+        self.assertEqual(matched, SEARCH_BOX)
+
+    def test_generic_matches_are_not_learned(self):
+        for generic in (("tag name", "input"), ("css selector", "input")):
+            matched, _ = self.resolve({generic}, [("css selector", "#missing")], fallbacks=[generic])
+            self.assertEqual(matched, generic)
+        self.assertEqual(self.cache.lookup(HOST, "search_box"), [])
+
+        self.resolve({SEARCH_BOX}, [("css selector", "#missing")], fallbacks=[SEARCH_BOX])
+        self.assertEqual(self.cache.lookup(HOST, "search_box"), [SEARCH_BOX])
+
+
+if __name__ == "__main__":
+    unittest.main()
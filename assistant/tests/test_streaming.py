@@ -0,0 +1,63 @@
+import json
+import unittest
+
+from assistant.utils.streaming import JSONFieldStreamer, RouteReplyStreamer, SentenceSplitter
+
+
+def chunks(text, size=3):
+    return [text[i:i + size] for i in range(0, len(text), size)]
+
+
+class JSONFieldStreamerTest(unittest.TestCase):
+    def test_decodes_the_field_across_chunks(self):
+        raw = json.dumps({"is_browser_task": False, "response": "Hi \"there\"\né\U0001F600 done"})
+        field = JSONFieldStreamer("response")
+        decoded = "".join(field.feed(chunk) for chunk in chunks(raw, 2))
+        self.assertEqual(decoded, "Hi \"there\"\né\U0001F600 done")
+
+    def test_ignores_other_fields(self):
+        field = JSONFieldStreamer("response")
+        self.assertEqual(field.feed('{"reason": "response", "query": "x"}'), "")
+
+
+class SentenceSplitterTest(unittest.TestCase):
+    def test_emits_complete_sentences(self):
+        splitter = SentenceSplitter()
+        self.assertEqual(splitter.feed("Hello there. How"), ["Hello there."])
+        self.assertEqual(splitter.feed(" are you? I'm \"fine.\" Bye"), ["How are you?", "I'm \"fine.\""])
+        self.assertEqual(splitter.flush(), "Bye")
+        self.assertEqual(splitter.flush(), "")
+
+
+class RouteReplyStreamerTest(unittest.TestCase):
+    def stream(self, route):
+        reply = RouteReplyStreamer()
+        sentences = []
+        for chunk in chunks(json.dumps(route)):
+            sentences.extend(reply.feed(chunk))
+        sentences.extend(reply.flush())
+        return reply, sentences
+
+    def test_speaks_conversation_replies(self):
+        reply, sentences = self.stream({"is_browser_task": False, "response": "Paris. It is in France."})
+        self.assertFalse(reply.browser_task)
+        self.assertEqual(sentences, ["Paris.", "It is in France."])
+
+    def test_holds_back_text_of_browser_routes(self):
+        route = {"is_browser_task": True, "action": "navigate", "params": {"url": "youtube.com"},
+                 "response": "Opening YouTube."}
+        reply, sentences = self.stream(route)
+        self.assertTrue(reply.browser_task)
+        self.assertEqual(sentences, [])
+        self.assertEqual(json.loads(reply.content), route)
+
+    def test_holds_back_text_until_the_flag_arrives(self):
+        reply, sentences = self.stream({"response": "Hello. There.", "is_browser_task": False})
+        self.assertEqual(sentences, ["Hello.", "There."])
+        reply, sentences = self.stream({"response": "Hello. There."})
+        self.assertIsNone(reply.browser_task)
+        self.assertEqual(sentences, [])
+
+
+if __name__ == "__main__":
+    unittest.main()
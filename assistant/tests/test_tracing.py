@@ -0,0 +1,59 @@
+import unittest
+
+from assistant.utils.tracing import Histogram, Tracer
+
+
+class HistogramTest(unittest.TestCase):
+    def test_counts_by_bucket(self):
+        histogram = Histogram([0.1, 1.0])
+        for value in (0.05, 0.1, 0.5, 5.0):
+            histogram.observe(value)
+        self.assertEqual(histogram.counts, [2, 1, 1])
+        self.assertEqual(histogram.count, 4)
+        self.assertAlmostEqual(histogram.sum, 5.65)
+
+    def test_quantiles_interpolate_within_buckets(self):
+        histogram = Histogram([1.0, 2.0])
+        self.assertIsNone(histogram.quantile(0.5))
+        for value in (0.5, 1.5, 1.5, 1.5):
+            histogram.observe(value)
+        self.assertAlmostEqual(histogram.quantile(0.25), 1.0)
+        self.assertAlmostEqual(histogram.quantile(0.5), 1 + 1 / 3)
+        self.assertAlmostEqual(histogram.quantile(1.0), 2.0)
+
+    def test_overflow_reports_the_largest_bound(self):
+        histogram = Histogram([1.0])
+        histogram.observe(10.0)
+        self.assertEqual(histogram.quantile(0.95), 1.0)
+
+
+class TracerTest(unittest.TestCase):
+    def test_turn_restores_the_previous_turn_id(self):
+        tracer = Tracer()
+        self.assertIsNone(tracer.turn_id)
+        with tracer.turn():
+            outer = tracer.turn_id
+            with tracer.turn():
+                self.assertNotEqual(tracer.turn_id, outer)
+            self.assertEqual(tracer.turn_id, outer)
+        self.assertIsNone(tracer.turn_id)
+
+        with self.assertRaises(ValueError):
+            with tracer.turn():
+                raise ValueError("failed turn")
+        self.assertIsNone(tracer.turn_id)
+        self.assertEqual(tracer.stats()["stages"]["turn"]["errors"], 1)
+
+    def test_spans_share_the_turn_id(self):
+        tracer = Tracer()
+        with tracer.turn():
+            with tracer.span("stt"):
+                pass
+            tracer.record("tts.speak", 0.2)
+        turn_ids = {span.turn_id for span in tracer.recent}
+        self.assertEqual(len(turn_ids), 1)
+        self.assertEqual(tracer.stats()["turns"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,90 @@
+from langchain_openai import ChatOpenAI
+from browser_use import Controller
+from concurrent.futures import Future
+from typing import Coroutine, Iterable, Optional
+import asyncio
+import logging
+import threading
+
+
+class AgentRuntime:
+    """
+    Long-lived event loop thread that owns the LLM clients, the browser_use controller
+    and the log handlers
+
+    The GUI used to run every command in a fresh asyncio.run() and rebuild all of these
+    per turn, losing HTTP keep-alive each time. Here they are created once on the loop
+    they belong to, and commands are submitted as coroutines that return futures.
+    """
+
+    def __init__(self, model: str = "gpt-4o", fast_model: str = "gpt-4o-mini", temperature: float = 0.0,
+                 handlers: Iterable[logging.Handler] = (), log_file: Optional[str] = "log.txt",
+                 logger_name: str = "browser_use"):
+        self.model = model
+        # Cheaper model for light work such as rewriting results for speech
+        self.fast_model = fast_model
+        self.temperature = temperature
+        self.logger = logging.getLogger(logger_name)
+        self.handlers = list(handlers)
+        if log_file:
+            file_handler = logging.FileHandler(log_file)
+            file_handler.setFormatter(logging.Formatter('[%(asctime)s] %(message)s',
+                                                        datefmt='%Y-%m-%d %H:%M:%S'))
+            file_handler.setLevel(logging.INFO)
+            self.handlers.append(file_handler)
+
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+        self.llm: Optional[ChatOpenAI] = None
+        self.fast_llm: Optional[ChatOpenAI] = None
+        self.controller: Optional[Controller] = None
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self, timeout: float = 30):
+        """Start the loop thread and build the shared resources on it"""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self.loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._run, name="agent-loop", daemon=True)
+        self._thread.start()
+        self.submit(self._setup()).result(timeout)
+
+    def _run(self):
+        asyncio.set_event_loop(self.loop)
+        self.loop.run_forever()
+
+    async def _setup(self):
+        # The client's async HTTP pool binds to this loop, so it is created here
+        self.llm = ChatOpenAI(model=self.model, temperature=self.temperature)
+        self.fast_llm = ChatOpenAI(model=self.fast_model, temperature=self.temperature, streaming=True,
+                                   stream_usage=True)
+        self.controller = Controller()
+        for handler in self.handlers:
+            self.logger.addHandler(handler)
+
+    def submit(self, coroutine: Coroutine) -> Future:
+        """Schedule a coroutine on the loop thread; wait on the returned future for its result"""
+        if self.loop is None:
+            raise RuntimeError("AgentRuntime is not running")
+        return asyncio.run_coroutine_threadsafe(coroutine, self.loop)
+
+    def stop(self, cleanup: Optional[Coroutine] = None, timeout: float = 10):
+        """
+        Run an optional cleanup coroutine (e.g. closing the browser), then stop the loop
+        and detach the log handlers
+        """
+        if self.loop is None:
+            return
+        if cleanup is not None:
+            try:
+                self.submit(cleanup).result(timeout)
+            except Exception as e:
+                self.logger.warning(f"Cleanup failed: {e}")
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+        for handler in self.handlers:
+            self.logger.removeHandler(handler)
+            handler.close()
+        self.loop.close()
+        self.loop = None
@@ -1,9 +1,7 @@
 from langchain_openai import ChatOpenAI
 from browser_use import Agent
-import asyncio
 from dotenv import load_dotenv
 import speech_recognition as sr
-import pyttsx3
 import tkinter as tk
 from tkinter import ttk, scrolledtext
 import threading
@@ -13,15 +11,26 @@ import logging
 from PIL import Image, ImageTk
 import math
 import os
+import time
 import logging
 
 load_dotenv()
 
-from browser_use import Agent, Controller
+from browser_use import Agent
 from browser_use.browser.browser import Browser, BrowserConfig
 from browser_use.browser.context import BrowserContext
 import sys
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))    
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "assistant"))
+
+from assistant.utils.recognizers import create_transcriber
+from assistant.utils.noise_calibrator import NoiseCalibrator
+from assistant.utils.capture import UtteranceCapture
+from assistant.utils.tts_worker import TTSWorker
+from assistant.utils.streaming import SentenceSplitter
+from assistant.utils.tracing import create_tracer
+from agent_runtime import AgentRuntime
+from speakable import make_speakable
 
 browser = Browser(
 	config=BrowserConfig(
@@ -53,7 +62,11 @@ class GUILogHandler(logging.Handler):
             self.gui.update_browser_log(record.getMessage(), gui_level)
             
 
-async def humanize_response(response: str, llm: ChatOpenAI) -> str:
+async def humanize_response(response: str, llm: ChatOpenAI, on_sentence=None, tracer=None) -> str:
+    """
+    Rewrite a result for speech, handing each sentence to on_sentence as it streams in;
+    token usage is counted on the tracer, if given
+    """
    
     prompt = f"""
     You are a helpful AI assistant having a natural conversation. Transform the following response into clear, concise, and friendly speech. The response may be in a non-English language, code, JSON, markdown or other formats:
@@ -69,8 +82,20 @@ async def humanize_response(response: str, llm: ChatOpenAI) -> str:
     - Focus on clarity and brevity while maintaining a helpful demeanor
     """
     
-    result = await llm.ainvoke(prompt)
-    return result.content
+    splitter = SentenceSplitter()
+    reply = []
+    async for chunk in llm.astream(prompt):
+        usage = getattr(chunk, "usage_metadata", None)
+        if usage and tracer is not None:
+            tracer.add_tokens(llm.model_name, usage.get("input_tokens", 0), usage.get("output_tokens", 0))
+        reply.append(chunk.content)
+        for sentence in splitter.feed(chunk.content):
+            if on_sentence:
+                on_sentence(sentence)
+    remainder = splitter.flush()
+    if remainder and on_sentence:
+        on_sentence(remainder)
+    return "".join(reply).strip()
 
 class ModernScrolledText(scrolledtext.ScrolledText):
     def __init__(self, *args, **kwargs):
@@ -114,9 +139,40 @@ class VoiceAssistantGUI:
         self.setup_browser_column()
         
         self.is_listening = False
+        # Any thread queues GUI updates here; the Tk thread renders them in batches
         self.message_queue = queue.Queue()
-        self.engine = pyttsx3.init()
-        self.setup_voice()
+        self.max_fps = 30
+        self.max_batch = 2000
+        self.max_log_lines = 2000
+        self.max_conversation_lines = 1000
+        self.configure_tags()
+        self.drain_job = self.root.after(1000 // self.max_fps, self.drain_messages)
+        # Per-turn spans and metrics, exported to TRACE_FILE and METRICS_FILE when set
+        self.tracer = create_tracer()
+        # Speech runs on its own worker thread; a new reply cuts off the previous one
+        self.tts = TTSWorker(configure=self.setup_voice, on_state=self.on_speaking,
+                             on_finish=self.tracer.speech_finished)
+        self.tts.start()
+        # SPEECH_BACKEND selects google (default) or an offline backend (vosk, whisper);
+        # offline models are loaded once here rather than per utterance
+        self.transcriber = create_transcriber(language="en-IN")
+        # Set while listening; kept out of the microphone while the assistant speaks
+        self.calibrator = None
+        self.capture = None
+        # Keep capturing while earlier commands are processed and spoken; phrases heard
+        # while the assistant speaks are discarded
+        self.pipelined_capture = False
+        self.capture_queue_depth = 3
+        self.capture_drop_policy = "drop_oldest"
+        # Stop speaking when the user starts a new command (needs a headset or echo cancellation)
+        self.barge_in = False
+        
+        # One event loop thread owns the LLM client, controller and log handlers for all commands
+        gui_handler = GUILogHandler(self)
+        gui_handler.setLevel(logging.INFO)
+        self.runtime = AgentRuntime(model="gpt-4o", fast_model="gpt-4o-mini", temperature=0.0,
+                                    handlers=[gui_handler])
+        self.runtime.start()
         
     def setup_header(self):
         self.header = ttk.Frame(self.main_container, style='Dark.TFrame')
@@ -278,64 +334,103 @@ class VoiceAssistantGUI:
             font=('Segoe UI', 12, 'bold')
         )
         
-    def update_status(self, status):
-        self.status_label.config(text=status)
-        
-        if status == "Ready":
-            self.status_indicator.configure(style='Ready.TLabel')
-        elif status == "Listening...":
-            self.status_indicator.configure(foreground=self.accent_color)
-        elif "Error" in status:
-            self.status_indicator.configure(foreground=self.error_color)
-        else:
-            self.status_indicator.configure(foreground=self.warning_color)
-            
-        self.root.update()
-        
-    def update_browser_log(self, message, level="info"):
-        timestamp = datetime.datetime.now().strftime("%H:%M:%S")
-        
+    def configure_tags(self):
         self.browser_log.tag_configure("timestamp", foreground="#666666")
         self.browser_log.tag_configure("info", foreground=self.fg_color)
         self.browser_log.tag_configure("success", foreground=self.success_color)
         self.browser_log.tag_configure("error", foreground=self.error_color)
+        self.browser_log.tag_configure("warning", foreground=self.warning_color)
         self.browser_log.tag_configure("action", foreground=self.accent_color)
         
-        self.browser_log.insert(tk.END, f"[{timestamp}] ", "timestamp")
+        self.conversation_text.tag_configure("timestamp", foreground="#666666")
+        self.conversation_text.tag_configure("user", foreground=self.success_color)
+        self.conversation_text.tag_configure("assistant", foreground=self.accent_color)
+        self.conversation_text.tag_configure("message", foreground=self.fg_color)
         
-        if level == "success":
-            self.browser_log.insert(tk.END, "✓ ", "success")
-        elif level == "error":
-            self.browser_log.insert(tk.END, "✗ ", "error")
-        elif level == "action":
-            self.browser_log.insert(tk.END, "→ ", "action")
-        else:
-            self.browser_log.insert(tk.END, "• ", "info")
-            
-        self.browser_log.insert(tk.END, f"{message}\n", level)
-        self.browser_log.see(tk.END)
+    def update_status(self, status):
+        self.message_queue.put(("status", status))
+        
+    def update_browser_log(self, message, level="info"):
+        timestamp = datetime.datetime.now().strftime("%H:%M:%S")
+        self.message_queue.put(("log", timestamp, message, level))
         
     def update_browser_action(self, action):
-        self.action_label.config(text=action)
+        self.message_queue.put(("action", action))
         
     def update_conversation(self, speaker, text):
         timestamp = datetime.datetime.now().strftime("%H:%M")
+        self.message_queue.put(("conversation", timestamp, speaker, text))
         
-        self.conversation_text.tag_configure("timestamp", foreground="#666666")
-        self.conversation_text.tag_configure("user", foreground=self.success_color)
-        self.conversation_text.tag_configure("assistant", foreground=self.accent_color)
-        self.conversation_text.tag_configure("message", foreground=self.fg_color)
+    def drain_messages(self):
+        """Render queued updates on the Tk thread, at most max_fps times a second"""
+        logs, conversation, status, action = [], [], None, None
+        for _ in range(self.max_batch):
+            try:
+                item = self.message_queue.get_nowait()
+            except queue.Empty:
+                break
+            kind = item[0]
+            if kind == "log":
+                logs.append(item[1:])
+            elif kind == "conversation":
+                conversation.append(item[1:])
+            elif kind == "status":
+                status = item[1]
+            elif kind == "action":
+                action = item[1]
         
-        self.conversation_text.insert(tk.END, f"[{timestamp}] ", "timestamp")
+        try:
+            # Lines that would be trimmed right away are never inserted
+            if logs:
+                self.render_browser_log(logs[-self.max_log_lines:])
+            if conversation:
+                self.render_conversation(conversation[-(self.max_conversation_lines // 2):])
+            if status is not None:
+                self.render_status(status)
+            if action is not None:
+                self.action_label.config(text=action)
+        finally:
+            # A failed render must not stop every later update from being shown
+            self.drain_job = self.root.after(1000 // self.max_fps, self.drain_messages)
+        
+    def render_status(self, status):
+        self.status_label.config(text=status)
         
-        if speaker == "You":
-            self.conversation_text.insert(tk.END, f"{speaker}: ", "user")
+        if status == "Ready":
+            self.status_indicator.configure(style='Ready.TLabel')
+        elif status == "Listening...":
+            self.status_indicator.configure(foreground=self.accent_color)
+        elif "Error" in status:
+            self.status_indicator.configure(foreground=self.error_color)
         else:
-            self.conversation_text.insert(tk.END, f"{speaker}: ", "assistant")
-            
-        self.conversation_text.insert(tk.END, f"{text}\n\n", "message")
+            self.status_indicator.configure(foreground=self.warning_color)
+        
+    def render_browser_log(self, entries):
+        markers = {"success": "✓ ", "error": "✗ ", "action": "→ "}
+        chunks = []
+        for timestamp, message, level in entries:
+            chunks += [f"[{timestamp}] ", "timestamp", markers.get(level, "• "), level if level in markers else "info",
+                       f"{message}\n", level]
+        self.browser_log.insert(tk.END, *chunks)
+        self.trim(self.browser_log, self.max_log_lines)
+        self.browser_log.see(tk.END)
+        
+    def render_conversation(self, entries):
+        chunks = []
+        for timestamp, speaker, text in entries:
+            chunks += [f"[{timestamp}] ", "timestamp", f"{speaker}: ", "user" if speaker == "You" else "assistant",
+                       f"{text}\n\n", "message"]
+        self.conversation_text.insert(tk.END, *chunks)
+        self.trim(self.conversation_text, self.max_conversation_lines)
         self.conversation_text.see(tk.END)
         
+    @staticmethod
+    def trim(widget, max_lines):
+        """Keep only the last max_lines lines of a text widget"""
+        lines = int(widget.index("end-1c").split(".")[0])
+        if lines > max_lines:
+            widget.delete("1.0", f"{lines - max_lines + 1}.0")
+        
     def toggle_listening(self):
         self.is_listening = not self.is_listening
         if self.is_listening:
@@ -366,44 +461,68 @@ class VoiceAssistantGUI:
             self.gui.update_browser_log(record.getMessage(), gui_level)
 
     async def process_voice_command(self, task):
-        try:
-            llm = ChatOpenAI(model="gpt-4o", temperature=0.0)
-            controller = Controller()
-
-            file_handler = logging.FileHandler('log.txt')
-            file_handler.setFormatter(logging.Formatter('[%(asctime)s] %(message)s', 
-                                                      datefmt='%Y-%m-%d %H:%M:%S'))
-            file_handler.setLevel(logging.INFO)
-            
-            gui_handler = GUILogHandler(self)
-            gui_handler.setLevel(logging.INFO)
+        """
+        Runs on the runtime's event loop, reusing its LLM client and controller
 
-            logger = logging.getLogger('browser_use')
-            logger.addHandler(file_handler)
-            logger.addHandler(gui_handler)
-            
-            agent = Agent(task=task, llm=llm, browser=browser, controller=controller)
+        Returns the reply and, when it was streamed into TTS while being written, the
+        last queued speech job (None means the reply has not been spoken yet)
+        """
+        try:
+            llm = self.runtime.llm
+            agent = Agent(task=task, llm=llm, browser=browser, controller=self.runtime.controller)
             
-            result = await agent.run()
-
-            # Clean up logging
-            logger.removeHandler(file_handler)
-            logger.removeHandler(gui_handler)
-            file_handler.close()
+            with self.tracer.span("agent", model=self.runtime.model):
+                result = await agent.run()
+            self.trace_agent_history(result)
+            raw = result.final_result() if hasattr(result, "final_result") else None
+            raw = raw or str(result)
             
-            humanized_result = await humanize_response(str(result), llm)
-            return humanized_result
+            with self.tracer.span("humanize") as span:
+                # Short plain answers are spoken as they are, without another LLM round trip
+                text, rewrite = make_speakable(raw)
+                span.attributes["rewrite"] = rewrite
+                if not rewrite:
+                    return text, None
+                
+                turn_id = self.tracer.turn_id
+                jobs = []
+                def speak(sentence):
+                    jobs.append(self.tts.say(sentence, interrupt=not jobs, turn_id=turn_id))
+                
+                humanized_result = await humanize_response(
+                    raw, self.runtime.fast_llm, on_sentence=speak, tracer=self.tracer
+                )
+            return humanized_result, jobs[-1] if jobs else None
             
         except Exception as e:
             self.update_browser_log(f"Error: {str(e)}", "error")
             self.update_browser_action("Error occurred")
-            return f"Error processing command: {str(e)}"
+            return f"Error processing command: {str(e)}", None
             
-    def setup_voice(self):
-        voices = self.engine.getProperty('voices')
-        self.engine.setProperty('voice', voices[0].id)
-        self.engine.setProperty('rate', 150)
-        self.engine.setProperty('volume', 0.9)
+    def trace_agent_history(self, history):
+        """
+        Per-step browser spans and token counts from a browser_use run, where the
+        installed version records them
+        """
+        for step in getattr(history, "history", []):
+            metadata = getattr(step, "metadata", None)
+            if metadata is None:
+                continue
+            output = getattr(step, "model_output", None)
+            actions = [
+                next(iter(action.model_dump(exclude_unset=True)), "unknown")
+                for action in getattr(output, "action", None) or []
+            ]
+            self.tracer.record("browser.step", metadata.step_end_time - metadata.step_start_time,
+                               actions=actions)
+        if hasattr(history, "total_input_tokens"):
+            self.tracer.add_tokens(self.runtime.model, prompt_tokens=history.total_input_tokens())
+    
+    def setup_voice(self, engine):
+        voices = engine.getProperty('voices')
+        engine.setProperty('voice', voices[0].id)
+        engine.setProperty('rate', 150)
+        engine.setProperty('volume', 0.9)
         
     def listen_loop(self):
         r = sr.Recognizer()
@@ -411,24 +530,55 @@ class VoiceAssistantGUI:
         r.pause_threshold = 1.0  
         r.phrase_threshold = 0.3  
         r.non_speaking_duration = 0.5  
+        r.dynamic_energy_threshold = False
+        
+        # The threshold adapts between commands instead of during listen()
+        microphone = sr.Microphone()
+        calibrator = NoiseCalibrator(r, microphone)
+        calibrator.start()
+        self.calibrator = calibrator
+        
+        capture = None
+        if self.pipelined_capture:
+            capture = UtteranceCapture(
+                r, microphone, calibrator, max_queue=self.capture_queue_depth,
+                drop_policy=self.capture_drop_policy, phrase_time_limit=10,
+                on_utterance=(lambda utterance: self.tts.cancel()) if self.barge_in else None
+            )
+            capture.start()
+        self.capture = capture
+        
+        def next_audio():
+            if capture is not None:
+                return capture.get(timeout=10).audio
+            with calibrator.paused(), microphone as source:
+                return r.listen(source, timeout=10, phrase_time_limit=10)
         
         while self.is_listening:
             try:
                 self.update_status("Listening...")
-                with sr.Microphone() as source:
-                    r.dynamic_energy_threshold = False
-                    
-                    audio = r.listen(source, timeout=10, phrase_time_limit=10)
-                
-                self.update_status("Processing speech...")
-                command = r.recognize_google(audio, language="en-IN", show_all=False)
-                self.update_conversation("You", command)
-                
-                self.update_status("Processing command...")
-                result = asyncio.run(self.process_voice_command(command))
+                listen_started = time.perf_counter()
+                audio = next_audio()
                 
-                self.update_conversation("Assistant", result)
-                self.speak_text(result)
+                # A turn starts with listening but only counts once something was heard
+                with self.tracer.turn(since=listen_started):
+                    self.tracer.record("capture", time.perf_counter() - listen_started,
+                                       queued=capture is not None)
+                    
+                    self.update_status("Processing speech...")
+                    with self.tracer.span("stt", backend=type(self.transcriber).__name__):
+                        command = self.transcriber.transcribe(audio)
+                    self.update_conversation("You", command)
+                    
+                    self.update_status("Processing command...")
+                    result, job = self.runtime.submit(self.process_voice_command(command)).result()
+                    
+                    self.update_conversation("Assistant", result)
+                    # With pipelined capture the next command is heard while this one is spoken
+                    if job is None:
+                        self.speak_text(result, wait=capture is None)
+                    elif capture is None:
+                        self.tts.wait(job)
                 
             except sr.WaitTimeoutError:
                 self.update_status("Listening timed out - please speak")
@@ -438,20 +588,40 @@ class VoiceAssistantGUI:
                 self.update_status(f"Could not request results: {e}")
             except Exception as e:
                 self.update_status(f"Error: {str(e)}")
+        
+        self.calibrator = self.capture = None
+        if capture is not None:
+            capture.stop()
+        calibrator.stop()
                 
-    def speak_text(self, text):
-        self.update_status("Speaking")
-        if isinstance(text, str):
-            self.engine.say(text)
-        else:
-            self.engine.say(str(text))
-        self.engine.runAndWait()
-        self.update_status("Ready")
+    def speak_text(self, text, wait=True):
+        job = self.tts.say(text if isinstance(text, str) else str(text), interrupt=True,
+                           turn_id=self.tracer.turn_id)
+        if wait:
+            self.tts.wait(job)
+    
+    def on_speaking(self, speaking):
+        calibrator, capture = self.calibrator, self.capture
+        if calibrator is not None:
+            calibrator.speaking(speaking)
+        if capture is not None and not self.barge_in:
+            # Without barge-in anything heard while speaking is the assistant itself
+            capture.speaking(speaking)
+        self.update_status("Speaking" if speaking else "Ready")
+    
+    def on_close(self):
+        self.is_listening = False
+        self.tts.stop()
+        self.tracer.close()
+        self.runtime.stop(cleanup=browser.close())
+        self.root.after_cancel(self.drain_job)
+        self.root.destroy()
 
 def main():
     root = tk.Tk()
     app = VoiceAssistantGUI(root)
+    root.protocol("WM_DELETE_WINDOW", app.on_close)
     root.mainloop()
 
 if __name__ == "__main__":
-    asyncio.run(main())
\ No newline at end of file
+    main()
\ No newline at end of file
@@ -0,0 +1,83 @@
+import json
+import re
+from typing import Any, Tuple
+
+# Keys whose value is the answer itself when a result comes wrapped in JSON
+ANSWER_KEYS = ("answer", "result", "response", "text", "message", "output", "content", "summary")
+
+# Results longer than this are summarized rather than read out verbatim
+MAX_SPOKEN_CHARS = 300
+MAX_SPOKEN_SENTENCES = 3
+
+CODE_FENCE = re.compile(r"```[\w+-]*\n?(.*?)```", re.DOTALL)
+MARKDOWN_LINK = re.compile(r"!?\[([^\]]*)\]\([^)]*\)")
+# Underscore emphasis only counts outside words, so identifiers like snake_case_name survive
+MARKDOWN_EMPHASIS = re.compile(r"(\*\*|\*|~~|`)(?=\S)(.+?)(?<=\S)\1|(?<!\w)(__|_)(?=\S)(.+?)(?<=\S)\3(?!\w)")
+LINE_MARKUP = re.compile(r"^\s*(#{1,6}\s+|>\s*|[-*+]\s+|\d+[.)]\s+)", re.MULTILINE)
+TABLE_RULE = re.compile(r"^\s*\|?\s*:?-{3,}.*$", re.MULTILINE)
+URL = re.compile(r"https?://\S+|www\.\S+")
+LEFTOVER_STRUCTURE = re.compile(r"[{}\[\]<>|=\\#*`]")
+SENTENCE_END = re.compile(r"[.!?](\s|$)")
+
+
+def _from_json(value: Any) -> str:
+    """Flatten parsed JSON into plain sentences, preferring an answer-like field"""
+    if isinstance(value, dict):
+        for key in ANSWER_KEYS:
+            if isinstance(value.get(key), str):
+                return value[key]
+        return ". ".join(f"{key.replace('_', ' ')}: {_from_json(item)}" for key, item in value.items())
+    if isinstance(value, list):
+        return ", ".join(_from_json(item) for item in value)
+    if value is None:
+        return ""
+    return str(value)
+
+
+def normalize_result(text: str) -> str:
+    """
+    Turn an agent result into plain text: unwrap code fences and JSON, drop markdown
+    markup and collapse whitespace
+    """
+    text = CODE_FENCE.sub(lambda match: match.group(1), text.strip()).strip()
+    if text[:1] in "{[\"":
+        try:
+            text = _from_json(json.loads(text))
+        except ValueError:
+            pass
+
+    text = MARKDOWN_LINK.sub(lambda match: match.group(1), text)
+    text = TABLE_RULE.sub("", text)
+    text = LINE_MARKUP.sub("", text)
+    text = MARKDOWN_EMPHASIS.sub(lambda match: match.group(2) if match.group(1) else match.group(4), text)
+    text = text.replace("|", ", ")
+
+    # List items and lines become sentences
+    lines = [line.strip() for line in text.splitlines() if line.strip()]
+    text = " ".join(line if line[-1] in ".!?:;," else line + "." for line in lines)
+    return re.sub(r"\s+", " ", text).strip()
+
+
+def needs_rewrite(text: str) -> bool:
+    """
+    Whether normalized text still needs an LLM to sound natural: empty, long, full of
+    URLs or leftover structure, or mostly in a non-Latin script (needs translating)
+    """
+    if not text:
+        return True
+    if len(text) > MAX_SPOKEN_CHARS or len(SENTENCE_END.findall(text)) > MAX_SPOKEN_SENTENCES:
+        return True
+    if URL.search(text) or len(LEFTOVER_STRUCTURE.findall(text)) > 2:
+        return True
+    letters = [char for char in text if char.isalpha()]
+    non_latin = sum(1 for char in letters if ord(char) > 0x24F)
+    return bool(letters) and non_latin / len(letters) > 0.2
+
+
+def make_speakable(result: str) -> Tuple[str, bool]:
+    """
+    Returns:
+        (normalized text, whether it still needs an LLM rewrite)
+    """
+    text = normalize_result(result)
+    return text, needs_rewrite(text)
@@ -1,25 +1,38 @@
 import speech_recognition as sr
-import pyttsx3
 import asyncio
+import os
+import sys
 from typing import Optional
 
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "assistant"))
+
+from assistant.utils.noise_calibrator import NoiseCalibrator
+from assistant.utils.tts_worker import TTSWorker
+
 class SpeechHandler:
     def __init__(self):
         # Initialize speech recognition
         self.recognizer = sr.Recognizer()
+        self.microphone = sr.Microphone()
         
-        # Initialize text-to-speech engine
-        self.engine = pyttsx3.init()
-        # Set properties (optional)
-        self.engine.setProperty('rate', 150)    # Speed of speech
-        self.engine.setProperty('volume', 0.9)  # Volume (0-1)
+        # Keeps the energy threshold tracking room noise between commands
+        self.calibrator = NoiseCalibrator(self.recognizer, self.microphone)
+        self.calibrator.start()
+        
+        # Initialize text-to-speech on its own worker thread; calibration ignores the
+        # microphone while it speaks
+        self.tts = TTSWorker(configure=self._configure_voice, on_state=self.calibrator.speaking)
+        self.tts.start()
+
+    @staticmethod
+    def _configure_voice(engine):
+        engine.setProperty('rate', 150)    # Speed of speech
+        engine.setProperty('volume', 0.9)  # Volume (0-1)
 
     async def listen_for_command(self) -> Optional[str]:
         """Listen for voice input and convert to text."""
-        with sr.Microphone() as source:
+        with self.calibrator.paused(), self.microphone as source:
             print("Listening... Speak your command")
-            # Adjust for ambient noise
-            self.recognizer.adjust_for_ambient_noise(source, duration=1)
             
             try:
                 audio = self.recognizer.listen(source, timeout=5)
@@ -36,8 +49,9 @@ class SpeechHandler:
                 print(f"Could not request results; {e}")
                 return None
 
-    def speak_response(self, text: str) -> None:
-        """Convert text to speech and speak it."""
+    def speak_response(self, text: str, wait: bool = True) -> None:
+        """Convert text to speech and speak it, cutting off any earlier response."""
         print(f"Speaking: {text}")
-        self.engine.say(text)
-        self.engine.runAndWait() 
\ No newline at end of file
+        job = self.tts.say(text, interrupt=True)
+        if wait:
+            self.tts.wait(job) 
\ No newline at end of file
@@ -0,0 +1,40 @@
+import unittest
+
+from speakable import make_speakable, needs_rewrite, normalize_result
+
+
+class NormalizeResultTest(unittest.TestCase):
+    def test_strips_markdown(self):
+        text = "## Results\n- **Paris** is the [capital](https://en.wikipedia.org/wiki/Paris)\n- It has `2M` people"
+        self.assertEqual(normalize_result(text), "Results. Paris is the capital. It has 2M people.")
+
+    def test_keeps_underscores_inside_words(self):
+        self.assertEqual(normalize_result("Set snake_case_name to _on_ and max__depth stays"),
+                         "Set snake_case_name to on and max__depth stays.")
+
+    def test_unwraps_json_and_code_fences(self):
+        self.assertEqual(normalize_result('```json\n{"answer": "It is sunny."}\n```'), "It is sunny.")
+        self.assertEqual(normalize_result('{"temperature": 21, "unit": "C"}'), "temperature: 21. unit: C.")
+
+
+class NeedsRewriteTest(unittest.TestCase):
+    def test_short_plain_answers_are_spoken_as_is(self):
+        self.assertFalse(needs_rewrite("The search returned three results about cats."))
+        self.assertEqual(make_speakable("**Done.**"), ("Done.", False))
+
+    def test_empty_or_long_text_needs_a_rewrite(self):
+        self.assertTrue(needs_rewrite(""))
+        self.assertTrue(needs_rewrite("word " * 80))
+        self.assertTrue(needs_rewrite("One. Two. Three. Four. Five."))
+
+    def test_urls_and_leftover_structure_need_a_rewrite(self):
+        self.assertTrue(needs_rewrite("See https://example.com/page for details."))
+        self.assertTrue(needs_rewrite("value = {a} <b> | c"))
+
+    def test_non_latin_text_needs_a_rewrite(self):
+        self.assertTrue(needs_rewrite("東京は日本の首都です。"))
+        self.assertFalse(needs_rewrite("Café crème, s'il vous plaît."))
+
+
+if __name__ == "__main__":
+    unittest.main()